@@ -0,0 +1,352 @@
+import copy
+import itertools
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+import logging
+import numpy as np
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.config import ConfigManager
+from src.profiling import current_rss
+from .SyntheticCorpus import SyntheticCorpus
+
+logger = logging.getLogger(__name__)
+
+class _RssSampler:
+    """Amostra o RSS do processo em segundo plano e guarda o pico"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+class EncoderBenchmark:
+    """
+    Benchmark reprodutível de generate_embeddings, predict e predict_batch
+
+    Usa um BERT minúsculo criado localmente (pesos aleatórios com semente fixa)
+    e textos sintéticos, de modo que roda sem rede e os números de commits
+    diferentes são comparáveis na mesma máquina. Cada combinação de
+    batching x backend x pooling de benchmark.options é medida em textos/s,
+    tokens/s, latência p50/p95 por chamada, pico de RSS e eficiência de padding.
+    """
+
+    BATCHING = ('fixed', 'sorted', 'token_budget')
+    TARGETS = ('generate_embeddings', 'predict_batch', 'predict')
+
+    def __init__(self, settings: Optional[Dict] = None, work_dir: Optional[str] = None):
+        """
+        Args:
+            settings: Configuração do benchmark (padrão: seção benchmark do config.yaml)
+            work_dir: Diretório do modelo minúsculo (padrão: diretório temporário)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+        self.settings = settings or self.config.get('benchmark', {}) or {}
+
+        self.corpus = SyntheticCorpus(seed=self.settings.get('seed', 13),
+                                      vocab_size=self.settings.get('vocab_size', 2000))
+        self.work_dir = Path(work_dir or tempfile.mkdtemp(prefix='mpb_benchmark_'))
+        self.max_length = self.settings.get('max_length', 512)
+        self.batch_size = self.settings.get('batch_size', 16)
+        self.max_tokens = self.settings.get('max_tokens_per_batch', 8192)
+        self.request_size = self.settings.get('request_size', 64)
+        self.single_texts = self.settings.get('single_texts', 50)
+        self.repeats = self.settings.get('repeats', 1)
+
+    def build_model(self) -> Path:
+        """Cria (uma vez) o BERT minúsculo, seu tokenizer e um classificador"""
+        model_dir = self.work_dir / 'tiny-bert'
+        if (model_dir / 'config.json').exists():
+            return model_dir
+
+        import torch
+        from transformers import BertConfig, BertModel, BertTokenizerFast
+
+        model_dir.mkdir(parents=True, exist_ok=True)
+        self.corpus.write_vocab(model_dir / 'vocab.txt')
+        tokenizer = BertTokenizerFast.from_pretrained(model_dir, do_lower_case=False)
+        tokenizer.save_pretrained(model_dir)
+
+        model_settings = self.settings.get('model', {}) or {}
+        torch.manual_seed(self.corpus.seed)
+        model = BertModel(BertConfig(
+            vocab_size=len(tokenizer),
+            hidden_size=model_settings.get('hidden_size', 128),
+            num_hidden_layers=model_settings.get('num_hidden_layers', 2),
+            num_attention_heads=model_settings.get('num_attention_heads', 2),
+            intermediate_size=model_settings.get('intermediate_size', 256),
+            max_position_embeddings=max(self.max_length, 512)
+        ))
+        model.save_pretrained(model_dir)
+        return model_dir
+
+    def scenarios(self) -> List[Dict]:
+        options = self.settings.get('options', {}) or {}
+        batching = options.get('batching', list(self.BATCHING))
+        backends = options.get('backends', ['torch'])
+        poolings = options.get('pooling', ['mean'])
+        return [{'batching': b, 'backend': be, 'pooling': p}
+                for b, be, p in itertools.product(batching, backends, poolings)]
+
+    def run(self) -> Dict:
+        """
+        Executa todos os cenários
+
+        Returns:
+            Dicionário com metadados do ambiente e a lista de resultados
+        """
+        import torch
+        from transformers import AutoTokenizer
+
+        threads = self.settings.get('threads')
+        if threads:
+            torch.set_num_threads(threads)
+
+        model_dir = self.build_model()
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        distribution = self.settings.get('distribution', 'mixed')
+        texts = self.corpus.texts(self.settings.get('texts', 256), distribution)
+        token_counts = [len(ids) for ids in tokenizer(
+            texts, truncation=True, max_length=self.max_length)['input_ids']]
+        classifier_path = self._train_classifier(model_dir, tokenizer, texts)
+        targets = self.settings.get('targets', list(self.TARGETS))
+
+        results = []
+        backends = {}
+        for scenario in self.scenarios():
+            if scenario['backend'] not in backends:
+                backends[scenario['backend']] = self._create_backend(scenario['backend'], model_dir)
+            encoder = self._create_encoder(tokenizer, backends[scenario['backend']], scenario)
+            for target in targets:
+                self.logger.info(f"Benchmark {target} {scenario}")
+                result = self._measure(target, encoder, classifier_path, model_dir, texts, token_counts)
+                results.append({**scenario, 'target': target, **result})
+
+        return {
+            'meta': self._environment(threads, model_dir),
+            'corpus': self.corpus.describe(len(texts), distribution),
+            'settings': {
+                'max_length': self.max_length,
+                'batch_size': self.batch_size,
+                'max_tokens_per_batch': self.max_tokens,
+                'request_size': self.request_size,
+                'single_texts': self.single_texts,
+                'repeats': self.repeats
+            },
+            'results': results
+        }
+
+    @staticmethod
+    def save(report: Dict, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def compare(baseline: Dict, current: Dict) -> List[Dict]:
+        """
+        Compara dois relatórios cenário a cenário
+
+        Returns:
+            Linhas com textos/s e p95 de cada relatório e a variação relativa
+        """
+        def key(result):
+            return (result['target'], result['batching'], result['backend'], result['pooling'])
+
+        previous = {key(result): result for result in baseline['results']}
+        rows = []
+        for result in current['results']:
+            before = previous.get(key(result))
+            if before is None:
+                continue
+            rows.append({
+                'target': result['target'],
+                'batching': result['batching'],
+                'backend': result['backend'],
+                'pooling': result['pooling'],
+                'texts_per_sec_before': before['texts_per_sec'],
+                'texts_per_sec_after': result['texts_per_sec'],
+                'throughput_change': result['texts_per_sec'] / before['texts_per_sec'] - 1,
+                'p95_ms_before': before['latency_ms']['p95'],
+                'p95_ms_after': result['latency_ms']['p95']
+            })
+        return rows
+
+    def _measure(self, target, encoder, classifier_path, model_dir, texts, token_counts) -> Dict:
+        """Mede um alvo: warmup, depois `repeats` passadas cronometradas por chamada"""
+        call = self._target_callable(target, encoder, classifier_path, model_dir)
+        if target == 'predict':
+            requests = [[idx] for idx in range(min(self.single_texts, len(texts)))]
+        else:
+            requests = [list(range(start, min(start + self.request_size, len(texts))))
+                        for start in range(0, len(texts), self.request_size)]
+
+        call([texts[idx] for idx in requests[0]])
+
+        latencies = []
+        real_tokens = 0
+        processed_tokens = 0
+        processed_texts = 0
+        with _RssSampler() as rss:
+            start = time.perf_counter()
+            for _ in range(self.repeats):
+                for request in requests:
+                    call_start = time.perf_counter()
+                    call([texts[idx] for idx in request])
+                    latencies.append(time.perf_counter() - call_start)
+                    stats = encoder.last_padding_stats
+                    real_tokens += stats.get('real_tokens', 0)
+                    processed_tokens += stats.get('processed_tokens', 0)
+                    processed_texts += len(request)
+            elapsed = time.perf_counter() - start
+
+        input_tokens = sum(token_counts[idx] for request in requests for idx in request) * self.repeats
+        latencies_ms = np.array(latencies) * 1000
+        return {
+            'texts': processed_texts,
+            'seconds': round(elapsed, 4),
+            'texts_per_sec': processed_texts / elapsed,
+            'tokens_per_sec': input_tokens / elapsed,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies_ms, 50)),
+                'p95': float(np.percentile(latencies_ms, 95)),
+                'mean': float(latencies_ms.mean())
+            },
+            'peak_rss_mb': round(rss.peak / 2**20, 1),
+            'padding_efficiency': real_tokens / processed_tokens if processed_tokens else 1.0
+        }
+
+    def _target_callable(self, target, encoder, classifier_path, model_dir):
+        if target not in self.TARGETS:
+            raise ValueError(f"Alvo inválido: {target}. Use um de {self.TARGETS}")
+
+        overrides = {
+            'model.bert_model': str(model_dir),
+            'model.embedding_cache.enabled': False,
+            'general.models_dir': str(classifier_path.parent),
+            'model.name': classifier_path.name
+        }
+        with _config_overrides(self.config, overrides):
+            if target == 'generate_embeddings':
+                from src.model.PoliticalBiasModelTrainer import PoliticalBiasModelTrainer
+                component = PoliticalBiasModelTrainer()
+            else:
+                from src.model.PoliticalBiasInferencer import PoliticalBiasInferencer
+                component = PoliticalBiasInferencer()
+        component._encoder = encoder
+
+        if target == 'generate_embeddings':
+            return component.generate_embeddings
+        if target == 'predict_batch':
+            return component.predict_batch
+        return lambda batch: component.predict(batch[0])
+
+    def _create_backend(self, backend_type: str, model_dir: Path):
+        from transformers import AutoModel
+        from src.model.EncoderBackend import OnnxBackend, QuantizedTorchBackend, TorchBackend
+
+        if backend_type == 'torch':
+            return TorchBackend(AutoModel.from_pretrained(model_dir))
+        if backend_type == 'quantized':
+            return QuantizedTorchBackend(AutoModel.from_pretrained(model_dir))
+        if backend_type in ('onnx', 'onnx-int8'):
+            return OnnxBackend(str(model_dir), str(self.work_dir / 'encoder.onnx'),
+                               quantize=backend_type == 'onnx-int8')
+        raise ValueError(f"Backend inválido: {backend_type}")
+
+    def _create_encoder(self, tokenizer, backend, scenario: Dict):
+        from src.model.BatchScheduler import BatchScheduler
+        from src.model.TextEncoder import TextEncoder
+
+        batching = scenario['batching']
+        if batching not in self.BATCHING:
+            raise ValueError(f"Batching inválido: {batching}. Use um de {self.BATCHING}")
+        scheduler = BatchScheduler(
+            batch_size=self.batch_size,
+            max_tokens=self.max_tokens if batching == 'token_budget' else None,
+            sort_by_length=batching != 'fixed'
+        )
+        return TextEncoder(tokenizer, backend, max_length=self.max_length,
+                           scheduler=scheduler, pooling=scenario['pooling'])
+
+    def _train_classifier(self, model_dir: Path, tokenizer, texts: List[str]) -> Path:
+        """Classificador sobre embeddings do modelo minúsculo, apenas para exercitar predict"""
+        import joblib
+        from sklearn.linear_model import LogisticRegression
+        from src.model.EncoderBackend import TorchBackend
+        from transformers import AutoModel
+
+        path = self.work_dir / 'classifier.joblib'
+        if path.exists():
+            return path
+        encoder = self._create_encoder(tokenizer, TorchBackend(AutoModel.from_pretrained(model_dir)),
+                                       {'batching': 'token_budget', 'pooling': 'mean'})
+        sample = texts[:64]
+        labels = np.arange(len(sample)) % 3
+        joblib.dump(LogisticRegression(max_iter=500).fit(encoder.encode(sample), labels), path)
+        return path
+
+    def _environment(self, threads: Optional[int], model_dir: Path) -> Dict:
+        import torch
+        import transformers
+
+        try:
+            commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                    text=True, cwd=self.config.project_root, timeout=10).stdout.strip()
+        except Exception:
+            commit = None
+        with open(model_dir / 'config.json', 'r', encoding='utf-8') as f:
+            model_config = json.load(f)
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit or None,
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'transformers': transformers.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'torch_threads': threads or torch.get_num_threads(),
+            'model': {key: model_config.get(key) for key in (
+                'hidden_size', 'num_hidden_layers', 'num_attention_heads', 'intermediate_size', 'vocab_size')}
+        }
+
+
+@contextmanager
+def _config_overrides(config: ConfigManager, overrides: Dict[str, Any]):
+    """Altera chaves do ConfigManager durante a criação dos componentes"""
+    original = copy.deepcopy(config.config)
+    try:
+        for path, value in overrides.items():
+            node = config.config
+            keys = path.split('.')
+            for key in keys[:-1]:
+                node = node.setdefault(key, {})
+            node[keys[-1]] = value
+        yield
+    finally:
+        config.config = original
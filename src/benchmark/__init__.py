@@ -0,0 +1,4 @@
+from .EncoderBenchmark import EncoderBenchmark
+from .SyntheticCorpus import SyntheticCorpus
+
+__all__ = ['EncoderBenchmark', 'SyntheticCorpus']
@@ -0,0 +1,60 @@
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+import logging
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent
+sys.path.append(str(project_root))
+
+from src.config import ConfigManager
+from src.benchmark import EncoderBenchmark
+
+config = ConfigManager()
+
+# Configura logging
+logging.basicConfig(
+    level=config.get('general.log_level'),
+    format=config.get('general.log_format')
+)
+
+parser = argparse.ArgumentParser(description='Benchmark offline do encoder e da inferência')
+parser.add_argument('--output', help='Arquivo JSON de resultados (padrão: benchmark.output_dir/<commit>_<data>.json)')
+parser.add_argument('--compare', help='JSON de uma execução anterior para comparação')
+parser.add_argument('--texts', type=int, help='Número de textos sintéticos')
+parser.add_argument('--distribution', choices=['short', 'long', 'mixed', 'uniform'],
+                    help='Distribuição de tamanho dos textos')
+args = parser.parse_args()
+
+settings = dict(config.get('benchmark', {}) or {})
+if args.texts:
+    settings['texts'] = args.texts
+if args.distribution:
+    settings['distribution'] = args.distribution
+
+benchmark = EncoderBenchmark(settings)
+report = benchmark.run()
+
+output = args.output or str(
+    Path(config.get_full_path('benchmark.output_dir'))
+    / f"{report['meta']['commit'] or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+)
+EncoderBenchmark.save(report, output)
+
+print(f"{'alvo':<20} {'batching':<13} {'backend':<10} {'pooling':<8} "
+      f"{'textos/s':>9} {'tokens/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'RSS MB':>8} {'padding':>8}")
+for r in report['results']:
+    print(f"{r['target']:<20} {r['batching']:<13} {r['backend']:<10} {r['pooling']:<8} "
+          f"{r['texts_per_sec']:>9.1f} {r['tokens_per_sec']:>10.0f} {r['latency_ms']['p50']:>8.1f} "
+          f"{r['latency_ms']['p95']:>8.1f} {r['peak_rss_mb']:>8.0f} {r['padding_efficiency']:>8.1%}")
+print(f"\nResultados salvos em {output}")
+
+if args.compare:
+    with open(args.compare, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nComparação com {args.compare} (commit {baseline['meta'].get('commit')}):")
+    for row in EncoderBenchmark.compare(baseline, report):
+        print(f"{row['target']:<20} {row['batching']:<13} {row['backend']:<10} {row['pooling']:<8} "
+              f"{row['texts_per_sec_before']:>9.1f} -> {row['texts_per_sec_after']:>9.1f} textos/s "
+              f"({row['throughput_change']:+.1%}), p95 {row['p95_ms_before']:.1f} -> {row['p95_ms_after']:.1f} ms")
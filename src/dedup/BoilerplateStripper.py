@@ -0,0 +1,81 @@
+import hashlib
+import re
+import logging
+from collections import Counter
+from typing import Iterable, List, Optional, Set, Tuple
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class BoilerplateStripper:
+    """
+    Remove trechos repetidos em muitos artigos de um mesmo portal
+
+    Rodapés, chamadas de newsletter e avisos se repetem literalmente entre
+    os artigos de um portal. O texto é dividido em linhas (ou em frases,
+    quando o texto está em uma única linha, como nos arquivos .txt antigos)
+    e cada trecho normalizado é contado uma vez por documento. Trechos com
+    pelo menos min_length caracteres presentes em min_documents documentos e
+    em min_fraction do portal são considerados boilerplate e removidos.
+    """
+
+    _SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+    _SPACES = re.compile(r'\s+')
+
+    def __init__(self,
+                 min_documents: Optional[int] = None,
+                 min_fraction: Optional[float] = None,
+                 min_length: Optional[int] = None):
+        """
+        Args:
+            min_documents: Documentos mínimos com o trecho (padrão: dedup.boilerplate.min_documents)
+            min_fraction: Fração mínima dos documentos (padrão: dedup.boilerplate.min_fraction)
+            min_length: Tamanho mínimo do trecho em caracteres (padrão: dedup.boilerplate.min_length)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+        self.min_documents = min_documents or self.config.get('dedup.boilerplate.min_documents', 5)
+        self.min_fraction = min_fraction or self.config.get('dedup.boilerplate.min_fraction', 0.05)
+        self.min_length = min_length or self.config.get('dedup.boilerplate.min_length', 20)
+        self.boilerplate: Set[bytes] = set()
+        self.documents = 0
+
+    def learn(self, texts: Iterable[str]) -> int:
+        """
+        Aprende os trechos repetidos de um conjunto de textos (uma passagem)
+
+        Returns:
+            Número de trechos considerados boilerplate
+        """
+        frequency = Counter()
+        documents = 0
+        for text in texts:
+            documents += 1
+            _, segments = self.segments(text)
+            frequency.update({key for key in map(self._key, segments) if key is not None})
+
+        min_count = max(self.min_documents, self.min_fraction * documents)
+        self.boilerplate = {key for key, count in frequency.items() if count >= min_count}
+        self.documents = documents
+        self.logger.info(f"{len(self.boilerplate)} trechos de boilerplate aprendidos em {documents} textos")
+        return len(self.boilerplate)
+
+    def strip(self, text: str) -> str:
+        """Texto sem os trechos de boilerplate"""
+        if not self.boilerplate:
+            return text
+        separator, segments = self.segments(text)
+        return separator.join(segment for segment in segments if self._key(segment) not in self.boilerplate)
+
+    def segments(self, text: str) -> Tuple[str, List[str]]:
+        """Separador e trechos do texto: linhas, ou frases se houver uma única linha"""
+        lines = [line for line in text.splitlines() if line.strip()]
+        if len(lines) > 1:
+            return '\n', lines
+        return ' ', self._SENTENCE_END.split(text.strip())
+
+    def _key(self, segment: str) -> Optional[bytes]:
+        normalized = self._SPACES.sub(' ', segment).strip().lower()
+        if len(normalized) < self.min_length:
+            return None
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
@@ -0,0 +1,163 @@
+import re
+import zlib
+import logging
+import numpy as np
+from typing import Dict, Hashable, Iterable, List, Optional
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class MinHashDeduplicator:
+    """
+    Detecção de quase-duplicatas com MinHash e LSH por bandas
+
+    Cada texto vira o conjunto de seus shingles (sequências de shingle_size
+    palavras) e uma assinatura de num_perm mínimos de funções hash
+    universais. A assinatura é dividida em `bands` bandas: dois textos que
+    coincidem em alguma banda são candidatos, e o candidato é confirmado se
+    a similaridade de Jaccard estimada for ao menos `threshold`. Cada texto
+    consulta apenas os baldes de suas bandas, então o custo é linear no
+    número de textos. Apenas textos não duplicados são indexados, e o
+    resultado é determinístico entre execuções. Acima de max_index_size
+    textos indexados, os mais antigos saem do índice, então a memória fica
+    limitada e duplicatas muito distantes na sequência deixam de ser vistas.
+
+    Uso:
+        dedup = MinHashDeduplicator()
+        for doc_id, text in documentos:
+            if dedup.add(doc_id, text) is None:
+                ...  # texto novo
+    """
+
+    _WORD = re.compile(r'\w+')
+
+    def __init__(self,
+                 num_perm: Optional[int] = None,
+                 bands: Optional[int] = None,
+                 shingle_size: Optional[int] = None,
+                 threshold: Optional[float] = None,
+                 max_index_size: Optional[int] = None,
+                 seed: int = 1):
+        """
+        Args:
+            num_perm: Tamanho da assinatura (padrão: dedup.num_perm)
+            bands: Bandas do LSH; num_perm deve ser múltiplo (padrão: dedup.bands)
+            shingle_size: Palavras por shingle (padrão: dedup.shingle_size)
+            threshold: Jaccard estimado mínimo para duplicata (padrão: dedup.threshold)
+            max_index_size: Textos mantidos no índice; None sem limite (padrão: dedup.max_index_size)
+            seed: Semente das funções hash
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+        self.num_perm = num_perm or self.config.get('dedup.num_perm', 128)
+        self.bands = bands or self.config.get('dedup.bands', 16)
+        self.shingle_size = shingle_size or self.config.get('dedup.shingle_size', 5)
+        self.threshold = threshold or self.config.get('dedup.threshold', 0.85)
+        self.max_index_size = max_index_size or self.config.get('dedup.max_index_size', 100000)
+        if self.num_perm % self.bands:
+            raise ValueError(f"num_perm ({self.num_perm}) deve ser múltiplo de bands ({self.bands})")
+        self.rows = self.num_perm // self.bands
+
+        # Hash multiplica-desloca: ((a * x + b) mod 2^64) >> 32, com a ímpar
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(0, 1 << 63, size=(self.num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 63, size=(self.num_perm, 1), dtype=np.uint64)
+        # Pesos do hash polinomial das janelas de palavras
+        self._weights = np.array([pow(1_000_003, k, 1 << 64) for k in range(self.shingle_size)],
+                                 dtype=np.uint64)
+        self._word_hashes: Dict[str, int] = {}
+
+        # Posição -> id/assinatura, em ordem de inserção; as posições nunca são reutilizadas
+        self.ids: Dict[int, Hashable] = {}
+        self.signatures: Dict[int, np.ndarray] = {}
+        self.buckets: List[Dict[bytes, int]] = [{} for _ in range(self.bands)]
+        self._next_position = 0
+
+    def signature(self, text: str) -> np.ndarray:
+        """Assinatura MinHash (uint32) do texto"""
+        words = self._WORD.findall(text.lower())
+        if not words:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+        hashes = np.fromiter((self._word_hash(word) for word in words), dtype=np.uint64, count=len(words))
+        size = min(self.shingle_size, len(words))
+        windows = np.lib.stride_tricks.sliding_window_view(hashes, size)
+        # Aritmética uint64 com estouro: hash polinomial de cada janela
+        shingles = np.unique((windows * self._weights[:size]).sum(axis=1, dtype=np.uint64))
+        shingles = (shingles >> np.uint64(32)) ^ (shingles & np.uint64(0xFFFFFFFF))
+
+        values = self._a * shingles[None, :]
+        values += self._b
+        values >>= np.uint64(32)
+        return values.min(axis=1).astype(np.uint32)
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Jaccard estimado entre duas assinaturas"""
+        return float(np.count_nonzero(first == second)) / self.num_perm
+
+    def query(self, signature: np.ndarray) -> Optional[int]:
+        """Posição do texto indexado mais parecido acima do limiar, se houver"""
+        best, best_score = None, self.threshold
+        seen = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            position = self.buckets[band].get(key)
+            if position is None or position in seen:
+                continue
+            seen.add(position)
+            score = self.similarity(signature, self.signatures[position])
+            if score >= best_score:
+                best, best_score = position, score
+        return best
+
+    def add(self, doc_id: Hashable, text: str) -> Optional[Hashable]:
+        """
+        Indexa o texto, a menos que seja quase-duplicata de um já indexado
+
+        Returns:
+            Id do texto original, se for duplicata; None se o texto foi indexado
+        """
+        signature = self.signature(text)
+        match = self.query(signature)
+        if match is not None:
+            return self.ids[match]
+
+        position = self._next_position
+        self._next_position += 1
+        self.ids[position] = doc_id
+        self.signatures[position] = signature
+        # O balde aponta para o texto mais recente, que é o último a sair do índice
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band][key] = position
+        if self.max_index_size and len(self.ids) > self.max_index_size:
+            self._evict_oldest()
+        return None
+
+    def duplicates(self, texts: Iterable[str]) -> List[Optional[int]]:
+        """
+        Para cada texto, a posição do primeiro texto de que ele é quase-duplicata
+
+        Returns:
+            Lista com None para os textos mantidos
+        """
+        return [self.add(idx, text) for idx, text in enumerate(texts)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _evict_oldest(self) -> None:
+        """Remove do índice o texto indexado há mais tempo"""
+        position = next(iter(self.ids))
+        del self.ids[position]
+        for band, key in enumerate(self._band_keys(self.signatures.pop(position))):
+            if self.buckets[band].get(key) == position:
+                del self.buckets[band][key]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _word_hash(self, word: str) -> int:
+        value = self._word_hashes.get(word)
+        if value is None:
+            value = zlib.crc32(word.encode('utf-8'))
+            self._word_hashes[word] = value
+        return value
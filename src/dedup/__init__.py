@@ -0,0 +1,4 @@
+from .BoilerplateStripper import BoilerplateStripper
+from .MinHashDeduplicator import MinHashDeduplicator
+
+__all__ = ['BoilerplateStripper', 'MinHashDeduplicator']
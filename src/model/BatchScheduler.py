@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional
+
+
+class BatchScheduler:
+    """
+    Agrupa textos já tokenizados em lotes para o encoder BERT
+    """
+
+    def __init__(self,
+                 batch_size: int = 16,
+                 max_tokens: Optional[int] = None,
+                 sort_by_length: bool = False):
+        """
+        Args:
+            batch_size: Número máximo de textos por lote
+            max_tokens: Orçamento de tokens por lote (textos x maior comprimento
+                do lote, já contando o padding). None desativa o limite
+            sort_by_length: Agrupa textos de comprimento parecido para reduzir
+                o padding. Os índices retornados continuam referindo-se à entrada
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser maior que zero")
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.sort_by_length = sort_by_length
+
+    def schedule(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Gera os lotes a partir do comprimento (em tokens) de cada texto
+
+        Args:
+            lengths: Comprimento tokenizado de cada texto
+
+        Returns:
+            Lista de lotes, cada um com os índices dos textos na entrada
+        """
+        order = list(range(len(lengths)))
+        if self.sort_by_length:
+            # Do maior para o menor: lotes com textos longos aparecem primeiro
+            order.sort(key=lambda idx: lengths[idx], reverse=True)
+
+        batches = []
+        current = []
+        current_max = 0
+
+        for idx in order:
+            length = lengths[idx]
+            new_max = max(current_max, length)
+            exceeds_count = len(current) >= self.batch_size
+            exceeds_tokens = (
+                self.max_tokens is not None
+                and current
+                and new_max * (len(current) + 1) > self.max_tokens
+            )
+
+            if exceeds_count or exceeds_tokens:
+                batches.append(current)
+                current = []
+                new_max = length
+
+            current.append(idx)
+            current_max = new_max
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    @staticmethod
+    def padding_stats(lengths: List[int], batches: List[List[int]]) -> Dict:
+        """
+        Calcula o desperdício de padding de um agendamento
+
+        Returns:
+            Dicionário com tokens reais, tokens processados (com padding),
+            tokens de padding e a fração desperdiçada
+        """
+        real = sum(lengths[idx] for batch in batches for idx in batch)
+        processed = sum(
+            len(batch) * max(lengths[idx] for idx in batch)
+            for batch in batches if batch
+        )
+        padding = processed - real
+        return {
+            'batches': len(batches),
+            'real_tokens': real,
+            'processed_tokens': processed,
+            'padding_tokens': padding,
+            'padding_ratio': padding / processed if processed else 0.0
+        }
@@ -0,0 +1,126 @@
+import time
+import logging
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+from sklearn.neural_network import MLPClassifier
+from typing import Dict, List, Optional
+from src.config import ConfigManager
+from .EmbeddingArtifact import EmbeddingArtifact
+
+logger = logging.getLogger(__name__)
+
+CLASSIFIER_TYPES = {
+    'mlp': MLPClassifier,
+    'logreg': LogisticRegression
+}
+
+
+def create_classifier(spec: Dict, random_state: Optional[int] = None):
+    """
+    Cria um classificador a partir de uma especificação do config.yaml
+
+    Args:
+        spec: {'type': 'mlp' | 'logreg', 'params': {...}}
+        random_state: Semente usada se params não definir uma
+    """
+    classifier_type = spec.get('type', 'mlp')
+    if classifier_type not in CLASSIFIER_TYPES:
+        raise ValueError(f"Classificador inválido: {classifier_type}. Use um de {list(CLASSIFIER_TYPES)}")
+    params = dict(spec.get('params') or {})
+    if 'hidden_layer_sizes' in params:
+        params['hidden_layer_sizes'] = tuple(np.atleast_1d(params['hidden_layer_sizes']))
+    if random_state is not None:
+        params.setdefault('random_state', random_state)
+    return CLASSIFIER_TYPES[classifier_type](**params)
+
+
+def fit_and_score(spec: Dict,
+                  embeddings: np.ndarray,
+                  labels: np.ndarray,
+                  train_idx: np.ndarray,
+                  test_idx: np.ndarray,
+                  random_state: int) -> Dict:
+    """Treina uma especificação nas linhas train_idx e avalia nas linhas test_idx"""
+    start = time.perf_counter()
+    classifier = create_classifier(spec, random_state)
+    classifier.fit(embeddings[train_idx], labels[train_idx])
+    fit_seconds = time.perf_counter() - start
+
+    y_pred = classifier.predict(embeddings[test_idx])
+    return {
+        'name': spec.get('name', spec.get('type', 'mlp')),
+        'type': spec.get('type', 'mlp'),
+        'params': spec.get('params') or {},
+        'accuracy': accuracy_score(labels[test_idx], y_pred),
+        'f1_macro': f1_score(labels[test_idx], y_pred, average='macro'),
+        'fit_seconds': round(fit_seconds, 2)
+    }
+
+
+class ClassifierExperiments:
+    """
+    Compara classificadores sobre um artefato de embeddings já gerado
+
+    Todos os classificadores usam a mesma divisão treino/teste estratificada e
+    são treinados em paralelo (joblib). A matriz é passada aos processos como
+    memmap, sem cópia, então nenhum experimento relê o CSV ou executa o BERT.
+    """
+
+    def __init__(self,
+                 artifact: EmbeddingArtifact,
+                 n_jobs: Optional[int] = None,
+                 test_size: Optional[float] = None):
+        """
+        Args:
+            artifact: Artefato de embeddings
+            n_jobs: Processos em paralelo (padrão: model.experiments.n_jobs; -1 usa todos os núcleos)
+            test_size: Fração de teste (padrão: model.experiments.test_size)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+        self.artifact = artifact
+        self.n_jobs = n_jobs if n_jobs is not None else self.config.get('model.experiments.n_jobs', -1)
+        self.test_size = test_size or self.config.get('model.experiments.test_size', 0.25)
+        self.random_state = self.config.get('model.random_state', 1)
+
+    def run(self, classifiers: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """
+        Treina e avalia cada classificador
+
+        Args:
+            classifiers: Especificações {'name', 'type', 'params'}
+                (padrão: model.experiments.classifiers)
+
+        Returns:
+            DataFrame ordenado por acurácia
+        """
+        classifiers = classifiers or self.config.get('model.experiments.classifiers', [])
+        if not classifiers:
+            raise ValueError("Nenhum classificador definido em model.experiments.classifiers")
+
+        rows = self.artifact.valid_rows()
+        labels = self.artifact.int_labels()
+        train_idx, test_idx = train_test_split(
+            rows,
+            test_size=self.test_size,
+            stratify=labels[rows],
+            random_state=self.random_state
+        )
+
+        self.logger.info(
+            f"Executando {len(classifiers)} experimentos sobre o artefato {self.artifact.version} "
+            f"({len(train_idx)} treino, {len(test_idx)} teste)"
+        )
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(fit_and_score)(spec, self.artifact.embeddings, labels,
+                                   train_idx, test_idx, self.random_state)
+            for spec in classifiers
+        )
+
+        df = pd.DataFrame(results).sort_values('accuracy', ascending=False, ignore_index=True)
+        df.insert(0, 'artifact', self.artifact.version)
+        return df
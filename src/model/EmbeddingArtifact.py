@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+import logging
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingArtifact:
+    """
+    Matriz de embeddings de treinamento versionada, com rótulos e ids das linhas
+
+    Cada versão fica em <model.artifacts_dir>/<versão>/ com embeddings.npy,
+    labels.npy, row_ids.npy e manifest.json. A versão é derivada do hash dos
+    textos, dos rótulos e dos parâmetros do encoder, então os mesmos
+    discursos com os mesmos rótulos e o mesmo encoder produzem sempre a
+    mesma versão. Os arrays são abertos como
+    memmap, de modo que experimentos com classificadores não precisam
+    recarregar o CSV nem o BERT, e processos paralelos compartilham as páginas.
+    """
+
+    MANIFEST_FILE = 'manifest.json'
+    LATEST_FILE = 'LATEST'
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Diretório de uma versão já gravada
+        """
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        with open(self.path / self.MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            self.manifest: Dict = json.load(f)
+
+        self.embeddings = np.load(self.path / 'embeddings.npy', mmap_mode='r')
+        self.labels = np.load(self.path / 'labels.npy', mmap_mode='r')
+        self.row_ids = np.load(self.path / 'row_ids.npy', mmap_mode='r', allow_pickle=False)
+
+    @property
+    def version(self) -> str:
+        return self.manifest['version']
+
+    @staticmethod
+    def artifacts_dir() -> Path:
+        return Path(ConfigManager().get_full_path('model.artifacts_dir'))
+
+    @classmethod
+    def version_for(cls, fingerprint: str) -> str:
+        """Versão correspondente a um fingerprint de textos, rótulos e encoder"""
+        return fingerprint[:16]
+
+    @classmethod
+    def exists(cls, version: str) -> bool:
+        return (cls.artifacts_dir() / version / cls.MANIFEST_FILE).exists()
+
+    @classmethod
+    def load(cls, version: Optional[str] = None) -> 'EmbeddingArtifact':
+        """
+        Abre uma versão (padrão: a última gravada)
+
+        Raises:
+            FileNotFoundError: Se a versão não existir
+        """
+        base_dir = cls.artifacts_dir()
+        if version is None:
+            latest = base_dir / cls.LATEST_FILE
+            if not latest.exists():
+                raise FileNotFoundError(f"Nenhum artefato de embeddings em {base_dir}")
+            version = latest.read_text().strip()
+        if not cls.exists(version):
+            raise FileNotFoundError(f"Artefato de embeddings {version} não encontrado em {base_dir}")
+        return cls(base_dir / version)
+
+    @classmethod
+    def save(cls,
+             embeddings: np.ndarray,
+             labels: np.ndarray,
+             row_ids: np.ndarray,
+             fingerprint: str,
+             metadata: Optional[Dict] = None) -> 'EmbeddingArtifact':
+        """
+        Grava uma nova versão e a marca como a última
+
+        Args:
+            embeddings: Matriz (n, dim)
+            labels: Rótulo numérico de cada linha
+            row_ids: Identificador de cada linha na fonte (ex.: índice do CSV)
+            fingerprint: Hash dos textos, dos rótulos e do encoder (define a versão)
+            metadata: Informações adicionais para o manifesto (fonte, encoder, mapeamento)
+        """
+        version = cls.version_for(fingerprint)
+        base_dir = cls.artifacts_dir()
+        final_dir = base_dir / version
+        tmp_dir = base_dir / f'.{version}.tmp'
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        labels = np.asarray(labels)
+        np.save(tmp_dir / 'embeddings.npy', embeddings)
+        np.save(tmp_dir / 'labels.npy', labels)
+        row_ids = np.asarray(row_ids)
+        if row_ids.dtype == object:
+            row_ids = row_ids.astype(str)
+        np.save(tmp_dir / 'row_ids.npy', row_ids)
+
+        values, counts = np.unique(labels, return_counts=True)
+        manifest = {
+            'version': version,
+            'fingerprint': fingerprint,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'rows': int(embeddings.shape[0]),
+            'dim': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+            'invalid_rows': int(np.isnan(embeddings).any(axis=1).sum()) if embeddings.size else 0,
+            'label_counts': {str(v): int(c) for v, c in zip(values, counts)},
+            **(metadata or {})
+        }
+        with open(tmp_dir / cls.MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False, default=str)
+
+        if final_dir.exists():
+            shutil.rmtree(final_dir)
+        os.replace(tmp_dir, final_dir)
+        cls.set_latest(version)
+
+        logger.info(f"Artefato de embeddings {version} salvo em {final_dir}")
+        return cls(final_dir)
+
+    @classmethod
+    def versions(cls) -> List[Dict]:
+        """Manifestos de todas as versões, da mais recente para a mais antiga"""
+        base_dir = cls.artifacts_dir()
+        manifests = []
+        for manifest_path in base_dir.glob(f'*/{cls.MANIFEST_FILE}'):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifests.append(json.load(f))
+        return sorted(manifests, key=lambda m: m['created_at'], reverse=True)
+
+    @classmethod
+    def set_latest(cls, version: str) -> None:
+        """Marca uma versão como a última (usada por load sem versão)"""
+        latest = cls.artifacts_dir() / cls.LATEST_FILE
+        tmp_path = latest.with_suffix('.tmp')
+        tmp_path.write_text(version)
+        os.replace(tmp_path, latest)
+
+    def valid_rows(self) -> np.ndarray:
+        """Índices das linhas com embedding válido e rótulo definido"""
+        labels = np.asarray(self.labels, dtype=float)
+        valid = ~np.isnan(labels)
+        if self.manifest.get('invalid_rows', 0):
+            valid &= ~np.isnan(self.embeddings).any(axis=1)
+        return np.flatnonzero(valid)
+
+    def int_labels(self) -> np.ndarray:
+        """Rótulos como inteiros (-1 para linhas sem rótulo)"""
+        labels = np.asarray(self.labels)
+        if labels.dtype.kind == 'f':
+            return np.nan_to_num(labels, nan=-1).astype(int)
+        return labels
@@ -0,0 +1,429 @@
+import atexit
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+import unicodedata
+import logging
+import numpy as np
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from src.config import ConfigManager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    Cache persistente de embeddings endereçado pelo conteúdo do texto
+
+    A chave de cada embedding é o hash de (texto normalizado, model.bert_model,
+    model.max_length, model.pooling, o backend do encoder e, se habilitada, a
+    configuração de model.long_documents), de modo que trocar o modelo ou a
+    forma de pooling invalida automaticamente as entradas antigas. Os vetores ficam
+    em um arquivo float32 mapeado em memória e o índice em JSON. Quando o
+    tamanho configurado é excedido, as entradas usadas há mais tempo são
+    descartadas e suas linhas reaproveitadas.
+
+    Há uma única instância por diretório em cada processo, compartilhada por
+    PoliticalBiasModelTrainer e PoliticalBiasInferencer. Entre processos, cada
+    alteração é acrescentada a index.log sob uma trava de arquivo (fcntl), e
+    antes de ler ou alocar linhas o cache aplica o que os outros processos
+    acrescentaram. O index.json é regravado (compactando o log) a cada
+    index_flush_every gravações e na saída do processo. Descartes são
+    registrados antes de a linha ser reaproveitada e novas entradas só depois
+    que o vetor foi gravado, então uma interrupção perde no máximo as entradas
+    recentes, nunca associa um texto ao vetor de outro.
+    """
+
+    INDEX_FILE = 'index.json'
+    LOG_FILE = 'index.log'
+    LOCK_FILE = 'index.lock'
+    VECTORS_FILE = 'vectors.f32'
+
+    _instances: Dict[Path, 'EmbeddingCache'] = {}
+    _instances_lock = threading.Lock()
+
+    def __new__(cls, cache_dir: Optional[str] = None, max_size_mb: Optional[float] = None):
+        if cache_dir is None:
+            cache_dir = ConfigManager().get_full_path('model.embedding_cache.dir')
+        path = Path(cache_dir).resolve()
+        with cls._instances_lock:
+            if path not in cls._instances:
+                instance = super().__new__(cls)
+                instance.cache_dir = path
+                cls._instances[path] = instance
+            return cls._instances[path]
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: Optional[float] = None):
+        """
+        Args:
+            cache_dir: Diretório do cache (padrão: model.embedding_cache.dir)
+            max_size_mb: Tamanho máximo dos vetores em MB (padrão: model.embedding_cache.max_size_mb);
+                só vale na primeira instância criada para o diretório
+        """
+        if hasattr(self, 'entries'):
+            return
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        if max_size_mb is None:
+            max_size_mb = self.config.get('model.embedding_cache.max_size_mb', 2048)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.index_flush_every = self.config.get('model.embedding_cache.index_flush_every', 50)
+
+        self.key_params = self.encoder_params(self.config)
+        # Em modo somente leitura (ex.: processos filhos) nada é gravado em disco
+        self.read_only = False
+
+        self.dim = None
+        self.capacity = 0
+        self.entries: Dict[str, List] = {}
+        self.vectors = None
+        self._free_rows = set()
+        # Geração do index.json carregado e posição já aplicada do index.log
+        self._generation = None
+        self._log_offset = 0
+        self._pending_stores = 0
+        self._lock = threading.RLock()
+        with self._locked(exclusive=False):
+            self._sync(exclusive=False)
+        atexit.register(self.flush)
+
+    @staticmethod
+    def encoder_params(config: ConfigManager) -> List:
+        """Parâmetros do encoder que alteram o embedding e portanto fazem parte da chave"""
+        params = [
+            config.get('model.bert_model'),
+            config.get('model.max_length', 512),
+            config.get('model.pooling', 'mean'),
+            config.get('model.backend.type', 'torch')
+        ]
+        if params[-1] == 'onnx' and config.get('model.backend.onnx_quantize', False):
+            params[-1] = 'onnx-int8'
+        long_documents = config.get('model.long_documents', {}) or {}
+        if long_documents.get('enabled', False):
+            params.append({
+                'stride': long_documents.get('stride'),
+                'aggregation': long_documents.get('aggregation', 'mean'),
+                'max_chunks': long_documents.get('max_chunks', 16)
+            })
+        return params
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normaliza unicode e espaços para que variações triviais compartilhem a chave"""
+        return ' '.join(unicodedata.normalize('NFC', text).split())
+
+    def key(self, text: str) -> str:
+        """Chave do cache para um texto"""
+        payload = json.dumps([self.normalize(text)] + self.key_params, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def fetch(self,
+              texts: List[str],
+              compute: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Retorna os embeddings dos textos, calculando apenas os ausentes do cache
+
+        Args:
+            texts: Textos a codificar
+            compute: Função que gera embeddings para uma lista de textos
+
+        Returns:
+            Matriz de embeddings na ordem de entrada
+        """
+        keys = [self.key(t) if isinstance(t, str) else None for t in texts]
+        cached, missing = self.lookup(keys)
+
+        self.logger.info(f"Cache de embeddings: {len(cached)} encontrados, {len(missing)} a calcular")
+
+        computed = None
+        if missing:
+            computed = compute([texts[idx] for idx in missing])
+            self.store([keys[idx] for idx in missing], computed)
+
+        if self.dim is None and computed is None:
+            return np.empty((len(texts), 0), dtype=np.float32)
+
+        dim = self.dim if self.dim is not None else computed.shape[1]
+        result = np.empty((len(texts), dim), dtype=np.float32)
+        for idx, vector in cached.items():
+            result[idx] = vector
+        if missing:
+            result[missing] = computed
+        return result
+
+
+    def lookup(self, keys: List[Optional[str]]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Procura chaves no cache
+
+        Returns:
+            Dicionário posição -> vetor encontrado e lista de posições ausentes
+        """
+        now = time.time()
+        cached = {}
+        missing = []
+        with self._locked(exclusive=False):
+            # Outro processo pode ter descartado entradas e reaproveitado suas linhas
+            self._sync(exclusive=False)
+            for idx, key in enumerate(keys):
+                entry = self.entries.get(key) if key is not None else None
+                if entry is None:
+                    missing.append(idx)
+                    continue
+                entry[1] = now
+                cached[idx] = np.array(self.vectors[entry[0]])
+        return cached, missing
+
+    def store(self, keys: List[Optional[str]], embeddings: np.ndarray) -> None:
+        """Grava embeddings no cache, ignorando linhas inválidas (NaN)"""
+        if self.read_only:
+            return
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[0] == 0:
+            return
+
+        valid = ~np.isnan(embeddings).any(axis=1)
+        items = {}
+        for key, vector, ok in zip(keys, embeddings, valid):
+            if key is not None and ok:
+                items[key] = vector
+
+        with self._locked():
+            self._sync()
+            if self.dim is not None and embeddings.shape[1] != self.dim:
+                self.logger.warning("Dimensão dos embeddings mudou, limpando cache")
+                self._clear()
+            if self.dim is None:
+                self.dim = embeddings.shape[1]
+
+            new_items = {k: v for k, v in items.items() if k not in self.entries}
+            if not new_items:
+                return
+
+            max_entries = max(self.max_bytes // (self.dim * 4), 1)
+            if len(new_items) > max_entries:
+                new_items = dict(list(new_items.items())[-max_entries:])
+            records = [['del', key] for key in self._evict(len(self.entries) + len(new_items) - max_entries)]
+
+            needed = len(new_items) - len(self._free_rows)
+            if needed > 0:
+                capacity = min(max(self.capacity * 2, self.capacity + needed), max_entries)
+                self._grow(capacity)
+                records.insert(0, ['grow', capacity, self.dim])
+            # Os descartes chegam ao log antes de as linhas receberem outros vetores
+            self._append_log(records)
+
+            now = time.time()
+            records = []
+            for key, vector in new_items.items():
+                row = self._free_rows.pop()
+                self.vectors[row] = vector
+                self.entries[key] = [row, now]
+                records.append(['put', key, row, now])
+            self.vectors.flush()
+            self._append_log(records)
+
+            self._pending_stores += 1
+            if self._pending_stores >= self.index_flush_every:
+                self._compact()
+
+    def flush(self) -> None:
+        """Regrava o índice se houver alterações pendentes"""
+        if self.read_only or not self._pending_stores:
+            return
+        with self._locked():
+            self._sync()
+            self._compact()
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache"""
+        with self._locked():
+            self._clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, text: str) -> bool:
+        return self.key(text) in self.entries
+
+    @contextmanager
+    def _locked(self, exclusive: bool = True):
+        """Trava entre threads e, onde há fcntl, entre processos que usam o diretório"""
+        with self._lock, open(self.cache_dir / self.LOCK_FILE, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _clear(self) -> None:
+        self.entries = {}
+        self.vectors = None
+        self.capacity = 0
+        self.dim = None
+        self._free_rows = set()
+        vectors_path = self.cache_dir / self.VECTORS_FILE
+        if vectors_path.exists():
+            vectors_path.unlink()
+        self._compact()
+
+    def _evict(self, count: int) -> List[str]:
+        """Descarta as `count` entradas usadas há mais tempo e devolve suas chaves"""
+        if count <= 0:
+            return []
+        oldest = heapq.nsmallest(count, self.entries.items(), key=lambda item: item[1][1])
+        for key, entry in oldest:
+            del self.entries[key]
+            self._free_rows.add(entry[0])
+        self.logger.info(f"Cache de embeddings: {len(oldest)} entradas descartadas")
+        return [key for key, _ in oldest]
+
+    def _grow(self, capacity: int) -> None:
+        """Aumenta o arquivo de vetores e reabre o mapeamento em memória"""
+        if self.vectors is not None:
+            self.vectors.flush()
+        # O arquivo só cresce, então mapeamentos menores de outros processos continuam válidos
+        with open(self.cache_dir / self.VECTORS_FILE, 'ab') as f:
+            if f.tell() < capacity * self.dim * 4:
+                f.truncate(capacity * self.dim * 4)
+        self._free_rows.update(range(self.capacity, capacity))
+        self.capacity = capacity
+        self._open_vectors(reopen=True)
+
+    def _open_vectors(self, reopen: bool = False) -> None:
+        if not self.capacity or not self.dim:
+            self.vectors = None
+        elif reopen or self.vectors is None or self.vectors.shape != (self.capacity, self.dim):
+            self.vectors = np.memmap(self.cache_dir / self.VECTORS_FILE, dtype=np.float32, mode='r+',
+                                     shape=(self.capacity, self.dim))
+
+    def _sync(self, exclusive: bool = True) -> None:
+        """Aplica o que outros processos gravaram desde a última leitura (com a trava obtida)"""
+        try:
+            try:
+                log_file = open(self.cache_dir / self.LOG_FILE, 'rb')
+            except FileNotFoundError:
+                # Cache novo ou gravado antes do log: só o index.json, se existir
+                if self._generation is None:
+                    self._load_index()
+                return
+            with log_file:
+                header = log_file.readline()
+                generation = json.loads(header)['generation']
+                if generation != self._generation:
+                    # Outro processo compactou ou limpou o cache: recarrega o índice inteiro
+                    self._load_index()
+                    if self._generation > generation:
+                        # Compactação interrompida entre o index.json e o log: o índice já contém o log
+                        if exclusive and not self.read_only:
+                            self._compact()
+                        return
+                    if self._generation != generation:
+                        raise ValueError(f"index.json na geração {self._generation}, log na {generation}")
+                    self._log_offset = len(header)
+                else:
+                    log_file.seek(self._log_offset)
+                for line in log_file:
+                    if not line.endswith(b'\n'):
+                        # Registro incompleto de um processo interrompido
+                        break
+                    self._apply(json.loads(line))
+                    self._log_offset += len(line)
+        except Exception as e:
+            self.logger.warning(f"Cache de embeddings inválido, recriando: {str(e)}")
+            self.entries = {}
+            self.capacity = 0
+            self.dim = None
+            self.vectors = None
+            self._free_rows = set()
+            if exclusive and not self.read_only:
+                self._clear()
+
+    def _apply(self, record: List) -> None:
+        """Aplica um registro do index.log ao estado em memória"""
+        if record[0] == 'put':
+            _, key, row, last_used = record
+            self.entries[key] = [row, last_used]
+            self._free_rows.discard(row)
+        elif record[0] == 'del':
+            entry = self.entries.pop(record[1], None)
+            if entry is not None:
+                self._free_rows.add(entry[0])
+        elif record[0] == 'grow':
+            _, capacity, self.dim = record
+            self._free_rows.update(range(self.capacity, capacity))
+            self.capacity = capacity
+            self._open_vectors()
+
+    def _append_log(self, records: List[List]) -> None:
+        if not records:
+            return
+        log_path = self.cache_dir / self.LOG_FILE
+        if not log_path.exists():
+            # Primeiro registro (ou cache gravado antes do log): parte de um índice atualizado
+            self._compact()
+        payload = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+        with open(log_path, 'ab') as f:
+            # Descarta um registro incompleto deixado por uma gravação interrompida
+            if f.tell() != self._log_offset:
+                f.truncate(self._log_offset)
+            f.write(payload)
+        self._log_offset += len(payload)
+
+    def _load_index(self) -> None:
+        index_path = self.cache_dir / self.INDEX_FILE
+        previous = self.entries
+        if index_path.exists():
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        else:
+            index = {'dim': None, 'capacity': 0, 'entries': {}}
+        self.dim = index['dim']
+        self.capacity = index['capacity']
+        self.entries = index['entries']
+        self._generation = index.get('generation', 0)
+        # Preserva os usos registrados apenas na memória deste processo
+        for key, entry in self.entries.items():
+            if key in previous:
+                entry[1] = max(entry[1], previous[key][1])
+        used = {entry[0] for entry in self.entries.values()}
+        self._free_rows = set(range(self.capacity)) - used
+        self._open_vectors(reopen=True)
+
+    def _compact(self) -> None:
+        """Regrava o index.json com o estado atual e inicia um index.log vazio"""
+        generation = (self._generation or 0) + 1
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dim': self.dim,
+                'capacity': self.capacity,
+                'generation': generation,
+                'entries': self.entries
+            }, f)
+        os.replace(tmp_path, index_path)
+
+        header = (json.dumps({'generation': generation}) + '\n').encode('utf-8')
+        log_path = self.cache_dir / self.LOG_FILE
+        tmp_path = log_path.with_name(log_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+        os.replace(tmp_path, log_path)
+
+        self._generation = generation
+        self._log_offset = len(header)
+        self._pending_stores = 0
@@ -0,0 +1,226 @@
+import inspect
+import logging
+from abc import ABC, abstractmethod
+import numpy as np
+import torch
+from pathlib import Path
+from typing import Dict, Optional
+from transformers import AutoModel
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TYPES = ('torch', 'quantized', 'onnx')
+
+
+class EncoderBackend(ABC):
+    """
+    Interface comum para executar o encoder BERT
+
+    forward recebe a saída do tokenizer (tensores PyTorch) e devolve o
+    last_hidden_state como tensor float32, para que o pooling seja o mesmo
+    independentemente de onde o modelo roda.
+    """
+
+    name = 'base'
+
+    @property
+    @abstractmethod
+    def hidden_size(self) -> int:
+        """Dimensão do last_hidden_state"""
+
+    @abstractmethod
+    def forward(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        """last_hidden_state (lote, tokens, dimensão) em float32"""
+
+    def set_num_threads(self, threads: int) -> None:
+        """Define as threads de paralelismo intra-operação"""
+        torch.set_num_threads(threads)
+
+
+class TorchBackend(EncoderBackend):
+    """Modelo PyTorch em fp32 (referência)"""
+
+    name = 'torch'
+
+    def __init__(self, model):
+        self.model = model
+        self.model.eval()
+
+    @property
+    def hidden_size(self) -> int:
+        return self.model.config.hidden_size
+
+    def forward(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        with torch.inference_mode():
+            return self.model(**inputs).last_hidden_state.float()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """Camadas lineares quantizadas dinamicamente em int8 para CPU"""
+
+    name = 'quantized'
+
+    def __init__(self, model):
+        model.eval()
+        quantized = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        super().__init__(quantized)
+
+
+class _HiddenStateWrapper(torch.nn.Module):
+    """Fixa a assinatura posicional e a saída (last_hidden_state) para exportação"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids
+        ).last_hidden_state
+
+
+class OnnxBackend(EncoderBackend):
+    """
+    Grafo ONNX executado pelo ONNX Runtime na CPU
+
+    Se o arquivo .onnx não existir, ou tiver sido exportado de outro
+    model.bert_model, ele é exportado a partir do modelo PyTorch.
+    Com quantize=True, uma cópia com pesos int8 é gerada e utilizada.
+    """
+
+    name = 'onnx'
+
+    INPUT_NAMES = ['input_ids', 'attention_mask', 'token_type_ids']
+
+    def __init__(self, model_name: str, onnx_path: str, quantize: bool = False):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError(
+                "Backend 'onnx' requer o pacote onnxruntime (pip install onnxruntime)"
+            )
+
+        onnx_path = Path(onnx_path)
+        source_file = onnx_path.with_suffix('.source')
+        source = source_file.read_text().strip() if source_file.exists() else None
+        if not onnx_path.exists() or source != model_name:
+            self.export(AutoModel.from_pretrained(model_name), onnx_path)
+            source_file.write_text(model_name)
+            stale = onnx_path.with_name(f'{onnx_path.stem}.int8.onnx')
+            if stale.exists():
+                stale.unlink()
+
+        if quantize:
+            onnx_path = self.quantize(onnx_path)
+
+        self.onnx_path = onnx_path
+        self.session = self._create_session()
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self._hidden_size = self.session.get_outputs()[0].shape[-1]
+
+    @property
+    def hidden_size(self) -> int:
+        return self._hidden_size
+
+    def set_num_threads(self, threads: int) -> None:
+        """
+        Recria a sessão com o número de threads pedido
+
+        O pool de threads do ONNX Runtime não sobrevive a um fork, então
+        processos filhos precisam chamar este método antes de usar o backend.
+        """
+        self.session = self._create_session(threads)
+
+    def _create_session(self, threads: Optional[int] = None):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        return onnxruntime.InferenceSession(
+            str(self.onnx_path), options, providers=['CPUExecutionProvider']
+        )
+
+    def forward(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        feed = {}
+        for name in self.input_names:
+            if name in inputs:
+                feed[name] = inputs[name].numpy().astype(np.int64)
+            else:
+                feed[name] = np.zeros_like(inputs['input_ids'].numpy(), dtype=np.int64)
+        hidden = self.session.run(None, feed)[0]
+        return torch.from_numpy(hidden).float()
+
+    @classmethod
+    def export(cls, model, onnx_path: Path) -> None:
+        """Exporta o modelo para ONNX com eixos dinâmicos de lote e sequência"""
+        logger.info(f"Exportando encoder para {onnx_path}")
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        model.eval()
+
+        dummy = {name: torch.ones((1, 8), dtype=torch.long) for name in cls.INPUT_NAMES}
+        dummy['token_type_ids'] = torch.zeros((1, 8), dtype=torch.long)
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in cls.INPUT_NAMES}
+        dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+        kwargs = dict(
+            input_names=cls.INPUT_NAMES,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=17
+        )
+        # Versões recentes do PyTorch usam o exportador dynamo por padrão
+        if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+            kwargs['dynamo'] = False
+
+        with torch.no_grad():
+            torch.onnx.export(
+                _HiddenStateWrapper(model),
+                (dummy['input_ids'], dummy['attention_mask'], dummy['token_type_ids']),
+                str(onnx_path),
+                **kwargs
+            )
+
+    @staticmethod
+    def quantize(onnx_path: Path) -> Path:
+        """Gera (uma única vez) a versão com pesos int8 do grafo ONNX"""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = onnx_path.with_name(f'{onnx_path.stem}.int8.onnx')
+        if not quantized_path.exists():
+            logger.info(f"Quantizando {onnx_path} em {quantized_path}")
+            quantize_dynamic(str(onnx_path), str(quantized_path), weight_type=QuantType.QInt8)
+        return quantized_path
+
+
+def create_backend(backend_type: Optional[str] = None, model_name: Optional[str] = None) -> EncoderBackend:
+    """
+    Cria o backend do encoder conforme model.backend no config.yaml
+
+    Args:
+        backend_type: 'torch', 'quantized' ou 'onnx' (padrão: model.backend.type)
+        model_name: Modelo do Hugging Face (padrão: model.bert_model)
+    """
+    config = ConfigManager()
+    backend_type = backend_type or config.get('model.backend.type', 'torch')
+    model_name = model_name or config.get('model.bert_model')
+
+    logger.info(f"Carregando encoder {model_name} com backend {backend_type}")
+
+    if backend_type == 'torch':
+        return TorchBackend(AutoModel.from_pretrained(model_name))
+    if backend_type == 'quantized':
+        return QuantizedTorchBackend(AutoModel.from_pretrained(model_name))
+    if backend_type == 'onnx':
+        onnx_path = config.get_full_path('model.backend.onnx_path')
+        return OnnxBackend(
+            model_name,
+            str(onnx_path),
+            quantize=config.get('model.backend.onnx_quantize', False)
+        )
+    raise ValueError(f"Backend inválido: {backend_type}. Use um de {BACKEND_TYPES}")
@@ -0,0 +1,94 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class EncoderRegistry:
+    """
+    Registro único por processo do tokenizer e do backend BERT
+
+    O modelo é carregado no primeiro uso e compartilhado por todas as instâncias
+    de PoliticalBiasModelTrainer e PoliticalBiasInferencer, de modo que treinar
+    e analisar no mesmo processo carrega o BERT uma única vez. torch e
+    transformers só são importados quando algo realmente precisa do encoder.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_backends'):
+            self.config = ConfigManager()
+            self._tokenizers: Dict[str, object] = {}
+            self._backends: Dict[Tuple[str, str], object] = {}
+            self._lock = threading.RLock()
+
+    def get_tokenizer(self, model_name: Optional[str] = None):
+        """Tokenizer do modelo (padrão: model.bert_model)"""
+        model_name = model_name or self.config.get('model.bert_model')
+        with self._lock:
+            if model_name not in self._tokenizers:
+                from transformers import AutoTokenizer
+                logger.info(f"Carregando tokenizer {model_name}")
+                self._tokenizers[model_name] = AutoTokenizer.from_pretrained(model_name)
+            return self._tokenizers[model_name]
+
+    def get_backend(self,
+                    backend_type: Optional[str] = None,
+                    model_name: Optional[str] = None):
+        """Backend do encoder (padrão: model.backend.type e model.bert_model)"""
+        backend_type = backend_type or self.config.get('model.backend.type', 'torch')
+        model_name = model_name or self.config.get('model.bert_model')
+        key = (backend_type, model_name)
+        with self._lock:
+            if key not in self._backends:
+                from .EncoderBackend import create_backend
+                self._backends[key] = create_backend(backend_type, model_name)
+            return self._backends[key]
+
+    def text_encoder(self,
+                     batch_size: int,
+                     backend_type: Optional[str] = None,
+                     model_name: Optional[str] = None):
+        """
+        Cria um TextEncoder com os parâmetros de model.* do config.yaml
+
+        O TextEncoder é leve; tokenizer e backend vêm do registro.
+
+        Args:
+            batch_size: Textos por lote
+            backend_type: Backend do encoder (padrão: model.backend.type)
+            model_name: Modelo BERT (padrão: model.bert_model)
+        """
+        from .BatchScheduler import BatchScheduler
+        from .TextEncoder import TextEncoder
+
+        return TextEncoder(
+            self.get_tokenizer(model_name),
+            self.get_backend(backend_type, model_name),
+            max_length=self.config.get('model.max_length', 512),
+            scheduler=BatchScheduler(
+                batch_size=batch_size,
+                max_tokens=self.config.get('model.max_tokens_per_batch', 8192),
+                sort_by_length=self.config.get('model.sort_by_length', True)
+            ),
+            long_documents=self.config.get('model.long_documents'),
+            pooling=self.config.get('model.pooling', 'mean')
+        )
+
+    def is_loaded(self, backend_type: Optional[str] = None, model_name: Optional[str] = None) -> bool:
+        """Indica se o backend já foi carregado neste processo"""
+        backend_type = backend_type or self.config.get('model.backend.type', 'torch')
+        model_name = model_name or self.config.get('model.bert_model')
+        return (backend_type, model_name) in self._backends
+
+    def clear(self) -> None:
+        """Descarta tokenizers e backends carregados"""
+        with self._lock:
+            self._tokenizers.clear()
+            self._backends.clear()
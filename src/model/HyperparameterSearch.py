@@ -0,0 +1,140 @@
+import random
+import time
+import logging
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from typing import Dict, List, Optional, Tuple
+from src.config import ConfigManager
+from .ClassifierExperiments import create_classifier, fit_and_score
+from .EmbeddingArtifact import EmbeddingArtifact
+
+logger = logging.getLogger(__name__)
+
+class HyperparameterSearch:
+    """
+    Busca de classificador e hiperparâmetros com validação cruzada estratificada
+
+    O espaço (model.search.space) lista, por tipo de classificador, os valores
+    de cada hiperparâmetro. Com method='grid' todas as combinações são
+    avaliadas; com method='random', n_iter combinações sorteadas. Cada par
+    (candidato, fold) é uma tarefa independente distribuída entre processos
+    (joblib) sobre a matriz em memmap do EmbeddingArtifact. Os MLPs usam
+    early stopping e um limite de épocas, o que mantém a busca em minutos na CPU.
+    """
+
+    # Parâmetros aplicados a todo MLP da busca, salvo se o espaço os definir
+    MLP_DEFAULTS = {
+        'early_stopping': True,
+        'validation_fraction': 0.1,
+        'n_iter_no_change': 10
+    }
+
+    SCORINGS = ('f1_macro', 'accuracy')
+
+    def __init__(self, artifact: EmbeddingArtifact, search_config: Optional[Dict] = None):
+        """
+        Args:
+            artifact: Artefato de embeddings
+            search_config: Configuração da busca (padrão: model.search)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+        self.artifact = artifact
+
+        search_config = search_config or self.config.get('model.search', {}) or {}
+        self.method = search_config.get('method', 'grid')
+        self.n_iter = search_config.get('n_iter', 20)
+        self.cv_folds = search_config.get('cv_folds', 5)
+        self.n_jobs = search_config.get('n_jobs', -1)
+        self.scoring = search_config.get('scoring', 'f1_macro')
+        self.max_iter = search_config.get('max_iter', 300)
+        self.space = search_config.get('space', [])
+        self.random_state = self.config.get('model.random_state', 1)
+
+        if self.method not in ('grid', 'random'):
+            raise ValueError(f"Método de busca inválido: {self.method}. Use 'grid' ou 'random'")
+        if self.scoring not in self.SCORINGS:
+            raise ValueError(f"Métrica inválida: {self.scoring}. Use uma de {self.SCORINGS}")
+        if not self.space:
+            raise ValueError("Nenhum espaço de busca definido em model.search.space")
+
+    def candidates(self) -> List[Dict]:
+        """Especificações {'name', 'type', 'params'} a avaliar"""
+        candidates = []
+        for entry in self.space:
+            classifier_type = entry.get('type', 'mlp')
+            grid = {name: values if isinstance(values, list) else [values]
+                    for name, values in (entry.get('params') or {}).items()}
+            for params in ParameterGrid(grid):
+                params = dict(params)
+                if classifier_type == 'mlp':
+                    params = {**self.MLP_DEFAULTS, 'max_iter': self.max_iter, **params}
+                candidates.append({'type': classifier_type, 'params': params})
+
+        if self.method == 'random' and len(candidates) > self.n_iter:
+            candidates = random.Random(self.random_state).sample(candidates, self.n_iter)
+
+        for idx, candidate in enumerate(candidates):
+            candidate['name'] = f"{candidate['type']}_{idx:03d}"
+        return candidates
+
+    def run(self) -> Tuple[object, pd.DataFrame]:
+        """
+        Executa a busca e treina o melhor candidato em todas as linhas válidas
+
+        Returns:
+            Melhor classificador treinado e o leaderboard (melhor primeiro)
+        """
+        rows = self.artifact.valid_rows()
+        labels = self.artifact.int_labels()
+        folds = list(StratifiedKFold(
+            n_splits=self.cv_folds, shuffle=True, random_state=self.random_state
+        ).split(rows, labels[rows]))
+
+        candidates = self.candidates()
+        self.logger.info(
+            f"Busca {self.method}: {len(candidates)} candidatos x {self.cv_folds} folds "
+            f"sobre o artefato {self.artifact.version}"
+        )
+
+        start = time.perf_counter()
+        tasks = [(candidate, fold) for candidate in candidates for fold in range(len(folds))]
+        scores = Parallel(n_jobs=self.n_jobs)(
+            delayed(fit_and_score)(candidate, self.artifact.embeddings, labels,
+                                   rows[folds[fold][0]], rows[folds[fold][1]], self.random_state)
+            for candidate, fold in tasks
+        )
+        self.logger.info(f"Busca concluída em {time.perf_counter() - start:.1f}s")
+
+        leaderboard = self._leaderboard(candidates, scores)
+        best = next(c for c in candidates if c['name'] == leaderboard.loc[0, 'name'])
+        self.logger.info(
+            f"Melhor candidato: {best['name']} {best['params']} "
+            f"({self.scoring} = {leaderboard.loc[0, f'mean_{self.scoring}']:.4f})"
+        )
+
+        classifier = create_classifier(best, self.random_state)
+        classifier.fit(self.artifact.embeddings[rows], labels[rows])
+        return classifier, leaderboard
+
+    def _leaderboard(self, candidates: List[Dict], scores: List[Dict]) -> pd.DataFrame:
+        results = pd.DataFrame(scores)
+        grouped = results.groupby('name', sort=False).agg(
+            mean_f1_macro=('f1_macro', 'mean'),
+            std_f1_macro=('f1_macro', 'std'),
+            mean_accuracy=('accuracy', 'mean'),
+            std_accuracy=('accuracy', 'std'),
+            fit_seconds=('fit_seconds', 'sum')
+        ).reset_index()
+
+        specs = pd.DataFrame([{'name': c['name'], 'type': c['type'], 'params': c['params']}
+                              for c in candidates])
+        leaderboard = specs.merge(grouped, on='name')
+        leaderboard = leaderboard.sort_values(
+            [f'mean_{self.scoring}', 'fit_seconds'], ascending=[False, True], ignore_index=True
+        )
+        leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+        leaderboard.insert(1, 'artifact', self.artifact.version)
+        return leaderboard
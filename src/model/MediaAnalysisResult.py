@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Optional
+from collections import Counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MediaAnalysisResult:
+    """
+    Resultado de uma única passagem de inferência sobre um conjunto de textos
+
+    Guarda predições, probabilidades e embeddings por texto, de modo que o CSV
+    de predições, o resumo e os percentuais sejam derivados sem reprocessar o BERT.
+    Textos que falharam têm predição None e linhas NaN em probabilities/embeddings.
+    """
+
+    def __init__(self,
+                 texts: List[str],
+                 predictions: List[Optional[str]],
+                 probabilities: np.ndarray,
+                 embeddings: np.ndarray,
+                 class_names: List[str]):
+        self.texts = texts
+        self.predictions = predictions
+        self.probabilities = probabilities
+        self.embeddings = embeddings
+        self.class_names = class_names
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """Máscara dos textos processados com sucesso"""
+        return np.array([p is not None for p in self.predictions], dtype=bool)
+
+    def summary(self) -> Dict:
+        """Distribuição percentual por orientação política, ignorando falhas"""
+        predictions = [p for p in self.predictions if p is not None]
+
+        total = len(predictions)
+        counts = Counter(predictions)
+
+        return {
+            'total_texts': total,
+            'predictions': {
+                orientation: (count/total * 100)
+                for orientation, count in counts.items()
+            }
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame com texto, predição e probabilidade de cada classe"""
+        df = pd.DataFrame({
+            'text': self.texts,
+            'prediction': self.predictions
+        })
+        for col, name in enumerate(self.class_names):
+            df[f'prob_{name}'] = self.probabilities[:, col]
+        return df
+
+    def save_predictions(self, output_path: str) -> None:
+        """Salva as predições em CSV"""
+        self.to_dataframe().to_csv(output_path, index=False)
+        logger.info(f"Predições salvas em {output_path}")
+
+    def save_summary(self, output_path: str, portal: str) -> None:
+        """Salva o resumo da análise em texto"""
+        self.write_summary(self.summary(), output_path, portal)
+
+    @staticmethod
+    def write_summary(analysis: Dict, output_path: str, portal: str) -> None:
+        """Grava um resumo no formato de summary() em texto"""
+        with open(output_path, 'w') as f:
+            f.write(f"Análise de Viés Político - {portal}\n")
+            f.write(f"Total de textos analisados: {analysis['total_texts']}\n\n")
+            f.write("Distribuição por orientação política:\n")
+            for orientation, percentage in analysis['predictions'].items():
+                f.write(f"{orientation}: {percentage:.1f}%\n")
@@ -1,11 +1,43 @@
 import argparse
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from src.config import ConfigManager
+from src.dedup import BoilerplateStripper, MinHashDeduplicator
+from src.profiling import RunProfiler
+from src.storage import ArticleStore
+from .ClassifierExperiments import ClassifierExperiments
+from .EmbeddingArtifact import EmbeddingArtifact
+from .EmbeddingCache import EmbeddingCache
 from .PoliticalBiasModelTrainer import PoliticalBiasModelTrainer
 from .PoliticalBiasInferencer import PoliticalBiasInferencer
+from .StreamingMediaAnalysis import StreamingMediaAnalysis
+
+# Estado herdado pelos processos filhos de analyze_media (via fork)
+_worker_context = {}
+
+
+def _init_worker(threads: int) -> None:
+    inferencer = _worker_context['inferencer']
+    inferencer.backend.set_num_threads(threads)
+    # Os filhos apenas consultam o cache, sem disputar a trava de gravação com o pai
+    if inferencer.embedding_cache is not None:
+        inferencer.embedding_cache.read_only = True
+
+
+def _analyze_portal_worker(portal: str) -> Tuple[str, Optional[Dict], Dict]:
+    # O filho herda as etapas do pai; devolve apenas o que registrou neste portal
+    profiler = RunProfiler()
+    profiler.reset()
+    summary = _worker_context['analyzer']._analyze_portal(_worker_context['inferencer'], portal)
+    return portal, summary, profiler.snapshot()
+
 
 class MediaBiasAnalyzer:
     def __init__(self):
@@ -30,25 +62,74 @@ class MediaBiasAnalyzer:
         
         self.model_path = self.models_dir / self.config.get('model.name')
         self.news_portals = self.config.get('news_portals.supported_portals')
+        self.article_store = ArticleStore()
         self.dataframe = str(Path(self.config.get_full_path('discursos.paths.base_dir')) /
                          self.config.get('discursos.paths.merged_file'))
+        self.dedup = self.config.get('dedup', {}) or {}
+
+    def build_embeddings(self, trainer: Optional[PoliticalBiasModelTrainer] = None) -> EmbeddingArtifact:
+        """Etapa 1: gera o artefato de embeddings dos discursos"""
+        self.logger.info("Gerando artefato de embeddings...")
+        with RunProfiler().stage('trainer.read_speeches') as stage:
+            df = self._read_speeches()
+            stage.add(items=len(df))
+        if self.dedup.get('enabled', False) and self.dedup.get('speech', True):
+            df = self._deduplicate_speeches(df)
+        return (trainer or PoliticalBiasModelTrainer()).build_artifact(df)
 
-    def train_model(self):
+    def load_embeddings(self, artifact_version: Optional[str] = None) -> EmbeddingArtifact:
+        """Abre um artefato existente (padrão: model.artifact_version ou o último)"""
+        return EmbeddingArtifact.load(artifact_version or self.config.get('model.artifact_version'))
+
+    def train_model(self, artifact_version: Optional[str] = None, search: Optional[bool] = None):
+        """
+        Etapa 2: treina o classificador
+
+        Args:
+            artifact_version: Artefato de embeddings a usar (padrão:
+                model.artifact_version). Sem versão, os embeddings são
+                gerados a partir do CSV de discursos
+            search: Escolhe o classificador por validação cruzada sobre o
+                espaço de model.search (padrão: model.search.enabled)
+        """
+        if search is None:
+            search = self.config.get('model.search.enabled', False)
         try:
             self.logger.info("Iniciando treinamento do modelo...")
             
-            df = pd.read_csv(self.dataframe)
             trainer = PoliticalBiasModelTrainer()
-            X, y = trainer.prepare_data(df)
-            model, metrics = trainer.train(X, y)
-            
-            trainer.save_model(self.model_path)
+            if artifact_version or self.config.get('model.artifact_version'):
+                artifact = self.load_embeddings(artifact_version)
+            else:
+                artifact = self.build_embeddings(trainer)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            metrics_file = self.output_dir / f'metrics_{timestamp}.txt'
             
-            metrics_file = self.output_dir / f'metrics_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
-            with open(metrics_file, 'w') as f:
-                f.write(f"Accuracy: {metrics['accuracy']}\n\n")
-                f.write("Classification Report:\n")
-                f.write(metrics['classification_report'])
+            if search:
+                leaderboard = trainer.search(artifact)
+                trainer.save_model(self.model_path)
+                
+                leaderboard_file = self.output_dir / f'leaderboard_{timestamp}.csv'
+                leaderboard.to_csv(leaderboard_file, index=False)
+                self.logger.info(f"Leaderboard salvo em {leaderboard_file}")
+                
+                best = leaderboard.iloc[0]
+                with open(metrics_file, 'w') as f:
+                    f.write(f"Embeddings: {artifact.version}\n")
+                    f.write(f"Classificador: {best['type']} {best['params']}\n")
+                    f.write(f"F1 macro (validação cruzada): {best['mean_f1_macro']:.4f} ± {best['std_f1_macro']:.4f}\n")
+                    f.write(f"Accuracy (validação cruzada): {best['mean_accuracy']:.4f} ± {best['std_accuracy']:.4f}\n")
+            else:
+                X, y = trainer.training_data(artifact)
+                model, metrics = trainer.train(X, y)
+                
+                trainer.save_model(self.model_path)
+                
+                with open(metrics_file, 'w') as f:
+                    f.write(f"Embeddings: {artifact.version}\n")
+                    f.write(f"Accuracy: {metrics['accuracy']}\n\n")
+                    f.write("Classification Report:\n")
+                    f.write(metrics['classification_report'])
             
             self.logger.info(f"Modelo treinado e salvo em {self.model_path}")
             self.logger.info(f"Métricas salvas em {metrics_file}")
@@ -57,40 +138,261 @@ class MediaBiasAnalyzer:
             self.logger.exception("Erro durante o treinamento do modelo")
             raise
 
-    def analyze_media(self, portal_name: str = None):
+    def run_experiments(self, artifact_version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Compara os classificadores de model.experiments.classifiers sobre um
+        artefato de embeddings já gerado (padrão: o último), sem executar o BERT
+
+        Returns:
+            Resultados ordenados por acurácia, também salvos em output_dir
+        """
+        artifact = self.load_embeddings(artifact_version)
+        results = ClassifierExperiments(artifact).run()
+        
+        results_file = self.output_dir / f'experiments_{artifact.version}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        results.to_csv(results_file, index=False)
+        self.logger.info(f"Resultados dos experimentos salvos em {results_file}")
+        return results
+
+    def analyze_media(self, portal_name: str = None) -> Dict[str, Dict]:
+        """
+        Analisa os portais configurados (ou apenas portal_name)
+
+        Com model.parallel.workers > 1, os portais são distribuídos entre
+        processos filhos criados por fork depois que o encoder foi carregado,
+        de modo que os pesos do BERT são compartilhados (copy-on-write). Cada
+        processo usa model.parallel.threads_per_worker threads do PyTorch.
+
+        Returns:
+            Resumo de cada portal analisado, também salvo em portals_summary.csv
+        """
         try:
             if not self.model_path.exists():
                 raise FileNotFoundError("Modelo não encontrado. Execute o treinamento primeiro.")
             
             inferencer = PoliticalBiasInferencer()
             portals_to_analyze = [portal_name] if portal_name else self.news_portals
+            workers = min(self.config.get('model.parallel.workers', 1), len(portals_to_analyze))
             
-            for portal in portals_to_analyze:
-                self.logger.info(f"Analisando portal: {portal}")
-                
-                input_file = self.data_dir / f'{portal.lower()}_political_news.txt'
-                if not input_file.exists():
-                    self.logger.warning(f"Arquivo não encontrado para {portal}")
-                    continue
-                    
-                with open(input_file, 'r', encoding='utf-8') as f:
-                    texts = [line.strip() for line in f.readlines()]
-                
-                analysis = inferencer.analyze_media_bias(texts)
-                
-                output_file = self.output_dir / f'{portal}_predictions.csv'
-                inferencer.save_predictions(texts, str(output_file))
-                
-                analysis_file = self.output_dir / f'{portal}_analysis.txt'
-                with open(analysis_file, 'w') as f:
-                    f.write(f"Análise de Viés Político - {portal}\n")
-                    f.write(f"Total de textos analisados: {analysis['total_texts']}\n\n")
-                    f.write("Distribuição por orientação política:\n")
-                    for orientation, percentage in analysis['predictions'].items():
-                        f.write(f"{orientation}: {percentage:.1f}%\n")
-                
-                self.logger.info(f"Análise do portal {portal} concluída")
+            if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+                summaries = self._analyze_parallel(inferencer, portals_to_analyze, workers)
+            else:
+                if workers > 1:
+                    self.logger.warning("fork indisponível nesta plataforma, analisando portais em sequência")
+                summaries = {portal: self._analyze_portal(inferencer, portal)
+                             for portal in portals_to_analyze}
+            
+            summaries = {portal: summary for portal, summary in summaries.items() if summary is not None}
+            self._save_portals_summary(summaries)
+            return summaries
                 
         except Exception as e:
             self.logger.exception("Erro durante a análise dos portais")
-            raise
\ No newline at end of file
+            raise
+
+    def _analyze_parallel(self,
+                          inferencer: PoliticalBiasInferencer,
+                          portals: List[str],
+                          workers: int) -> Dict[str, Optional[Dict]]:
+        """Distribui os portais entre processos filhos que herdam o encoder carregado"""
+        threads = self.config.get('model.parallel.threads_per_worker') or max(1, (os.cpu_count() or 1) // workers)
+        self.logger.info(f"Analisando {len(portals)} portais em {workers} processos com {threads} threads cada")
+        
+        # Carrega tokenizer, BERT e classificador antes do fork
+        inferencer.encoder
+        os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+        
+        _worker_context.update(analyzer=self, inferencer=inferencer)
+        try:
+            context = multiprocessing.get_context('fork')
+            with context.Pool(workers, initializer=_init_worker, initargs=(threads,)) as pool:
+                summaries = {}
+                for portal, summary, stages in pool.imap_unordered(_analyze_portal_worker, portals):
+                    summaries[portal] = summary
+                    RunProfiler().merge(stages)
+                return summaries
+        finally:
+            _worker_context.clear()
+
+    def _analyze_portal(self, inferencer: PoliticalBiasInferencer, portal: str) -> Optional[Dict]:
+        """Analisa um portal em lotes, gravando predições e resumo; retorna o resumo"""
+        chunk_size = self.config.get('model.inference_chunk_size', 256)
+        resume = self.config.get('model.resume_inference', True)
+        self.logger.info(f"Analisando portal: {portal}")
+        
+        source = self._text_chunks(portal, chunk_size)
+        if source is None:
+            self.logger.warning(f"Artigos não encontrados para {portal}")
+            return None
+        source_version, chunks = source
+        
+        output_file = self.output_dir / f'{portal}_predictions.csv'
+        analysis = StreamingMediaAnalysis(str(output_file), source_version, resume=resume)
+        if analysis.complete:
+            self.logger.info(f"Predições de {portal} já atualizadas em {output_file}")
+        else:
+            for result in inferencer.analyze_stream(self._skip(chunks, analysis.processed)):
+                analysis.add(result)
+                self.logger.info(f"{portal}: {analysis.processed} textos processados")
+            analysis.finish()
+        
+        analysis_file = self.output_dir / f'{portal}_analysis.txt'
+        analysis.save_summary(str(analysis_file), portal)
+        
+        self.logger.info(f"Análise do portal {portal} concluída")
+        return analysis.summary()
+
+    def _save_portals_summary(self, summaries: Dict[str, Dict]) -> None:
+        """Reúne os resumos dos portais em um único CSV"""
+        if not summaries:
+            return
+        rows = []
+        for portal, summary in summaries.items():
+            row = {'portal': portal, 'total_texts': summary['total_texts']}
+            row.update({f'pct_{label}': pct for label, pct in summary['predictions'].items()})
+            rows.append(row)
+        order = {portal: idx for idx, portal in enumerate(self.news_portals or [])}
+        rows.sort(key=lambda row: order.get(row['portal'], len(order)))
+        
+        summary_file = self.output_dir / 'portals_summary.csv'
+        pd.DataFrame(rows).fillna(0.0).to_csv(summary_file, index=False)
+        self.logger.info(f"Resumo dos portais salvo em {summary_file}")
+
+    def _text_chunks(self, portal: str, chunk_size: int) -> Optional[Tuple[str, Iterator[List[str]]]]:
+        """
+        Textos de um portal em lotes de até chunk_size, lidos do ArticleStore
+
+        Portais coletados antes do armazenamento em Parquet são lidos do
+        arquivo {portal}_political_news.txt, se existir. Com dedup.enabled,
+        o boilerplate do portal é removido e as quase-duplicatas descartadas.
+
+        Returns:
+            Versão da fonte e do modelo (para retomar execuções) e o iterador
+            de lotes, ou None se o portal não tiver artigos
+        """
+        source = self._text_source(portal, chunk_size)
+        if source is None:
+            return None
+        source_version, read = source
+        # Predições de outro classificador ou encoder não podem ser retomadas
+        source_version = f'{source_version}-model{self._model_version()}'
+        if not self.dedup.get('enabled', False):
+            return source_version, read()
+        # Mudar a configuração da deduplicação muda os textos, então invalida a retomada
+        settings = hashlib.sha256(json.dumps(self.dedup, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+        return f'{source_version}-dedup{settings}', self._clean_chunks(portal, read, chunk_size)
+
+    def _model_version(self) -> str:
+        """Hash do classificador em model.name e dos parâmetros do encoder"""
+        digest = hashlib.sha256()
+        with open(self.model_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(json.dumps(EmbeddingCache.encoder_params(self.config)).encode('utf-8'))
+        return digest.hexdigest()[:8]
+
+    def _text_source(self, portal: str, chunk_size: int) -> Optional[Tuple[str, Callable[[], Iterator[List[str]]]]]:
+        """Versão da fonte do portal e uma função que a lê do início"""
+        if self.article_store.has_portal(portal):
+            if not self.article_store.backfilled(portal):
+                self.logger.warning(
+                    f"{portal}: o ArticleStore ainda não tem os artigos coletados antes dele; "
+                    f"execute o scraper do portal para importá-los"
+                )
+            return (self.article_store.version(portal),
+                    lambda: self.article_store.iter_texts(portal, batch_size=chunk_size))
+
+        for name in (portal, portal.lower()):
+            input_file = self.data_dir / f'{name}_political_news.txt'
+            if input_file.exists():
+                stat = input_file.stat()
+                return f'{stat.st_size}-{stat.st_mtime_ns}', lambda: self._read_lines(input_file, chunk_size)
+        return None
+
+    def _clean_chunks(self,
+                      portal: str,
+                      read: Callable[[], Iterator[List[str]]],
+                      chunk_size: int) -> Iterator[List[str]]:
+        """
+        Remove o boilerplate aprendido no próprio portal e descarta quase-duplicatas
+
+        O boilerplate exige uma passagem prévia sobre a fonte; a deduplicação
+        acontece durante a leitura, mantendo a primeira ocorrência de cada texto.
+        """
+        profiler = RunProfiler()
+        stripper = None
+        if (self.dedup.get('boilerplate', {}) or {}).get('enabled', True):
+            stripper = BoilerplateStripper()
+            with profiler.stage('dedup.boilerplate_learn'):
+                stripper.learn(text for chunk in read() for text in chunk)
+
+        deduplicator = MinHashDeduplicator()
+        total = 0
+        duplicates = 0
+        chunk = []
+        for texts in read():
+            with profiler.stage('dedup.filter') as stage:
+                for text in texts:
+                    total += 1
+                    if stripper is not None:
+                        text = stripper.strip(text)
+                    if deduplicator.add(total, text) is not None:
+                        duplicates += 1
+                        continue
+                    chunk.append(text)
+                stage.add(items=len(texts))
+            while len(chunk) >= chunk_size:
+                yield chunk[:chunk_size]
+                chunk = chunk[chunk_size:]
+        if chunk:
+            yield chunk
+
+        profiler.count('dedup.filter', duplicates=duplicates)
+        self.logger.info(f"{portal}: {duplicates} de {total} textos descartados como quase-duplicatas")
+
+    def _read_speeches(self) -> pd.DataFrame:
+        """
+        Texto e espectro dos discursos enriquecidos (.parquet lê apenas essas colunas)
+
+        Se o .parquet ainda não existir, usa o .csv de mesmo nome gerado por
+        versões anteriores do enriquecimento.
+        """
+        columns = ['transcricao', 'Espectro Político']
+        path = Path(self.dataframe)
+        if path.suffix == '.parquet' and not path.exists() and path.with_suffix('.csv').exists():
+            self.logger.warning(f"{path.name} não encontrado; usando {path.with_suffix('.csv').name}")
+            path = path.with_suffix('.csv')
+        if path.suffix == '.parquet':
+            return pd.read_parquet(path, columns=columns)
+        return pd.read_csv(path, usecols=columns)
+
+    def _deduplicate_speeches(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Mantém apenas a primeira ocorrência de cada discurso quase-duplicado"""
+        with RunProfiler().stage('dedup.speech') as stage:
+            duplicates = MinHashDeduplicator().duplicates(df['transcricao'].fillna('').astype(str))
+            stage.add(items=len(df))
+        keep = [duplicate is None for duplicate in duplicates]
+        self.logger.info(f"{len(df) - sum(keep)} de {len(df)} discursos descartados como quase-duplicatas")
+        return df[keep]
+
+    @staticmethod
+    def _read_lines(input_file: Path, chunk_size: int) -> Iterator[List[str]]:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            chunk = []
+            for line in f:
+                chunk.append(line.strip())
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    @staticmethod
+    def _skip(chunks: Iterator[List[str]], count: int) -> Iterator[List[str]]:
+        """Descarta os primeiros `count` textos (já processados numa execução anterior)"""
+        for chunk in chunks:
+            if count >= len(chunk):
+                count -= len(chunk)
+                continue
+            yield chunk[count:]
+            count = 0
@@ -1,12 +1,13 @@
 import numpy as np
-import pandas as pd
-from transformers import AutoTokenizer, AutoModel
 import joblib
-from typing import List, Dict
-from collections import Counter
+from typing import Dict, Iterable, Iterator, List
 import logging
 from src.config import ConfigManager
+from src.profiling import RunProfiler
 from pathlib import Path
+from .EmbeddingCache import EmbeddingCache
+from .EncoderRegistry import EncoderRegistry
+from .MediaAnalysisResult import MediaAnalysisResult
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +18,14 @@ class PoliticalBiasInferencer:
         model_dir = Path(self.config.get_full_path('general.models_dir'))
         self.model_path = model_dir / self.config.get('model.name')
         self.bert_model = self.config.get('model.bert_model')
+        self.max_length = self.config.get('model.max_length', 512)
         
         self.classifier = joblib.load(self.model_path)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.bert_model)
-        self.bert_model = AutoModel.from_pretrained(self.bert_model)
+        self.embedding_cache = (EmbeddingCache()
+                                if self.config.get('model.embedding_cache.enabled', True)
+                                else None)
+        self._encoder = None
+        self.profiler = RunProfiler()
         
         self.output_mapping = self.config.get('model.output_mapping', {
             0: 'Centro',
@@ -30,60 +35,141 @@ class PoliticalBiasInferencer:
         
         self.logger = logging.getLogger(__name__)
         
+    @property
+    def encoder(self):
+        """TextEncoder criado no primeiro uso, com o BERT compartilhado pelo EncoderRegistry"""
+        if self._encoder is None:
+            self._encoder = EncoderRegistry().text_encoder(
+                self.config.get('model.inference_batch_size', 16)
+            )
+        return self._encoder
+    
+    @property
+    def backend(self):
+        return self.encoder.backend
+    
     def predict(self, text: str) -> str:
-        inputs = self.tokenizer(
-            text, 
-            return_tensors="pt", 
-            truncation=True, 
-            padding=True, 
-            max_length=self.config.get('model.max_length', 512)
-        )
-        outputs = self.bert_model(**inputs)
-        embedding = outputs.last_hidden_state.mean(dim=1).detach().numpy()
-        prediction = self.classifier.predict(embedding)[0]
+        embedding = self.encoder.encode([text])
+        with self.profiler.stage('inference.classifier') as stage:
+            prediction = self.classifier.predict(embedding)[0]
+            stage.add(items=1)
         return self.output_mapping[prediction]
     
     def predict_batch(self, texts: List[str]) -> List[str]:
         """Realiza predições para uma lista de textos"""
-        predictions = []
-        for text in texts:
-            try:
-                pred = self.predict(text)
-                predictions.append(pred)
-            except Exception as e:
-                logger.error(f"Erro ao processar texto: {str(e)}")
-                predictions.append(None)
-        return predictions
+        return self.analyze(texts).predictions
     
-    def analyze_media_bias(self, texts: List[str]) -> Dict:
-        """Analisa o viés político de um conjunto de textos"""
-        predictions = self.predict_batch(texts)
+    def analyze(self, texts: List[str]) -> MediaAnalysisResult:
+        """
+        Executa uma única passagem de inferência sobre os textos
+
+        Returns:
+            MediaAnalysisResult com predições, probabilidades e embeddings
+        """
+        embeddings = self.embed_batch(texts)
+        class_names = [self.output_mapping[c] for c in self.classifier.classes_]
+        
+        predictions = [None] * len(texts)
+        probabilities = np.full((len(texts), len(class_names)), np.nan)
+        valid = ~np.isnan(embeddings).any(axis=1)
         
-        predictions = [p for p in predictions if p is not None]
+        if valid.any():
+            with self.profiler.stage('inference.classifier') as stage:
+                probabilities[valid] = self.classifier.predict_proba(embeddings[valid])
+                stage.add(items=int(valid.sum()))
+            for idx, col in zip(np.flatnonzero(valid), probabilities[valid].argmax(axis=1)):
+                predictions[idx] = class_names[col]
+        
+        return MediaAnalysisResult(texts, predictions, probabilities, embeddings, class_names)
+    
+    def analyze_stream(self, chunks: Iterable[List[str]]) -> Iterator[MediaAnalysisResult]:
+        """
+        Executa a inferência lote a lote sobre um fluxo de textos
+
+        Cada lote é codificado e classificado assim que é lido, e seu resultado
+        é entregue antes da leitura do próximo; nada é acumulado entre lotes.
+
+        Args:
+            chunks: Iterável de listas de textos (ex.: ArticleStore.iter_texts)
+
+        Yields:
+            MediaAnalysisResult de cada lote
+        """
+        for texts in chunks:
+            if texts:
+                yield self.analyze(texts)
+    
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Gera embeddings dos textos, consultando o cache de embeddings quando habilitado"""
+        with self.profiler.stage('inference.embeddings') as stage:
+            stage.add(items=len(texts))
+            if self.embedding_cache is not None:
+                return self.embedding_cache.fetch(texts, self._embed_batch)
+            return self._embed_batch(texts)
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Gera embeddings em lotes agrupados por comprimento
+
+        Se um lote falhar, seus textos são reprocessados individualmente e os
+        que falharem ficam com linha NaN.
+        """
+        return self.encoder.encode(texts, isolate_errors=True)
+    
+    def check_backend_parity(self, texts: List[str]) -> Dict:
+        """
+        Compara o backend configurado com o PyTorch fp32 de referência
+
+        Mede a diferença entre os embeddings e a concordância das predições do
+        classificador. Emite um aviso se a concordância ficar abaixo de
+        model.backend.min_prediction_agreement.
+
+        Args:
+            texts: Amostra de textos para a comparação
+
+        Returns:
+            Dicionário com as métricas de paridade
+        """
+        reference = EncoderRegistry().text_encoder(
+            self.encoder.scheduler.batch_size,
+            backend_type='torch'
+        )
+        expected = reference.encode(texts)
+        actual = self.encoder.encode(texts)
         
-        total = len(predictions)
-        counts = Counter(predictions)
+        cosine = (expected * actual).sum(axis=1) / (
+            np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+        )
+        agreement = float(np.mean(
+            self.classifier.predict(expected) == self.classifier.predict(actual)
+        ))
         
-        analysis = {
-            'total_texts': total,
-            'predictions': {
-                orientation: (count/total * 100)
-                for orientation, count in counts.items()
-            }
+        report = {
+            'backend': self.backend.name,
+            'texts': len(texts),
+            'max_abs_diff': float(np.abs(expected - actual).max()),
+            'min_cosine': float(cosine.min()),
+            'mean_cosine': float(cosine.mean()),
+            'prediction_agreement': agreement
         }
         
-        return analysis
+        min_agreement = self.config.get('model.backend.min_prediction_agreement', 0.99)
+        if agreement < min_agreement:
+            self.logger.warning(
+                f"Backend {self.backend.name} diverge do PyTorch fp32: "
+                f"concordância {agreement:.1%} < {min_agreement:.1%}"
+            )
+        else:
+            self.logger.info(f"Paridade do backend {self.backend.name}: {report}")
+        
+        return report
+    
+    def analyze_media_bias(self, texts: List[str]) -> Dict:
+        """Analisa o viés político de um conjunto de textos"""
+        return self.analyze(texts).summary()
     
     def save_predictions(self, 
                         texts: List[str],
                         output_path: str):
         """Salva as predições em arquivo"""
-        predictions = self.predict_batch(texts)
-        
-        df = pd.DataFrame({
-            'text': texts,
-            'prediction': predictions
-        })
-        
-        df.to_csv(output_path, index=False)
-        logger.info(f"Predições salvas em {output_path}")
+        self.analyze(texts).save_predictions(output_path)
@@ -1,15 +1,21 @@
-import os
+import hashlib
+import json
 import numpy as np
 import pandas as pd
-from transformers import AutoTokenizer, AutoModel
 from sklearn.model_selection import train_test_split
 from sklearn.neural_network import MLPClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 from typing import Tuple, Dict, List
 import logging
-from tqdm import tqdm
 from src.config import ConfigManager
+from src.profiling import RunProfiler
 import joblib
+from pathlib import Path
+from .ClassifierExperiments import create_classifier
+from .EmbeddingArtifact import EmbeddingArtifact
+from .EmbeddingCache import EmbeddingCache
+from .HyperparameterSearch import HyperparameterSearch
+from .EncoderRegistry import EncoderRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +23,14 @@ class PoliticalBiasModelTrainer:
     def __init__(self):
         self.config = ConfigManager()
         self.bert_model = self.config.get('model.bert_model')
-        self.embedding_file = f'{self.config.get_full_path('general.models_dir')}/{self.config.get('model.embeddings_file_name')}'
         self.reuse_embedding = self.config.get('model.reuse_embedding', False)
+        self.embedding_cache = (EmbeddingCache()
+                                if self.config.get('model.embedding_cache.enabled', True)
+                                else None)
         
-        self.tokenizer = AutoTokenizer.from_pretrained(self.bert_model)
-        self.bert_model = AutoModel.from_pretrained(self.bert_model)
+        self._encoder = None
         self.classifier = None
+        self.profiler = RunProfiler()
         
         # Mapeamento de classes
         self.mapping = self.config.get('model.class_mapping', {
@@ -37,42 +45,80 @@ class PoliticalBiasModelTrainer:
         
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def encoder(self):
+        """TextEncoder criado no primeiro uso, com o BERT compartilhado pelo EncoderRegistry"""
+        if self._encoder is None:
+            self._encoder = EncoderRegistry().text_encoder(self.config.get('model.batch_size', 10))
+        return self._encoder
+
     def generate_embeddings(self, texts: List[str]) -> np.ndarray:
-        batch_size = self.config.get('model.batch_size', 10)
-        embeddings_list = []
-        
-        for i in tqdm(range(0, len(texts), batch_size)):
-            batch_texts = texts[i:i+batch_size]
-            inputs = self.tokenizer(batch_texts, return_tensors="pt", 
-                                  truncation=True, padding=True, 
-                                  max_length=self.config.get('model.max_length', 512))
-            
-            outputs = self.bert_model(**inputs)
-            batch_embeddings = outputs.last_hidden_state.mean(dim=1).detach().numpy()
-            embeddings_list.append(batch_embeddings)
-            
-        return np.concatenate(embeddings_list, axis=0)
+        """Gera embeddings dos textos, consultando o cache de embeddings quando habilitado"""
+        if self.embedding_cache is not None:
+            return self.embedding_cache.fetch(texts, self._generate_embeddings)
+        return self._generate_embeddings(texts)
+
+    def _generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Gera embeddings em lotes de textos de comprimento parecido, na ordem de entrada"""
+        embeddings = self.encoder.encode(texts, show_progress=True)
+        self.logger.info(f"Estatísticas de padding: {self.encoder.last_padding_stats}")
+        return embeddings
     
     def prepare_data(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """Prepara os dados para treinamento"""
+        return self.training_data(self.build_artifact(df))
+
+    def build_artifact(self, df: pd.DataFrame) -> EmbeddingArtifact:
+        """
+        Gera (ou, com reuse_embedding, reaproveita) o artefato de embeddings dos discursos
+
+        A versão do artefato identifica os textos, os rótulos e os parâmetros
+        do encoder, então só é reaproveitado um artefato gerado a partir dos
+        mesmos dados; mudar model.class_mapping ou o espectro de um partido
+        gera uma nova versão (os embeddings continuam vindo do cache).
+        """
         texts = df['transcricao'].tolist()
         labels = df['Espectro Político'].map(self.mapping)
+        fingerprint = self._fingerprint(texts, labels.values.astype(float))
+        version = EmbeddingArtifact.version_for(fingerprint)
 
-        print(self.reuse_embedding)
-        print(os.path.exists(self.embedding_file))
+        if self.reuse_embedding and EmbeddingArtifact.exists(version):
+            logger.info(f"Reutilizando artefato de embeddings {version}")
+            EmbeddingArtifact.set_latest(version)
+            return EmbeddingArtifact.load(version)
 
-        if self.reuse_embedding and os.path.exists(self.embedding_file):
-            try:
-                embeddings = np.load(self.embedding_file)
-                return embeddings, labels.values
-            except FileNotFoundError:
-                logger.info("Arquivo de embeddings não encontrado. Gerando novos embeddings...")
-        else:
-            logger.info("Gerando embeddings...")
+        logger.info("Gerando embeddings...")
+        with self.profiler.stage('trainer.embeddings') as stage:
             embeddings = self.generate_embeddings(texts)
-            np.save(self.embedding_file, embeddings)
-        
-        return embeddings, labels.values
+            stage.add(items=len(texts))
+        with self.profiler.stage('trainer.artifact_write'):
+            return EmbeddingArtifact.save(
+                embeddings,
+                labels.values.astype(float),
+                df.index.values,
+                fingerprint,
+                metadata={
+                    'bert_model': self.bert_model,
+                    'encoder_params': EmbeddingCache.encoder_params(self.config),
+                    'class_mapping': self.mapping
+                }
+            )
+
+    def training_data(self, artifact: EmbeddingArtifact) -> Tuple[np.ndarray, np.ndarray]:
+        """Embeddings e rótulos das linhas válidas de um artefato"""
+        rows = artifact.valid_rows()
+        return np.asarray(artifact.embeddings[rows]), np.asarray(artifact.labels[rows]).astype(int)
+
+    def _fingerprint(self, texts: List[str], labels: np.ndarray) -> str:
+        """Hash que identifica os textos, os rótulos e os parâmetros do encoder"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps(EmbeddingCache.encoder_params(self.config)).encode('utf-8'))
+        for text in texts:
+            digest.update(EmbeddingCache.normalize(str(text)).encode('utf-8'))
+            digest.update(b'\0')
+        # NaN (espectro sem mapeamento) tem a mesma representação em todas as execuções
+        digest.update(np.nan_to_num(np.asarray(labels, dtype=np.float64), nan=-1.0).tobytes())
+        return digest.hexdigest()
 
     def train(self, X: np.ndarray, y: np.ndarray) -> Tuple[MLPClassifier, Dict]:
         X_train, X_test, y_train, y_test = train_test_split(
@@ -81,14 +127,18 @@ class PoliticalBiasModelTrainer:
             random_state=self.config.get('model.random_state', 1)
         )
         
-        self.classifier = MLPClassifier(
-            hidden_layer_sizes=self.config.get('model.hidden_layer_sizes', (100)),
-            random_state=self.config.get('model.random_state', 1),
-            max_iter=self.config.get('model.max_iter', 5000),
-            verbose=True
-        )
+        self.classifier = create_classifier({
+            'type': 'mlp',
+            'params': {
+                'hidden_layer_sizes': self.config.get('model.hidden_layer_sizes', (100)),
+                'max_iter': self.config.get('model.max_iter', 5000),
+                'verbose': True
+            }
+        }, random_state=self.config.get('model.random_state', 1))
         
-        self.classifier.fit(X_train, y_train)
+        with self.profiler.stage('trainer.classifier_fit') as stage:
+            self.classifier.fit(X_train, y_train)
+            stage.add(items=len(X_train))
         
         y_pred = self.classifier.predict(X_test)
         metrics = {
@@ -99,6 +149,19 @@ class PoliticalBiasModelTrainer:
         
         return self.classifier, metrics
     
+    def search(self, artifact: EmbeddingArtifact) -> pd.DataFrame:
+        """
+        Escolhe classificador e hiperparâmetros por validação cruzada (model.search)
+
+        O melhor candidato é treinado com todas as linhas do artefato e fica
+        em self.classifier, pronto para save_model.
+
+        Returns:
+            Leaderboard dos candidatos, do melhor para o pior
+        """
+        self.classifier, leaderboard = HyperparameterSearch(artifact).run()
+        return leaderboard
+
     def save_model(self, path: str = 'political_bias_model.joblib'):
         """Salva o modelo treinado"""
         if self.classifier is None:
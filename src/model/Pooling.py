@@ -0,0 +1,45 @@
+import torch
+
+POOLING_STRATEGIES = ('mean', 'cls', 'max')
+
+
+def masked_mean(hidden_states: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """Média dos vetores apenas dos tokens reais (attention_mask == 1)"""
+    mask = attention_mask.unsqueeze(-1).to(hidden_states.dtype)
+    summed = (hidden_states * mask).sum(dim=1)
+    return summed / mask.sum(dim=1).clamp(min=1)
+
+
+def masked_max(hidden_states: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """Máximo por dimensão considerando apenas os tokens reais"""
+    mask = attention_mask.unsqueeze(-1).bool()
+    fill = torch.finfo(hidden_states.dtype).min
+    return hidden_states.masked_fill(~mask, fill).max(dim=1).values
+
+
+def cls(hidden_states: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """Vetor do token [CLS] (primeira posição, nunca é padding com padding à direita)"""
+    return hidden_states[:, 0]
+
+
+def pool(hidden_states: torch.Tensor,
+         attention_mask: torch.Tensor,
+         strategy: str = 'mean') -> torch.Tensor:
+    """
+    Reduz (lote, tokens, dimensão) a (lote, dimensão) ignorando o padding
+
+    O resultado de cada texto não depende dos demais textos do lote, o que
+    permite agrupar textos em lotes e reutilizar embeddings em cache.
+
+    Args:
+        hidden_states: Saída last_hidden_state do BERT
+        attention_mask: Máscara de atenção do tokenizer
+        strategy: 'mean', 'cls' ou 'max'
+    """
+    if strategy == 'mean':
+        return masked_mean(hidden_states, attention_mask)
+    if strategy == 'cls':
+        return cls(hidden_states, attention_mask)
+    if strategy == 'max':
+        return masked_max(hidden_states, attention_mask)
+    raise ValueError(f"Estratégia de pooling inválida: {strategy}. Use uma de {POOLING_STRATEGIES}")
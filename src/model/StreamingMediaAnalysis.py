@@ -0,0 +1,123 @@
+import json
+import os
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+from src.profiling import RunProfiler
+from .MediaAnalysisResult import MediaAnalysisResult
+
+logger = logging.getLogger(__name__)
+
+class StreamingMediaAnalysis:
+    """
+    Análise de um portal acumulada lote a lote
+
+    Cada MediaAnalysisResult recebido é acrescentado ao CSV de predições e
+    descartado, restando apenas contadores por classe, de modo que a memória
+    não cresce com o número de artigos. Após cada lote um arquivo de progresso
+    registra quantos textos já foram processados, os contadores e o tamanho do
+    CSV; se a execução for interrompida, a próxima retoma a partir dali, desde
+    que a fonte dos textos não tenha mudado.
+    """
+
+    def __init__(self,
+                 predictions_path: str,
+                 source_version: Optional[str] = None,
+                 resume: bool = True):
+        """
+        Args:
+            predictions_path: CSV de predições
+            source_version: Identificador da versão dos textos de entrada;
+                o progresso só é reaproveitado se for o mesmo
+            resume: Retoma uma execução anterior interrompida
+        """
+        self.predictions_path = Path(predictions_path)
+        self.progress_path = self.predictions_path.with_suffix('.progress.json')
+        self.source_version = source_version
+        self.logger = logging.getLogger(__name__)
+
+        self.processed = 0
+        self.failed = 0
+        self.counts: Counter = Counter()
+        self.complete = False
+
+        if not (resume and self._restore()):
+            self._reset()
+
+    def add(self, result: MediaAnalysisResult) -> None:
+        """Acrescenta as predições de um lote ao CSV e atualiza os contadores"""
+        write_header = not self.predictions_path.exists() or self.predictions_path.stat().st_size == 0
+        with RunProfiler().stage('inference.csv_write') as stage:
+            result.to_dataframe().to_csv(self.predictions_path, mode='a', header=write_header, index=False)
+            stage.add(items=len(result.predictions))
+
+        predictions = [p for p in result.predictions if p is not None]
+        self.counts.update(predictions)
+        self.failed += len(result.predictions) - len(predictions)
+        self.processed += len(result.predictions)
+        self._save_progress()
+
+    def finish(self) -> None:
+        """Marca a análise como concluída"""
+        self.complete = True
+        self._save_progress()
+        self.logger.info(f"Predições salvas em {self.predictions_path}")
+
+    def summary(self) -> Dict:
+        """Distribuição percentual por orientação política, ignorando falhas"""
+        total = sum(self.counts.values())
+        return {
+            'total_texts': total,
+            'predictions': {
+                orientation: (count/total * 100)
+                for orientation, count in self.counts.items()
+            }
+        }
+
+    def save_summary(self, output_path: str, portal: str) -> None:
+        """Salva o resumo da análise em texto"""
+        MediaAnalysisResult.write_summary(self.summary(), output_path, portal)
+
+    def _restore(self) -> bool:
+        if not self.progress_path.exists() or not self.predictions_path.exists():
+            return False
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Progresso inválido em {self.progress_path}, recomeçando: {str(e)}")
+            return False
+        if progress.get('source_version') != self.source_version:
+            self.logger.info(f"Textos de entrada mudaram, recomeçando {self.predictions_path}")
+            return False
+
+        # Descarta um lote gravado no CSV após o último progresso salvo
+        with open(self.predictions_path, 'r+b') as f:
+            f.truncate(progress['csv_bytes'])
+
+        self.processed = progress['processed']
+        self.failed = progress['failed']
+        self.counts = Counter(progress['counts'])
+        self.complete = progress.get('complete', False)
+        if not self.complete:
+            self.logger.info(f"Retomando {self.predictions_path} após {self.processed} textos")
+        return True
+
+    def _reset(self) -> None:
+        self.predictions_path.parent.mkdir(parents=True, exist_ok=True)
+        open(self.predictions_path, 'w').close()
+        self._save_progress()
+
+    def _save_progress(self) -> None:
+        tmp_path = self.progress_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'source_version': self.source_version,
+                'processed': self.processed,
+                'failed': self.failed,
+                'counts': dict(self.counts),
+                'csv_bytes': self.predictions_path.stat().st_size,
+                'complete': self.complete
+            }, f)
+        os.replace(tmp_path, self.progress_path)
@@ -0,0 +1,243 @@
+import numpy as np
+import torch
+import logging
+from typing import Dict, List, Optional, Tuple
+from tqdm import tqdm
+from src.profiling import RunProfiler
+from .BatchScheduler import BatchScheduler
+from .EncoderBackend import EncoderBackend
+from .Pooling import POOLING_STRATEGIES, pool
+
+logger = logging.getLogger(__name__)
+
+class TextEncoder:
+    """
+    Codifica textos com BERT em lotes, compartilhado por treinamento e inferência
+
+    Os textos são tokenizados uma única vez, agrupados pelo BatchScheduler e
+    preenchidos (padding) apenas até o maior texto de cada lote. Os embeddings
+    são devolvidos na ordem de entrada.
+
+    Com long_documents habilitado, textos maiores que max_length não são
+    truncados: são divididos em janelas sobrepostas, as janelas de todos os
+    documentos são agrupadas nos mesmos lotes e os vetores das janelas são
+    agregados em um único vetor por documento.
+    """
+
+    AGGREGATIONS = ('mean', 'max', 'attention')
+
+    def __init__(self,
+                 tokenizer,
+                 backend: EncoderBackend,
+                 max_length: int = 512,
+                 scheduler: Optional[BatchScheduler] = None,
+                 long_documents: Optional[Dict] = None,
+                 pooling: str = 'mean'):
+        """
+        Args:
+            tokenizer: Tokenizer do Hugging Face
+            backend: Backend que executa o BERT (PyTorch, int8 ou ONNX)
+            max_length: Máximo de tokens por texto (ou por janela)
+            scheduler: Agendador de lotes
+            long_documents: Configuração de janelas deslizantes (model.long_documents).
+                None ou enabled=False mantém o truncamento em max_length
+            pooling: Estratégia de pooling dos tokens: 'mean', 'cls' ou 'max'
+        """
+        self.tokenizer = tokenizer
+        self.backend = backend
+        self.max_length = max_length
+        self.scheduler = scheduler or BatchScheduler(sort_by_length=True)
+        if pooling not in POOLING_STRATEGIES:
+            raise ValueError(f"Estratégia de pooling inválida: {pooling}. Use uma de {POOLING_STRATEGIES}")
+        self.pooling = pooling
+        self.last_padding_stats: Dict = {}
+        self.profiler = RunProfiler()
+        self.logger = logging.getLogger(__name__)
+
+        self.long_documents = None
+        if long_documents and long_documents.get('enabled', False):
+            self.long_documents = {
+                'stride': long_documents.get('stride', max_length // 4),
+                'aggregation': long_documents.get('aggregation', 'mean'),
+                'max_chunks': long_documents.get('max_chunks', 16)
+            }
+            if self.long_documents['aggregation'] not in self.AGGREGATIONS:
+                raise ValueError(
+                    f"Agregação inválida: {self.long_documents['aggregation']}. "
+                    f"Use uma de {self.AGGREGATIONS}"
+                )
+
+    @property
+    def hidden_size(self) -> int:
+        return self.backend.hidden_size
+
+    def encode(self,
+               texts: List[str],
+               isolate_errors: bool = False,
+               show_progress: bool = False) -> np.ndarray:
+        """
+        Gera embeddings para uma lista de textos
+
+        Args:
+            texts: Textos a codificar
+            isolate_errors: Se True, um lote com erro é reprocessado texto a
+                texto e os textos que falharem ficam com linha NaN. Se False,
+                o erro é propagado
+            show_progress: Exibe barra de progresso por lote
+
+        Returns:
+            Matriz (len(texts), hidden_size) na ordem de entrada
+        """
+        embeddings = np.full((len(texts), self.hidden_size), np.nan, dtype=np.float32)
+
+        if self.long_documents is None:
+            with self.profiler.stage('encoder.tokenize') as stage:
+                encodings = self._tokenize(texts, isolate_errors,
+                                           truncation=True, max_length=self.max_length)
+                stage.add(items=len(texts))
+            owners = list(encodings.keys())
+            units = [encodings[idx] for idx in owners]
+            embeddings[owners] = self._encode_units(units, isolate_errors, show_progress)
+            return embeddings
+
+        with self.profiler.stage('encoder.tokenize') as stage:
+            units, owners = self._split_windows(texts, isolate_errors)
+            stage.add(items=len(texts))
+        chunk_vectors = self._encode_units(units, isolate_errors, show_progress)
+
+        # As janelas de cada documento são contíguas em units
+        start = 0
+        while start < len(owners):
+            end = start
+            while end < len(owners) and owners[end] == owners[start]:
+                end += 1
+            vectors = chunk_vectors[start:end]
+            if not np.isnan(vectors).any():
+                embeddings[owners[start]] = self._aggregate(vectors)
+            start = end
+        return embeddings
+
+    def _encode_units(self,
+                      units: List[Dict],
+                      isolate_errors: bool,
+                      show_progress: bool) -> np.ndarray:
+        """Codifica sequências já tokenizadas (textos ou janelas) em lotes"""
+        vectors = np.full((len(units), self.hidden_size), np.nan, dtype=np.float32)
+
+        lengths = [len(unit['input_ids']) for unit in units]
+        batches = self.scheduler.schedule(lengths)
+
+        self.last_padding_stats = BatchScheduler.padding_stats(lengths, batches)
+        self.logger.info(
+            f"{len(units)} sequências em {len(batches)} lotes, "
+            f"desperdício de padding: {self.last_padding_stats['padding_ratio']:.1%}"
+        )
+
+        for batch in tqdm(batches, disable=not show_progress):
+            try:
+                with self.profiler.stage('encoder.forward') as stage:
+                    inputs = self.tokenizer.pad([units[pos] for pos in batch], return_tensors="pt")
+                    vectors[batch] = self._forward(inputs)
+                    stage.add(items=len(batch),
+                              tokens=sum(lengths[pos] for pos in batch),
+                              padded_tokens=len(batch) * max(lengths[pos] for pos in batch))
+            except Exception as e:
+                if not isolate_errors:
+                    raise
+                self.logger.warning(f"Erro ao processar lote, reprocessando textos individualmente: {str(e)}")
+                for pos in batch:
+                    try:
+                        inputs = self.tokenizer.pad([units[pos]], return_tensors="pt")
+                        vectors[pos] = self._forward(inputs)[0]
+                    except Exception as e:
+                        self.logger.error(f"Erro ao processar texto: {str(e)}")
+
+        return vectors
+
+    def _split_windows(self,
+                       texts: List[str],
+                       isolate_errors: bool) -> Tuple[List[Dict], List[int]]:
+        """
+        Divide cada documento em janelas de até max_length tokens
+
+        Janelas consecutivas compartilham `stride` tokens (mesma semântica do
+        tokenizer do Hugging Face) e cada documento mantém no máximo max_chunks janelas.
+
+        Returns:
+            Janelas prontas para o modelo e o índice do documento de cada janela
+        """
+        kwargs = dict(
+            truncation=True,
+            max_length=self.max_length,
+            stride=self.long_documents['stride'],
+            return_overflowing_tokens=True
+        )
+
+        try:
+            batch = self.tokenizer(list(texts), **kwargs)
+            mapping = batch.pop('overflow_to_sample_mapping')
+            chunks = [(owner, {key: values[pos] for key, values in batch.items()})
+                      for pos, owner in enumerate(mapping)]
+        except Exception:
+            if not isolate_errors:
+                raise
+            chunks = []
+            for idx, text in enumerate(texts):
+                try:
+                    encoding = self.tokenizer(text, **kwargs)
+                    encoding.pop('overflow_to_sample_mapping', None)
+                    chunks.extend(
+                        (idx, {key: values[pos] for key, values in encoding.items()})
+                        for pos in range(len(encoding['input_ids']))
+                    )
+                except Exception as e:
+                    self.logger.error(f"Erro ao tokenizar texto {idx}: {str(e)}")
+
+        units = []
+        owners = []
+        per_document = {}
+        for owner, unit in chunks:
+            per_document[owner] = per_document.get(owner, 0) + 1
+            if per_document[owner] <= self.long_documents['max_chunks']:
+                units.append(unit)
+                owners.append(owner)
+        return units, owners
+
+    def _aggregate(self, vectors: np.ndarray) -> np.ndarray:
+        """Agrega os vetores das janelas de um documento"""
+        aggregation = self.long_documents['aggregation']
+        if aggregation == 'max':
+            return vectors.max(axis=0)
+        if aggregation == 'attention':
+            # Pesos pela similaridade de cada janela com o centróide do documento
+            scores = vectors @ vectors.mean(axis=0) / np.sqrt(vectors.shape[1])
+            weights = np.exp(scores - scores.max())
+            return (weights / weights.sum()) @ vectors
+        return vectors.mean(axis=0)
+
+    def _tokenize(self, texts: List[str], isolate_errors: bool, **kwargs) -> Dict[int, Dict]:
+        """Tokeniza sem padding; com isolate_errors, textos inválidos são descartados"""
+        try:
+            batch = self.tokenizer(list(texts), **kwargs)
+            return {
+                idx: {key: values[idx] for key, values in batch.items()}
+                for idx in range(len(texts))
+            }
+        except Exception:
+            if not isolate_errors:
+                raise
+
+        encodings = {}
+        for idx, text in enumerate(texts):
+            try:
+                encodings[idx] = self.tokenizer(text, **kwargs)
+            except Exception as e:
+                self.logger.error(f"Erro ao tokenizar texto {idx}: {str(e)}")
+        return encodings
+
+    def _forward(self, inputs) -> np.ndarray:
+        """Executa o BERT no backend e aplica o pooling sobre os tokens reais"""
+        hidden_states = self.backend.forward(inputs)
+        with torch.inference_mode():
+            embeddings = pool(hidden_states, inputs['attention_mask'], self.pooling)
+        return embeddings.numpy()
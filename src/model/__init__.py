@@ -1,9 +1,21 @@
 from .MediaBiasAnalyzer import MediaBiasAnalyzer
+from .MediaAnalysisResult import MediaAnalysisResult
 from .PoliticalBiasInferencer import PoliticalBiasInferencer
 from .PoliticalBiasModelTrainer import PoliticalBiasModelTrainer
+from .EncoderRegistry import EncoderRegistry
+from .StreamingMediaAnalysis import StreamingMediaAnalysis
+from .EmbeddingArtifact import EmbeddingArtifact
+from .ClassifierExperiments import ClassifierExperiments
+from .HyperparameterSearch import HyperparameterSearch
 
 __all__ = [
     'MediaBiasAnalyzer',
+    'MediaAnalysisResult',
     'PoliticalBiasInferencer',
-    'PoliticalBiasModelTrainer'
-]
\ No newline at end of file
+    'PoliticalBiasModelTrainer',
+    'EncoderRegistry',
+    'StreamingMediaAnalysis',
+    'EmbeddingArtifact',
+    'ClassifierExperiments',
+    'HyperparameterSearch'
+]
@@ -0,0 +1,61 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+import logging
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent
+sys.path.append(str(project_root))
+
+import pandas as pd
+from src.config import ConfigManager
+from src.model import PoliticalBiasInferencer
+
+config = ConfigManager()
+
+# Configura logging
+logging.basicConfig(
+    level=config.get('general.log_level'),
+    format=config.get('general.log_format')
+)
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(
+    description='Compara o backend configurado em model.backend.type com o PyTorch fp32 de referência'
+)
+parser.add_argument('--texts', default=str(Path(config.get_full_path('discursos.paths.base_dir')) /
+                                          config.get('discursos.paths.merged_file')),
+                    help='Amostra: .txt (um texto por linha) ou .csv/.parquet com a coluna transcricao '
+                         '(padrão: discursos enriquecidos)')
+parser.add_argument('--sample', type=int, default=200, help='Textos comparados')
+parser.add_argument('--seed', type=int, default=13, help='Semente da amostragem')
+args = parser.parse_args()
+
+
+def load_texts(path: Path) -> list:
+    """Textos não vazios do arquivo de amostra"""
+    if path.suffix == '.parquet' and not path.exists() and path.with_suffix('.csv').exists():
+        path = path.with_suffix('.csv')
+    if path.suffix == '.txt':
+        with open(path, 'r', encoding='utf-8') as f:
+            texts = pd.Series([line.strip() for line in f])
+    elif path.suffix == '.parquet':
+        texts = pd.read_parquet(path, columns=['transcricao'])['transcricao']
+    else:
+        texts = pd.read_csv(path, usecols=['transcricao'])['transcricao']
+    texts = texts.dropna().astype(str)
+    texts = texts[texts.str.strip() != '']
+    return texts.sample(min(args.sample, len(texts)), random_state=args.seed).tolist()
+
+
+texts = load_texts(Path(args.texts))
+if not texts:
+    logger.error(f'Nenhum texto encontrado em {args.texts}')
+    sys.exit(1)
+
+inferencer = PoliticalBiasInferencer()
+report = inferencer.check_backend_parity(texts)
+print(json.dumps(report, indent=2))
+
+min_agreement = config.get('model.backend.min_prediction_agreement', 0.99)
+sys.exit(0 if report['prediction_agreement'] >= min_agreement else 1)
@@ -1,6 +1,12 @@
 from src.model import MediaBiasAnalyzer
+from src.profiling import RunProfiler
+
+profiler = RunProfiler()
+profiler.start('model')
   
 analyzer = MediaBiasAnalyzer()
 
 analyzer.train_model()
-analyzer.analyze_media()
\ No newline at end of file
+analyzer.analyze_media()
+
+profiler.finish()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlparse
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Balde de fichas: permite `rate` requisições por segundo com rajadas de até `burst`
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Bloqueia até haver uma ficha disponível"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostThrottle:
+    """
+    Controle de cortesia por host compartilhado por todo o processo
+
+    Cada host tem um limite de requisições simultâneas e um balde de fichas
+    que define a taxa de requisições (scraping.politeness, com ajustes por
+    host em scraping.politeness.hosts). Hosts diferentes não se bloqueiam, de
+    modo que portais distintos podem ser coletados em paralelo.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_hosts'):
+            return
+        self.config = ConfigManager()
+        sleep_time = self.config.get('scraping.sleep_time', 0.5)
+        default_rate = 1 / sleep_time if sleep_time else 0
+        self.rate = self.config.get('scraping.politeness.requests_per_second', default_rate)
+        self.burst = self.config.get('scraping.politeness.burst', 1)
+        self.max_concurrent = self.config.get('scraping.politeness.max_concurrent_per_host', 2)
+        self.host_overrides = self.config.get('scraping.politeness.hosts', {}) or {}
+        self._hosts: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str) -> tuple:
+        with self._lock:
+            if host not in self._hosts:
+                override = self.host_overrides.get(host, {})
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(
+                        override.get('max_concurrent_per_host', self.max_concurrent)
+                    ),
+                    TokenBucket(
+                        override.get('requests_per_second', self.rate),
+                        override.get('burst', self.burst)
+                    )
+                )
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Reserva uma vaga para requisitar `url` respeitando os limites do host
+
+        Uso:
+            with throttle.slot(url):
+                response = requests.get(url)
+        """
+        semaphore, bucket = self._host_state(urlparse(url).netloc)
+        with semaphore:
+            bucket.acquire()
+            yield
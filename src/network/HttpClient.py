@@ -0,0 +1,119 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+from src.config import ConfigManager
+from src.profiling import RunProfiler
+from .HostThrottle import HostThrottle
+from .ResponseCache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+def _supports_brotli() -> bool:
+    try:
+        import brotli  # noqa: F401
+        return True
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado pelos scrapers e pelo coletor da Câmara
+
+    Mantém uma única requests.Session por processo, com pool de conexões
+    keep-alive por host, negociação de gzip (e brotli, se instalado), novas
+    tentativas com backoff exponencial para erros de conexão e respostas
+    429/5xx, timeout por host e a cortesia do HostThrottle. Com o
+    ResponseCache habilitado (scraping.http.cache), respostas gravadas são
+    devolvidas sem acessar a rede nem consumir a cota do host.
+    """
+    _instance = None
+    CONDITIONAL_HEADERS = ('if-none-match', 'if-modified-since')
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, 'session'):
+            return
+        self.config = ConfigManager()
+        self.throttle = HostThrottle()
+        self.default_timeout = self.config.get('scraping.timeout', 10)
+        self.host_timeouts = self.config.get('scraping.http.timeouts', {}) or {}
+        self.session = self._build_session()
+        self.cache = ResponseCache()
+        self.profiler = RunProfiler()
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.config.get('scraping.max_retries', 3),
+            backoff_factor=self.config.get('scraping.http.backoff_factor', 0.5),
+            status_forcelist=self.config.get('scraping.http.retry_status', [429, 500, 502, 503, 504]),
+            allowed_methods=['GET', 'HEAD'],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        pool_size = self.config.get('scraping.http.pool_maxsize', 10)
+        adapter = HTTPAdapter(
+            pool_connections=self.config.get('scraping.http.pool_connections', 20),
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': self.config.get('scraping.user_agent'),
+            'Accept-Encoding': 'gzip, deflate, br' if _supports_brotli() else 'gzip, deflate'
+        })
+        return session
+
+    def timeout_for(self, url: str) -> float:
+        """Timeout configurado para o host da URL (scraping.http.timeouts) ou o padrão"""
+        return self.host_timeouts.get(urlparse(url).netloc, self.default_timeout)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Realiza um GET respeitando os limites do host
+
+        Args:
+            url: URL requisitada
+            **kwargs: Repassados para requests.Session.get (params, headers, ...)
+        """
+        params = kwargs.get('params')
+        if self.cache.mode in ('record', 'refresh') and kwargs.get('headers'):
+            # Um 304 não é gravado; sem os cabeçalhos condicionais a resposta completa fica no cache
+            kwargs['headers'] = {name: value for name, value in kwargs['headers'].items()
+                                 if name.lower() not in self.CONDITIONAL_HEADERS}
+        if self.cache.enabled:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                self.profiler.count('http.cache', hits=1, bytes=len(cached.content))
+                return cached
+            self.profiler.count('http.cache', misses=1)
+            if self.cache.mode == 'replay':
+                raise requests.ConnectionError(f"Resposta para {url} ausente do cache HTTP (modo replay)")
+
+        kwargs.setdefault('timeout', self.timeout_for(url))
+        with self.throttle.slot(url):
+            response = self.session.get(url, **kwargs)
+        if self.cache.enabled:
+            self.cache.put(url, params, response)
+        return response
+
+    def close(self) -> None:
+        """Fecha as conexões abertas"""
+        with self._lock:
+            self.session.close()
+            self.session = self._build_session()
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+import logging
+import requests
+from collections import OrderedDict
+from pathlib import Path
+from requests.structures import CaseInsensitiveDict
+from typing import Dict, Optional
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """
+    Cache em disco de respostas HTTP para repetir coletas sem rede
+
+    A chave é a URL final da requisição, com os params em ordem alfabética.
+    Cada resposta fica em <dir>/<chave[:2]>/<chave>.resp: uma linha JSON
+    com status, cabeçalhos e data de gravação, seguida do corpo comprimido
+    com zlib. Modos (scraping.http.cache.mode):
+
+    - 'record': usa a resposta gravada se estiver dentro do TTL; senão
+      acessa a rede e grava
+    - 'replay': usa apenas o que foi gravado, sem TTL; respostas ausentes
+      geram ConnectionError, sem acessar a rede
+    - 'refresh': sempre acessa a rede e regrava
+    - 'off': desligado
+
+    Somente respostas 200 são gravadas. Quando max_size_mb é excedido, as
+    respostas lidas há mais tempo são descartadas até o cache ocupar
+    EVICTION_TARGET do limite, para que as gravações seguintes não precisem
+    descartar de novo.
+    """
+
+    MODES = ('off', 'record', 'replay', 'refresh')
+    SUFFIX = '.resp'
+    # Cabeçalhos preservados na resposta reconstruída
+    HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+    # Fração de max_size_mb ocupada após um descarte
+    EVICTION_TARGET = 0.9
+
+    def __init__(self,
+                 mode: Optional[str] = None,
+                 cache_dir: Optional[str] = None,
+                 ttl_hours: Optional[float] = None,
+                 max_size_mb: Optional[float] = None):
+        """
+        Args:
+            mode: Modo de operação (padrão: scraping.http.cache.mode)
+            cache_dir: Diretório do cache (padrão: scraping.http.cache.dir)
+            ttl_hours: Validade das respostas no modo 'record' (padrão:
+                scraping.http.cache.ttl_hours; None não expira)
+            max_size_mb: Tamanho máximo em disco (padrão: scraping.http.cache.max_size_mb)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+
+        self.mode = mode or self.config.get('scraping.http.cache.mode', 'off')
+        if self.mode not in self.MODES:
+            raise ValueError(f"Modo de cache inválido: {self.mode}. Use um de {self.MODES}")
+
+        if cache_dir is None:
+            cache_dir = self.config.get_full_path('scraping.http.cache.dir')
+        self.cache_dir = Path(cache_dir)
+        if ttl_hours is None:
+            ttl_hours = self.config.get('scraping.http.cache.ttl_hours')
+        self.ttl = ttl_hours * 3600 if ttl_hours is not None else None
+        if max_size_mb is None:
+            max_size_mb = self.config.get('scraping.http.cache.max_size_mb', 2048)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.compression_level = self.config.get('scraping.http.cache.compression_level', 6)
+
+        # chave -> tamanho em disco, da resposta lida há mais tempo para a mais recente
+        self.entries: 'OrderedDict[str, int]' = OrderedDict()
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        if self.enabled:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        prepared = requests.Request('GET', url, params=params).prepare()
+        return hashlib.sha256(prepared.url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+        """
+        Resposta gravada para a requisição, conforme o modo
+
+        Returns:
+            Response reconstruída (com from_cache=True) ou None se for preciso acessar a rede
+        """
+        if self.mode in ('off', 'refresh'):
+            return None
+        key = self.key(url, params)
+        path = self._path(key)
+        with self._lock:
+            if key not in self.entries:
+                return None
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = zlib.decompress(f.read())
+        except (OSError, ValueError, zlib.error) as e:
+            self.logger.warning(f"Entrada de cache ilegível para {url}: {str(e)}")
+            self._remove(key)
+            return None
+
+        if self.mode == 'record' and self.ttl is not None and time.time() - meta['stored_at'] > self.ttl:
+            return None
+
+        now = time.time()
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return self._response(meta, body)
+
+    def put(self, url: str, params: Optional[Dict], response: requests.Response) -> None:
+        """Grava uma resposta 200 (nos modos 'record' e 'refresh')"""
+        if self.mode not in ('record', 'refresh') or response.status_code != 200:
+            return
+        key = self.key(url, params)
+        meta = {
+            'url': response.url or url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': {name: response.headers[name] for name in self.HEADERS if name in response.headers},
+            'stored_at': time.time()
+        }
+        data = (json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n'
+                + zlib.compress(response.content, self.compression_level))
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Remove todas as respostas gravadas"""
+        with self._lock:
+            for key in list(self.entries):
+                self._path(key).unlink(missing_ok=True)
+            self.entries = OrderedDict()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _response(self, meta: Dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta['status']
+        response._content = body
+        response.url = meta['url']
+        response.encoding = meta.get('encoding')
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}{self.SUFFIX}'
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Descarta as entradas acessadas há mais tempo até EVICTION_TARGET do limite (chamado com o lock)"""
+        target = self.max_bytes * self.EVICTION_TARGET
+        evicted = 0
+        while self.entries and self.total_bytes > target:
+            key, size = self.entries.popitem(last=False)
+            self._path(key).unlink(missing_ok=True)
+            self.total_bytes -= size
+            evicted += 1
+        self.logger.info(f"Cache HTTP: {evicted} respostas descartadas para respeitar o limite de tamanho")
+
+    def _load(self) -> None:
+        if not self.cache_dir.exists():
+            return
+        stats = [(path.stem, path.stat()) for path in self.cache_dir.glob(f'*/*{self.SUFFIX}')]
+        # O mtime é atualizado a cada leitura, então ordena do acesso mais antigo ao mais recente
+        for key, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+            self.entries[key] = stat.st_size
+            self.total_bytes += stat.st_size
+        self.logger.info(
+            f"Cache HTTP ({self.mode}): {len(self.entries)} respostas, "
+            f"{self.total_bytes / 2**20:.1f} MB em {self.cache_dir}"
+        )
@@ -0,0 +1,5 @@
+from .HostThrottle import HostThrottle
+from .HttpClient import HttpClient
+from .ResponseCache import ResponseCache
+
+__all__ = ['HostThrottle', 'HttpClient', 'ResponseCache']
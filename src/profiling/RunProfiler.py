@@ -0,0 +1,262 @@
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from src.config import ConfigManager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss() -> int:
+    """RSS atual do processo em bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        if psutil is not None:
+            return psutil.Process().memory_info().rss
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    """
+    Pico de RSS do processo em bytes (ru_maxrss é em KB no Linux e em bytes no macOS)
+
+    Sem o módulo resource (Windows) usa o pico do psutil, se instalado, ou 0.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == 'Darwin' else peak * 1024
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss)
+    return 0
+
+
+class _Stage:
+    """Contadores de uma execução de etapa; add() acumula bytes, tokens, itens..."""
+
+    __slots__ = ('counters',)
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+
+    def add(self, **counters: int) -> None:
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def add(self, **counters: int) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class RunProfiler:
+    """
+    Instrumentação por etapa compartilhada por todo o processo
+
+    Cada etapa (ex.: 'scraper.fetch', 'encoder.forward') acumula tempo de
+    parede, número de chamadas, contadores livres (bytes, tokens, itens) e o
+    maior RSS observado ao fim da etapa. É seguro usar a partir de várias
+    threads. Com profiling.enabled=False as etapas não registram nada.
+
+    Uso:
+        profiler = RunProfiler()
+        profiler.start('scraper')
+        with profiler.stage('scraper.fetch') as stage:
+            response = http.get(url)
+            stage.add(bytes=len(response.content))
+        profiler.finish()   # grava <profiling.output_dir>/scraper_<data>.json
+
+    Com profiling.cprofile=True, start() também liga o cProfile na thread
+    principal; finish() grava o .prof (pstats, legível por snakeviz ou
+    `python -m pstats`) e inclui as funções mais caras no relatório. Para
+    amostragem externa, o relatório e o log de start() trazem o PID, que
+    pode ser passado a `py-spy record --pid`.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_stages'):
+            return
+        self.config = ConfigManager()
+        self.enabled = self.config.get('profiling.enabled', True)
+        self.use_cprofile = self.config.get('profiling.cprofile', False)
+        self.top_functions = self.config.get('profiling.top_functions', 25)
+        self.run_name = 'run'
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._stages: Dict[str, Dict] = {}
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._lock = threading.Lock()
+
+    def start(self, run_name: str) -> None:
+        """Inicia uma nova execução, descartando o que foi registrado antes"""
+        self.run_name = run_name
+        self.reset()
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        if self.enabled and self.use_cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        logger.info(f"Execução '{run_name}' iniciada (PID {os.getpid()})")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Cronometra um trecho como uma chamada da etapa `name`"""
+        if not self.enabled:
+            yield _NULL_STAGE
+            return
+        record = _Stage()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self._record(name, time.perf_counter() - start, record.counters)
+
+    def count(self, name: str, **counters: int) -> None:
+        """Acumula contadores em uma etapa sem cronometrar"""
+        if self.enabled:
+            self._record(name, None, counters)
+
+    def _record(self, name: str, seconds: Optional[float], counters: Dict[str, int]) -> None:
+        rss = current_rss()
+        with self._lock:
+            stats = self._stages.setdefault(name, {
+                'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'peak_rss': 0, 'counters': {}
+            })
+            if seconds is not None:
+                stats['calls'] += 1
+                stats['seconds'] += seconds
+                stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['peak_rss'] = max(stats['peak_rss'], rss)
+            for key, value in counters.items():
+                stats['counters'][key] = stats['counters'].get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Cópia das etapas registradas (para enviar de processos filhos ao pai)"""
+        with self._lock:
+            return {name: {**stats, 'counters': dict(stats['counters'])}
+                    for name, stats in self._stages.items()}
+
+    def merge(self, stages: Dict[str, Dict]) -> None:
+        """Soma as etapas de outro processo às deste"""
+        with self._lock:
+            for name, other in stages.items():
+                stats = self._stages.setdefault(name, {
+                    'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'peak_rss': 0, 'counters': {}
+                })
+                stats['calls'] += other['calls']
+                stats['seconds'] += other['seconds']
+                stats['max_seconds'] = max(stats['max_seconds'], other['max_seconds'])
+                stats['peak_rss'] = max(stats['peak_rss'], other['peak_rss'])
+                for key, value in other['counters'].items():
+                    stats['counters'][key] = stats['counters'].get(key, 0) + value
+
+    def report(self) -> Dict:
+        """Relatório da execução: etapas ordenadas pelo tempo total"""
+        duration = time.perf_counter() - self._start
+        stages = {}
+        for name, stats in sorted(self.snapshot().items(), key=lambda item: -item[1]['seconds']):
+            entry = {
+                'calls': stats['calls'],
+                'seconds': round(stats['seconds'], 4),
+                'share': round(stats['seconds'] / duration, 4) if duration else 0.0,
+                'mean_ms': round(stats['seconds'] / stats['calls'] * 1000, 3) if stats['calls'] else None,
+                'max_ms': round(stats['max_seconds'] * 1000, 3),
+                'peak_rss_mb': round(stats['peak_rss'] / 2**20, 1),
+                **stats['counters']
+            }
+            for counter in ('bytes', 'tokens', 'items'):
+                if stats['counters'].get(counter) and stats['seconds']:
+                    entry[f'{counter}_per_sec'] = round(stats['counters'][counter] / stats['seconds'], 1)
+            stages[name] = entry
+
+        return {
+            'run': self.run_name,
+            'pid': os.getpid(),
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_seconds': round(duration, 3),
+            'peak_rss_mb': round(peak_rss() / 2**20, 1),
+            'python': sys.version.split()[0],
+            'argv': sys.argv,
+            'stages': stages
+        }
+
+    def finish(self, output_dir: Optional[str] = None) -> Optional[Path]:
+        """
+        Encerra a execução e grava o relatório JSON (e o .prof com cProfile)
+
+        Returns:
+            Caminho do relatório, ou None se a instrumentação estiver desligada
+        """
+        if not self.enabled:
+            return None
+        report = self.report()
+        output_dir = Path(output_dir or self.config.get_full_path('profiling.output_dir'))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        base_name = f"{self.run_name}_{self.started_at:%Y%m%d_%H%M%S}"
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            profile_path = output_dir / f'{base_name}.prof'
+            self._cprofile.dump_stats(str(profile_path))
+            report['cprofile'] = str(profile_path)
+            report['hot_functions'] = self._hot_functions(self._cprofile)
+            self._cprofile = None
+
+        report_path = output_dir / f'{base_name}.json'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        summary = ', '.join(f"{name} {stats['seconds']:.1f}s"
+                            for name, stats in list(report['stages'].items())[:5])
+        logger.info(f"Relatório de execução salvo em {report_path} ({summary})")
+        return report_path
+
+    def _hot_functions(self, profile: cProfile.Profile) -> list:
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({
+                'function': f'{filename}:{line}({function})',
+                'calls': calls,
+                'total_seconds': round(total, 4),
+                'cumulative_seconds': round(cumulative, 4)
+            })
+        rows.sort(key=lambda row: -row['total_seconds'])
+        return rows[:self.top_functions]
@@ -0,0 +1,3 @@
+from .RunProfiler import RunProfiler, current_rss, peak_rss
+
+__all__ = ['RunProfiler', 'current_rss', 'peak_rss']
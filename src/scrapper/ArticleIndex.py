@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class ArticleIndex:
+    """
+    Índice persistente dos artigos já coletados de um portal
+
+    Cada URL guarda o colunista, os cabeçalhos ETag/Last-Modified da resposta,
+    o hash do conteúdo e a data da coleta. Assim uma nova execução baixa
+    apenas os artigos que ainda não conhece e para de paginar a listagem de
+    um colunista ao chegar em links já vistos. O texto fica no ArticleStore;
+    índices gravados por versões anteriores ainda o trazem até pop_texts.
+    """
+
+    def __init__(self, portal: str, index_dir: Optional[str] = None):
+        """
+        Args:
+            portal: Nome do portal
+            index_dir: Diretório dos índices (padrão: scraping.incremental.index_dir)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+
+        if index_dir is None:
+            index_dir = self.config.get_full_path('scraping.incremental.index_dir')
+        self.path = Path(index_dir) / f'{portal.lower()}.json'
+        self.portal = portal
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash do texto extraído, usado para detectar artigos alterados"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self.entries.get(url)
+
+    def known_links(self, columnist: Optional[str] = None) -> Set[str]:
+        """URLs já indexadas (opcionalmente apenas de um colunista)"""
+        if columnist is None:
+            return set(self.entries)
+        return {url for url, entry in self.entries.items() if entry.get('columnist') == columnist}
+
+    def update(self,
+               url: str,
+               text: str,
+               columnist: Optional[str] = None,
+               etag: Optional[str] = None,
+               last_modified: Optional[str] = None) -> bool:
+        """
+        Registra (ou atualiza) um artigo
+
+        Returns:
+            True se o conteúdo é novo ou mudou desde a última coleta
+        """
+        digest = self.content_hash(text)
+        with self._lock:
+            previous = self.entries.get(url)
+            changed = previous is None or previous.get('content_hash') != digest
+            self.entries[url] = {
+                'columnist': columnist if columnist is not None else (previous or {}).get('columnist'),
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_hash': digest,
+                'fetched_at': datetime.now().isoformat(timespec='seconds')
+            }
+        return changed
+
+    def pop_texts(self) -> Dict[str, str]:
+        """Remove e devolve (URL -> texto) os textos gravados no índice por versões anteriores"""
+        with self._lock:
+            return {url: entry.pop('text') for url, entry in self.entries.items() if 'text' in entry}
+
+    def save(self) -> None:
+        """Grava o índice de forma atômica"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+            self.logger.info(f'Índice do {self.portal}: {len(self.entries)} artigos conhecidos')
+        except Exception as e:
+            self.logger.warning(f'Índice do {self.portal} inválido, recriando: {str(e)}')
+            self.entries = {}
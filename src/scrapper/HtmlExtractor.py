@@ -0,0 +1,188 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+logger = logging.getLogger(__name__)
+
+class HtmlExtractor(ABC):
+    """
+    Extrai de uma página os links da listagem e o texto de um artigo
+
+    As classes CSS vêm de news_portals.<portal>.post_class/content_class e
+    seguem a semântica do BeautifulSoup: um valor sem espaços casa com
+    qualquer uma das classes do elemento; um valor com espaços casa com o
+    atributo class inteiro.
+    """
+
+    # Meta tags consultadas, em ordem, para a data de publicação
+    PUBLISHED_META = (('property', 'article:published_time'),
+                      ('itemprop', 'datePublished'),
+                      ('name', 'date'))
+
+    @abstractmethod
+    def links(self, html: bytes, tag: str, post_class: str) -> List[Optional[str]]:
+        """
+        Primeiro href de cada post da listagem, na ordem da página
+
+        Returns:
+            Um item por post; None quando o post não tem link
+        """
+
+    @abstractmethod
+    def article(self, html: bytes, content_class: str) -> Dict:
+        """
+        Texto dos blocos de conteúdo e a data de publicação
+
+        Returns:
+            Dicionário com text e published_at
+        """
+
+
+class SoupExtractor(HtmlExtractor):
+    """Árvore completa do BeautifulSoup com html.parser (implementação de referência)"""
+
+    def links(self, html: bytes, tag: str, post_class: str) -> List[Optional[str]]:
+        soup = BeautifulSoup(html, 'html.parser')
+        links = []
+        for section in soup.find_all(tag, {'class': post_class}):
+            link_element = section.find('a')
+            if link_element and 'href' in link_element.attrs:
+                links.append(link_element['href'])
+            else:
+                links.append(None)
+        return links
+
+    def article(self, html: bytes, content_class: str) -> Dict:
+        soup = BeautifulSoup(html, 'html.parser')
+        post_sections = soup.find_all('div', {'class': content_class})
+        return {
+            'text': ' '.join([section.text.strip() for section in post_sections]),
+            'published_at': self._published_at(soup)
+        }
+
+    def _published_at(self, soup: BeautifulSoup) -> Optional[str]:
+        for attribute, value in self.PUBLISHED_META:
+            tag = soup.find('meta', {attribute: value})
+            if tag and tag.get('content'):
+                return tag['content']
+        time_tag = soup.find('time', datetime=True)
+        return time_tag['datetime'] if time_tag else None
+
+
+class LxmlExtractor(HtmlExtractor):
+    """
+    Parser em C do lxml com consultas XPath
+
+    Constrói a árvore do libxml2 sem criar objetos Python por nó, o que
+    torna a extração várias vezes mais rápida que o html.parser. O texto
+    segue as regras do .text do BeautifulSoup: ignora <script>, <style>,
+    <template> e comentários, e reduz trechos só de espaços a '\\n' ou ' '
+    (exceto dentro de <pre> e <textarea>). A decodificação usa o mesmo
+    detector de encoding do BeautifulSoup.
+    """
+
+    SKIPPED_TAGS = {'script', 'style', 'template'}
+    PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+    ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+    CLASS_TOKEN = "contains(concat(' ', normalize-space(@class), ' '), concat(' ', $cls, ' '))"
+    CLASS_EXACT = "normalize-space(@class) = normalize-space($cls)"
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+        self._etree = etree
+        self._lxml_html = lxml_html
+        self._parser = lxml_html.HTMLParser(encoding='utf-8')
+        self._first_link = etree.XPath('(.//a)[1]')
+        self._time = etree.XPath('(//time[@datetime])[1]/@datetime', smart_strings=False)
+
+    def _parse(self, html: bytes):
+        markup = UnicodeDammit(html, is_html=True).unicode_markup if isinstance(html, bytes) else html
+        # O libxml2 normaliza \r\n para \n; a referência numérica preserva o texto como no html.parser
+        markup = (markup or '').replace('\r', '&#13;')
+        try:
+            return self._lxml_html.document_fromstring(markup.encode('utf-8'), parser=self._parser)
+        except self._etree.ParserError:
+            # Documento vazio
+            return None
+
+    def _find_all(self, root, tag: str, css_class: str) -> list:
+        if not tag.isalnum():
+            raise ValueError(f"Tag inválida: {tag}")
+        condition = self.CLASS_EXACT if ' ' in css_class.strip() else self.CLASS_TOKEN
+        return root.xpath(f'//{tag}[{condition}]', cls=css_class)
+
+    def links(self, html: bytes, tag: str, post_class: str) -> List[Optional[str]]:
+        root = self._parse(html)
+        if root is None:
+            return []
+        links = []
+        for section in self._find_all(root, tag, post_class):
+            link_element = self._first_link(section)
+            links.append(link_element[0].get('href') if link_element else None)
+        return links
+
+    def article(self, html: bytes, content_class: str) -> Dict:
+        root = self._parse(html)
+        if root is None:
+            return {'text': '', 'published_at': None}
+        post_sections = self._find_all(root, 'div', content_class)
+        return {
+            'text': ' '.join([self._text(section).strip() for section in post_sections]),
+            'published_at': self._published_at(root)
+        }
+
+    def _text(self, section) -> str:
+        ancestors = {ancestor.tag for ancestor in section.iterancestors()}
+        if ancestors & self.SKIPPED_TAGS:
+            return ''
+        parts = []
+        self._collect_text(section, parts, bool(ancestors & self.PRESERVE_WHITESPACE_TAGS)
+                           or section.tag in self.PRESERVE_WHITESPACE_TAGS)
+        return ''.join(parts)
+
+    def _collect_text(self, element, parts: List[str], preserve: bool) -> None:
+        if element.text:
+            parts.append(self._string(element.text, preserve))
+        for child in element:
+            # Comentários e instruções de processamento têm tag não textual
+            if isinstance(child.tag, str) and child.tag not in self.SKIPPED_TAGS:
+                self._collect_text(child, parts, preserve or child.tag in self.PRESERVE_WHITESPACE_TAGS)
+            if child.tail:
+                parts.append(self._string(child.tail, preserve))
+
+    def _string(self, text: str, preserve: bool) -> str:
+        if preserve or text.strip(self.ASCII_SPACES):
+            return text
+        return '\n' if '\n' in text else ' '
+
+    def _published_at(self, root) -> Optional[str]:
+        for attribute, value in self.PUBLISHED_META:
+            tags = root.xpath(f'(//meta[@{attribute} = $value])[1]', value=value)
+            if tags and tags[0].get('content'):
+                return tags[0].get('content')
+        time_values = self._time(root)
+        return time_values[0] if time_values else None
+
+
+EXTRACTORS = {
+    'soup': SoupExtractor,
+    'lxml': LxmlExtractor
+}
+
+
+def create_extractor(name: str = 'lxml') -> HtmlExtractor:
+    """
+    Cria o extrator configurado em scraping.extractor.parser
+
+    Se o lxml não estiver instalado, usa o BeautifulSoup.
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"Extrator inválido: {name}. Use um de {list(EXTRACTORS)}")
+    try:
+        return EXTRACTORS[name]()
+    except ImportError:
+        logger.warning(f"Extrator '{name}' indisponível (lxml não instalado); usando 'soup'")
+        return SoupExtractor()
@@ -1,11 +1,12 @@
 from pathlib import Path
-import requests
 import logging
-import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from tqdm import tqdm
+from .ArticleIndex import ArticleIndex
 from .NewsScraper import NewsScraper
 from src.config import ConfigManager
+from src.storage import ArticleStore
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,16 @@ class NewsPortalScraper:
     def __init__(self):
         self.config = ConfigManager()
         self.scraper = NewsScraper()
+        self.max_workers = self.config.get('scraping.max_workers', 8)
+        self.incremental = self.config.get('scraping.incremental.enabled', True)
+        self.revalidate = self.config.get('scraping.incremental.revalidate', False)
+        self.store = ArticleStore() if self.config.get('storage.articles.enabled', True) else None
         self.logger = logging.getLogger(__name__)
+        if self.incremental and self.config.get('scraping.http.cache.mode', 'off') == 'replay':
+            self.logger.warning(
+                "Cache HTTP em modo replay com scraping.incremental.enabled: artigos já indexados "
+                "não são baixados nem extraídos de novo; desative a coleta incremental para reprocessá-los"
+            )
 
     def scrape_portal(self, portal_name: str) -> List[str]:
         """
@@ -27,7 +37,8 @@ class NewsPortalScraper:
             portal_name: Nome do portal conforme definido no config.yaml
             
         Returns:
-            Lista de textos coletados
+            Lista de textos coletados (com a coleta incremental, todos os
+            textos conhecidos do portal, inclusive os de execuções anteriores)
         """
         if portal_name.lower() == 'cnn':
             return self.scrape_cnn()
@@ -42,51 +53,34 @@ class NewsPortalScraper:
             content_class = portal_config.get('content_class')
             post_class = portal_config.get('post_class')
             limit_per_columnist = self.config.get('scraping.limit_per_columnist')
+            # Trata URLs relativas se necessário
+            base_url = 'https://www.gazetadopovo.com.br' if portal_name.lower() == 'gazeta' else ''
             
-            news = []
-            texts = []
-
-            # Coleta artigos de cada colunista
-            for columnist_name, url in tqdm(columnists.items(), 
-                                         desc=f"Coletando colunistas do {portal_name}"):
+            index = ArticleIndex(portal_name) if self.incremental else None
+            known_links = index.known_links() if index is not None else None
+            
+            # Coleta links de cada colunista
+            def fetch_listing(item):
+                columnist_name, url = item
                 self.logger.info(f'Coletando artigos de {columnist_name}')
-                
                 try:
-                    column_news = self.scraper.get_news(
+                    news = self.scraper.get_news(
                         limit=limit_per_columnist,
                         url=url,
                         post_class=post_class,
+                        known_links=known_links,
+                        base_url=base_url
                     )
-                    news.extend(column_news)
-                    time.sleep(self.config.get('scraping.sleep_time'))
-                    
+                    return [(columnist_name, article['link']) for article in news]
                 except Exception as e:
                     self.logger.warning(f"Erro ao coletar artigos de {columnist_name}: {str(e)}")
-                    continue
+                    return []
 
-            # Coleta texto completo de cada artigo
-            for article in tqdm(news, desc=f"Coletando textos do {portal_name}"):
-                try:
-                    # Trata URLs relativas se necessário
-                    if portal_name.lower() == 'gazeta' and not article['link'].startswith('http'):
-                        full_url = 'https://www.gazetadopovo.com.br' + article['link']
-                    else:
-                        full_url = article['link']
-                        
-                    text = self.scraper.get_full_text(
-                        url=full_url,
-                        content_class=content_class
-                    )
-                    if text:
-                        texts.append(text)
-                    time.sleep(self.config.get('scraping.sleep_time'))
-                    
-                except Exception as e:
-                    self.logger.warning(f"Erro ao coletar texto do artigo {article['link']}: {str(e)}")
-                    continue
+            listings = self._parallel_map(fetch_listing, list(columnists.items()),
+                                          desc=f"Coletando colunistas do {portal_name}")
+            articles = [article for listing in listings for article in listing]
 
-            self.logger.info(f'Total de textos coletados do {portal_name}: {len(texts)}')
-            return texts
+            return self._collect_texts(portal_name, articles, content_class, index)
 
         except Exception as e:
             self.logger.exception(f'Erro ao coletar notícias do {portal_name}: {str(e)}')
@@ -102,54 +96,46 @@ class NewsPortalScraper:
         content_class = portal_config.get('content_class')
         limit_pages = self.config.get('scraping.limit_pages', 10)
         
-        texts = []
+        index = ArticleIndex('CNN') if self.incremental else None
+        known_links = index.known_links() if index is not None else set()
         
-        try:
-            for columnist_name, columnist_id in tqdm(columnists.items(), 
-                                                   desc="Coletando colunistas da CNN"):
-                self.logger.info(f'Coletando artigos de {columnist_name}')
-                
-                for page in range(1, limit_pages + 1):
-                    try:
-                        url = f"{base_url}?page={page}&term_id={columnist_id}"
-                        
-                        response = requests.get(
-                            url, 
-                            timeout=self.config.get('scraping.timeout'), 
-                            headers=self.scraper.headers
-                        )
+        def fetch_columnist(item):
+            columnist_name, columnist_id = item
+            self.logger.info(f'Coletando artigos de {columnist_name}')
+            links = []
+            
+            for page in range(1, limit_pages + 1):
+                try:
+                    url = f"{base_url}?page={page}&term_id={columnist_id}"
+                    
+                    response = self.scraper.http.get(url, headers=self.scraper.headers)
+                    
+                    if response.status_code != 200:
+                        continue
                         
-                        if response.status_code != 200:
-                            continue
-                            
-                        articles = response.json()
-                        if not articles:
-                            break
-                            
-                        for article in articles:
-                            try:
-                                text = self.scraper.get_full_text(
-                                    article['link'],
-                                    content_class=content_class
-                                )
-                                if text:
-                                    texts.append(text)
-                            except Exception as e:
-                                self.logger.warning(
-                                    f"Erro ao coletar texto do artigo {article['link']}: {str(e)}"
-                                )
-                                continue
-                                
-                        time.sleep(self.config.get('scraping.sleep_time'))
+                    articles = response.json()
+                    if not articles:
+                        break
                         
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Erro na página {page} do colunista {columnist_name}: {str(e)}"
-                        )
-                        continue
-
-            self.logger.info(f'Total de textos coletados da CNN: {len(texts)}')
-            return texts
+                    page_links = [article['link'] for article in articles]
+                    links.extend((columnist_name, link) for link in page_links
+                                 if link not in known_links)
+                    # Páginas seguintes contêm apenas artigos mais antigos, já coletados
+                    if any(link in known_links for link in page_links):
+                        break
+                    
+                except Exception as e:
+                    self.logger.warning(
+                        f"Erro na página {page} do colunista {columnist_name}: {str(e)}"
+                    )
+                    continue
+            return links
+        
+        try:
+            listings = self._parallel_map(fetch_columnist, list(columnists.items()),
+                                          desc="Coletando colunistas da CNN")
+            articles = [article for listing in listings for article in listing]
+            return self._collect_texts('CNN', articles, content_class, index)
 
         except Exception as e:
             self.logger.exception(f'Erro ao coletar notícias da CNN: {str(e)}')
@@ -162,24 +148,192 @@ class NewsPortalScraper:
         Returns:
             Dicionário com os textos de cada portal
         """
-        results = {}
         supported_portals = self.config.get('news_portals.supported_portals', [])
         
-        for portal in supported_portals:
+        def scrape(portal):
             self.logger.info(f"Iniciando coleta do portal {portal}")
-            texts = self.scrape_portal(portal)
-            results[portal] = texts
+            return self.scrape_portal(portal)
+        
+        # Portais ficam em hosts diferentes, então são coletados em paralelo;
+        # a cortesia por host é garantida pelo HttpClient
+        with ThreadPoolExecutor(max_workers=max(len(supported_portals), 1)) as executor:
+            texts = list(executor.map(scrape, supported_portals))
             
-        return results
+        return dict(zip(supported_portals, texts))
+
+    def _collect_texts(self,
+                       portal_name: str,
+                       articles: List[Tuple[str, str]],
+                       content_class: str,
+                       index: Optional[ArticleIndex]) -> List[str]:
+        """
+        Baixa o texto dos artigos e atualiza o índice do portal
+        
+        Com o índice, apenas URLs ainda não coletadas são baixadas; se
+        scraping.incremental.revalidate estiver habilitado, os artigos conhecidos
+        também são pedidos com If-None-Match/If-Modified-Since e só são
+        substituídos se o servidor devolver conteúdo novo. Artigos novos ou
+        alterados são acrescentados ao ArticleStore; na primeira gravação do
+        portal, o histórico do índice e do .txt é importado antes. O índice
+        guarda apenas metadados: os textos vêm do ArticleStore ou, sem ele,
+        do .txt gravado nas coletas anteriores.
+        
+        Args:
+            portal_name: Nome do portal
+            articles: Pares (colunista, URL) vindos das listagens
+            content_class: Classe CSS do conteúdo do artigo
+            index: Índice do portal (None desativa a coleta incremental)
+            
+        Returns:
+            Textos do portal (todos os já coletados, se houver índice)
+        """
+        if self.store is not None:
+            self._backfill_store(portal_name, index)
+
+        pending = {}
+        for columnist_name, url in articles:
+            if index is None or url not in index:
+                pending.setdefault(url, columnist_name)
+        if index is not None and self.revalidate:
+            for url, entry in index.entries.items():
+                pending.setdefault(url, entry.get('columnist'))
+
+        def fetch_text(item):
+            url, columnist_name = item
+            entry = index.get(url) if index is not None else None
+            try:
+                article = self.scraper.fetch_article(
+                    url,
+                    content_class=content_class,
+                    etag=entry.get('etag') if entry else None,
+                    last_modified=entry.get('last_modified') if entry else None
+                )
+            except Exception as e:
+                self.logger.warning(f"Erro ao coletar texto do artigo {url}: {str(e)}")
+                return None
+            if article is None or article['not_modified'] or not article['text']:
+                return None
+            changed = True
+            if index is not None:
+                changed = index.update(url, article['text'], columnist_name,
+                                       article['etag'], article['last_modified'])
+            return {
+                'columnist': columnist_name,
+                'url': url,
+                'published_at': article['published_at'],
+                'text': article['text'],
+                'content_hash': ArticleIndex.content_hash(article['text']),
+                'changed': changed
+            }
+
+        try:
+            fetched = [record for record in self._parallel_map(fetch_text, list(pending.items()),
+                                                                desc=f"Coletando textos do {portal_name}")
+                       if record]
+        finally:
+            if index is not None:
+                index.save()
+
+        if self.store is not None:
+            self.store.append(portal_name, [record for record in fetched if record['changed']])
+
+        texts = [record['text'] for record in fetched]
+
+        self.logger.info(f'Total de textos coletados do {portal_name}: {len(texts)}')
+        if index is None:
+            return texts
+        self.logger.info(f'Índice do {portal_name}: {len(index)} artigos conhecidos')
+        if self.store is not None:
+            return self.store.read_texts(portal_name)
+        known_hashes = {self._line_hash(text) for text in texts}
+        return [line for line in self._legacy_lines(portal_name)
+                if self._line_hash(line) not in known_hashes] + texts
+
+    def _backfill_store(self, portal_name: str, index: Optional[ArticleIndex]) -> None:
+        """
+        Importa para o ArticleStore os artigos coletados antes dele
+
+        O MediaBiasAnalyzer lê apenas o ArticleStore quando o portal tem
+        artigos nele, então o histórico do índice incremental e do arquivo
+        {portal}_political_news.txt é copiado uma única vez. URLs já
+        armazenadas são mantidas e linhas do .txt com o mesmo texto de um
+        artigo conhecido são ignoradas. Textos que versões anteriores
+        gravaram no índice são retirados dele.
+        """
+        index_texts = index.pop_texts() if index is not None else {}
+        if self.store.backfilled(portal_name):
+            return
+
+        stored_urls = set()
+        known_hashes = set()
+        for batch in self.store.iter_batches(portal_name, columns=['url', 'text']):
+            for url, text in zip(batch.column('url').to_pylist(), batch.column('text').to_pylist()):
+                stored_urls.add(url)
+                known_hashes.add(self._line_hash(text))
+
+        records = []
+        for url, text in index_texts.items():
+            if url in stored_urls or not text:
+                continue
+            entry = index.get(url)
+            records.append({'columnist': entry.get('columnist'), 'url': url, 'text': text,
+                            'content_hash': entry.get('content_hash')})
+            known_hashes.add(self._line_hash(text))
+
+        for text in self._legacy_lines(portal_name):
+            digest = self._line_hash(text)
+            if digest not in known_hashes:
+                known_hashes.add(digest)
+                records.append({'text': text})
+
+        imported = self.store.append(portal_name, records)
+        self.store.mark_backfilled(portal_name)
+        if imported:
+            self.logger.info(f'{imported} artigos anteriores do {portal_name} importados para o ArticleStore')
+
+    def _legacy_lines(self, portal_name: str) -> Iterator[str]:
+        """Textos do {portal}_political_news.txt gravado pelas coletas anteriores"""
+        portals_dir = Path(self.config.get_full_path('general.data_dir_portals'))
+        for name in dict.fromkeys((portal_name, portal_name.lower())):
+            legacy_file = portals_dir / f'{name}_political_news.txt'
+            if not legacy_file.exists():
+                continue
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    text = line.strip()
+                    if text:
+                        yield text
+            return
+
+    @staticmethod
+    def _line_hash(text: str) -> str:
+        """Hash do texto como gravado em {portal}_political_news.txt (uma linha)"""
+        return ArticleIndex.content_hash(text.replace('\n', ' ').replace('\r', '').strip())
+
+    def _parallel_map(self, func: Callable, items: List, desc: str) -> List:
+        """
+        Aplica `func` aos itens em paralelo, preservando a ordem
+
+        O número de threads vem de scraping.max_workers; o ritmo das
+        requisições é controlado por host pelo HttpClient.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(tqdm(executor.map(func, items), total=len(items), desc=desc))
 
     def save_portal_texts(self, portal: str, texts: List[str]) -> None:
         """
-        Salva os textos de um portal em arquivo
+        Salva os textos de um portal em {portal}_political_news.txt
+
+        Com o ArticleStore habilitado os textos já estão em Parquet, então o
+        .txt só é gravado se storage.articles.legacy_txt_export estiver ativo.
         
         Args:
             portal: Nome do portal
             texts: Lista de textos para salvar
         """
+        if self.store is not None and not self.config.get('storage.articles.legacy_txt_export', False):
+            self.logger.info(f'Textos do {portal} no ArticleStore; exportação para .txt desativada')
+            return
         if not texts:
             self.logger.warning(f'Nenhum texto para salvar do portal {portal}')
             return
@@ -1,9 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
 import logging
-from typing import List, Dict
-import time
+from typing import List, Dict, Optional, Set
 from src.config import ConfigManager
+from src.network import HttpClient
+from src.profiling import RunProfiler
+from .HtmlExtractor import create_extractor
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -15,11 +15,14 @@ class NewsScraper:
         self.headers = {
             'User-Agent': self.config.get('scraping.user_agent')
         }
-        self.timeout = self.config.get('scraping.timeout', 10)
-        self.sleep_time = self.config.get('scraping.sleep_time', 0.5)
+        self.http = HttpClient()
+        self.extractor = create_extractor(self.config.get('scraping.extractor.parser', 'lxml'))
+        self.profiler = RunProfiler()
         self.logger = logging.getLogger(__name__)
 
-    def get_news(self, url: str, post_class: str, type: str = 'div', limit: int = None) -> List[Dict]:
+    def get_news(self, url: str, post_class: str, type: str = 'div', limit: int = None,
+                 known_links: Optional[Set[str]] = None,
+                 base_url: str = '') -> List[Dict]:
         """
         Obtém notícias de uma URL específica
         
@@ -28,6 +31,8 @@ class NewsScraper:
             post_class: Classe CSS dos posts
             type: Tipo do elemento HTML (div, article, etc.)
             limit: Número máximo de notícias a serem obtidas
+            known_links: Links já coletados; a listagem para no primeiro deles
+            base_url: Prefixo aplicado a links relativos antes da comparação
         
         Returns:
             Lista de dicionários contendo links das notícias
@@ -38,42 +43,41 @@ class NewsScraper:
 
         try:
             for attempt in range(max_retries * (limit or 1)):
-                response = requests.get(
-                    url, 
-                    timeout=self.timeout, 
-                    headers=self.headers
-                )
+                with self.profiler.stage('scraper.listing_fetch') as stage:
+                    response = self.http.get(url, headers=self.headers)
+                    stage.add(bytes=len(response.content))
 
                 if response.status_code != 200:
                     self.logger.error(f'Erro ao obter notícias. Status Code: {response.status_code}')
                     break
 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                post_sections = soup.find_all(type, {'class': post_class})
+                with self.profiler.stage('scraper.listing_parse'):
+                    post_links = self.extractor.links(response.content, type, post_class)
 
-                if not post_sections:
+                if not post_links:
                     self.logger.warning(f'Nenhum post encontrado com a classe {post_class}')
                     break
 
-                for section in post_sections:
-                    link_element = section.find('a')
-                    if link_element and 'href' in link_element.attrs:
-                        news_list.append({'link': link_element['href']})
+                for link in post_links:
+                    if link is not None:
+                        if base_url and not link.startswith('http'):
+                            link = base_url + link
+                        # A listagem vem da mais recente para a mais antiga
+                        if known_links is not None and link in known_links:
+                            self.logger.info(f'Link já conhecido encontrado, {len(news_list)} notícias novas')
+                            return news_list
+                        news_list.append({'link': link})
 
                     if limit and len(news_list) >= limit:
                         self.logger.info(f'Limite de {limit} notícias atingido')
                         return news_list
 
-                time.sleep(self.sleep_time)
                 logger.info(f'{len(news_list)} notícias obtidas até agora.')
 
                 # Se não encontrou mais posts, para o loop
-                if len(post_sections) == 0:
+                if len(post_links) == 0:
                     break
 
-                # Pausa para não sobrecarregar o servidor
-                time.sleep(0.5)
-
             logger.info(f'Total final de {len(news_list)} notícias obtidas.')
             return news_list
 
@@ -85,18 +89,50 @@ class NewsScraper:
         """
         Obtém o texto completo de uma notícia
         """
+        article = self.fetch_article(url, content_class)
+        return article['text'] if article else ''
+
+    def fetch_article(self,
+                      url: str,
+                      content_class: str,
+                      etag: Optional[str] = None,
+                      last_modified: Optional[str] = None) -> Optional[Dict]:
+        """
+        Obtém o texto de uma notícia junto com os cabeçalhos de validação
+        
+        Com etag/last_modified a requisição é condicional; se o servidor
+        responder 304 (não modificado), o retorno tem 'not_modified': True.
+        
+        Returns:
+            Dicionário com text, published_at, etag, last_modified e not_modified,
+            ou None em caso de erro
+        """
+        headers = dict(self.headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
         try:
-            response = requests.get(
-                url, 
-                timeout=self.timeout, 
-                headers=self.headers
-            )
-            soup = BeautifulSoup(response.content, 'html.parser')
-            post_sections = soup.find_all('div', {'class': content_class})
-            return ' '.join([section.text.strip() for section in post_sections])
+            with self.profiler.stage('scraper.article_fetch') as stage:
+                response = self.http.get(url, headers=headers)
+                stage.add(bytes=len(response.content))
+            if response.status_code == 304:
+                self.profiler.count('scraper.article_fetch', not_modified=1)
+                return {'text': None, 'published_at': None, 'etag': etag,
+                        'last_modified': last_modified, 'not_modified': True}
+            with self.profiler.stage('scraper.article_parse') as stage:
+                article = self.extractor.article(response.content, content_class)
+                stage.add(items=1)
+            return {
+                'text': article['text'],
+                'published_at': article['published_at'],
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'not_modified': False
+            }
         except Exception as e:
             self.logger.exception(f'Erro ao obter texto completo: {str(e)}')
-            return ''
+            return None
 
     @staticmethod
     def save_texts_to_file(texts: List[str], filename: str) -> None:
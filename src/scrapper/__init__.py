@@ -1,4 +1,5 @@
+from .ArticleIndex import ArticleIndex
 from .NewsPortalScraper import NewsPortalScraper
 from .NewsScraper import NewsScraper
 
-__all__ = ['NewsPortalScraper', 'NewsScraper']
\ No newline at end of file
+__all__ = ['ArticleIndex', 'NewsPortalScraper', 'NewsScraper']
\ No newline at end of file
@@ -0,0 +1,86 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+import logging
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent
+sys.path.append(str(project_root))
+
+from src.config import ConfigManager
+from src.network import HttpClient
+from src.scrapper.HtmlExtractor import SoupExtractor, create_extractor
+
+config = ConfigManager()
+
+# Configura logging
+logging.basicConfig(
+    level=config.get('general.log_level'),
+    format=config.get('general.log_format')
+)
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(
+    description='Compara o extrator configurado com o BeautifulSoup nas páginas salvas em scraping.extractor.fixtures_dir'
+)
+parser.add_argument('--parser', default=config.get('scraping.extractor.parser', 'lxml'),
+                    help='Extrator comparado com a referência (padrão: scraping.extractor.parser)')
+parser.add_argument('--capture', nargs='*', metavar='PORTAL',
+                    help='Antes de comparar, salva a listagem e o primeiro artigo de cada colunista dos portais')
+parser.add_argument('--columnists', type=int, default=2, help='Colunistas por portal na captura')
+args = parser.parse_args()
+
+fixtures_dir = Path(config.get_full_path('scraping.extractor.fixtures_dir'))
+reference = SoupExtractor()
+candidate = create_extractor(args.parser)
+
+
+def capture(portal: str) -> None:
+    """Salva páginas reais do portal como fixtures (requer rede)"""
+    portal_config = config.get(f'news_portals.{portal.lower()}') or {}
+    columnists = list((portal_config.get('columnists') or {}).items())[:args.columnists]
+    http = HttpClient()
+    target_dir = fixtures_dir / portal.lower()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for name, url in columnists:
+        if not isinstance(url, str):
+            continue
+        listing = http.get(url).content
+        (target_dir / f'{name}_listagem.html').write_bytes(listing)
+        links = [link for link in reference.links(listing, 'div', portal_config.get('post_class', ''))
+                 if link and link.startswith('http')]
+        if links:
+            (target_dir / f'{name}_artigo.html').write_bytes(http.get(links[0]).content)
+        logger.info(f'Fixtures de {portal}/{name} salvas em {target_dir}')
+
+
+for portal in args.capture or []:
+    capture(portal)
+
+mismatches = 0
+timings = {'reference': 0.0, 'candidate': 0.0}
+pages = sorted(fixtures_dir.glob('*/*.html'))
+for page in pages:
+    portal_config = config.get(f'news_portals.{page.parent.name}') or {}
+    html = page.read_bytes()
+    checks = [('links', ('div', portal_config.get('post_class') or '')),
+              ('article', (portal_config.get('content_class') or '',))]
+    for method, method_args in checks:
+        start = time.perf_counter()
+        expected = getattr(reference, method)(html, *method_args)
+        timings['reference'] += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = getattr(candidate, method)(html, *method_args)
+        timings['candidate'] += time.perf_counter() - start
+        if actual != expected:
+            mismatches += 1
+            logger.error(f'{page.relative_to(fixtures_dir)} ({method}) diverge:\n'
+                         f'  soup: {expected!r}\n  {args.parser}: {actual!r}')
+
+if not pages:
+    logger.warning(f'Nenhuma fixture encontrada em {fixtures_dir}')
+speedup = timings['reference'] / timings['candidate'] if timings['candidate'] else float('nan')
+logger.info(f"{len(pages)} páginas, {mismatches} divergências; "
+            f"soup {timings['reference'] * 1000:.1f} ms, {args.parser} {timings['candidate'] * 1000:.1f} ms "
+            f"({speedup:.1f}x)")
+sys.exit(1 if mismatches else 0)
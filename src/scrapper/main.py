@@ -1,11 +1,16 @@
 from src.scrapper import NewsPortalScraper
 from src.config import ConfigManager
+from src.profiling import RunProfiler
 
 config = ConfigManager()
+profiler = RunProfiler()
+profiler.start('scraper')
 scraper = NewsPortalScraper()
 
 all_texts = scraper.scrape_all_portals()
 
 # Salva os textos de cada portal
 for portal, texts in all_texts.items():
-    scraper.save_portal_texts(portal, texts)
\ No newline at end of file
+    scraper.save_portal_texts(portal, texts)
+
+profiler.finish()
\ No newline at end of file
@@ -0,0 +1,250 @@
+import json
+import time
+import logging
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+from src.config import ConfigManager
+from src.model import PoliticalBiasInferencer
+from .MicroBatcher import MicroBatcher
+from .ServiceMetrics import ServiceMetrics
+
+logger = logging.getLogger(__name__)
+
+class InferenceService:
+    """
+    Serviço HTTP local de classificação de viés político
+
+    Mantém o encoder e o classificador carregados entre requisições. Todas as
+    requisições passam por um MicroBatcher, de modo que chamadas concorrentes
+    são agrupadas em uma mesma passagem do BERT.
+
+    Endpoints:
+        GET  /health          estado do serviço
+        GET  /metrics         contadores, latências e estatísticas de lote
+        POST /predict         {"text": "..."}
+        POST /predict/batch   {"texts": ["...", ...]}
+        POST /predict/stream  NDJSON, uma linha {"text": "...", "id": ...} por texto;
+                              a resposta é NDJSON na mesma ordem, enviada à medida que é processada
+    """
+
+    def __init__(self, inferencer: Optional[PoliticalBiasInferencer] = None):
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+
+        self.host = self.config.get('service.host', '127.0.0.1')
+        self.port = self.config.get('service.port', 8000)
+        self.max_request_texts = self.config.get('service.max_request_texts', 1000)
+        self.stream_chunk_size = self.config.get('service.stream_chunk_size', 64)
+
+        self.inferencer = inferencer or PoliticalBiasInferencer()
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(
+            self._classify,
+            max_batch_size=self.config.get('service.max_batch_size', 64),
+            max_wait_ms=self.config.get('service.max_wait_ms', 5),
+            on_batch=self.metrics.record_batch
+        )
+        self.server = None
+
+    def warmup(self) -> None:
+        """Carrega o encoder e executa uma predição para aquecer o modelo"""
+        self.logger.info("Carregando encoder e classificador")
+        self.batcher.submit(['aquecimento']).result()
+
+    def serve_forever(self) -> None:
+        """Inicia o servidor HTTP e bloqueia até ser interrompido"""
+        self.server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self.server.daemon_threads = True
+        self.logger.info(f"Serviço de inferência em http://{self.host}:{self.server.server_port}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        if self.server is not None:
+            self.server.server_close()
+        self.batcher.stop()
+
+    def health(self) -> Dict:
+        return {
+            'status': 'ok',
+            'model': self.inferencer.bert_model,
+            'classifier': str(self.inferencer.model_path),
+            'backend': self.inferencer.backend.name,
+            'pending_requests': self.batcher.pending(),
+            'uptime_s': round(time.time() - self.metrics.started_at, 1)
+        }
+
+    def predict(self, texts: List[str]) -> List[Dict]:
+        """Classifica textos pelo MicroBatcher (bloqueia até o resultado)"""
+        return self.batcher.submit(texts).result()
+
+    def _classify(self, texts: List[str]) -> List[Dict]:
+        """Uma passagem do modelo, executada apenas pela thread do MicroBatcher"""
+        result = self.inferencer.analyze(texts)
+        outputs = []
+        for prediction, probabilities in zip(result.predictions, result.probabilities):
+            if prediction is None:
+                outputs.append({'prediction': None, 'error': 'Falha ao processar o texto'})
+                continue
+            outputs.append({
+                'prediction': prediction,
+                'probabilities': {
+                    name: float(p) for name, p in zip(result.class_names, probabilities)
+                }
+            })
+        return outputs
+
+    def _stream(self, lines: Iterator[bytes]) -> Iterator[Dict]:
+        """Classifica linhas NDJSON em lotes de stream_chunk_size"""
+        chunk = []
+
+        def flush():
+            texts = [item['text'] for item in chunk if 'text' in item]
+            results = iter(self.predict(texts)) if texts else iter(())
+            for item in chunk:
+                if 'text' not in item:
+                    yield item
+                    continue
+                output = next(results)
+                if 'id' in item:
+                    output = {'id': item['id'], **output}
+                yield output
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+                if not isinstance(item, dict) or not isinstance(item.get('text'), str):
+                    raise ValueError("cada linha deve ter o campo 'text'")
+                chunk.append({'text': item['text'], **({'id': item['id']} if 'id' in item else {})})
+            except ValueError as e:
+                chunk.append({'error': f'Linha inválida: {str(e)}'})
+            if len(chunk) >= self.stream_chunk_size:
+                yield from flush()
+                chunk = []
+        if chunk:
+            yield from flush()
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                if self.path == '/health':
+                    self._send_json(200, service.health())
+                elif self.path == '/metrics':
+                    self._send_json(200, service.metrics.snapshot())
+                else:
+                    self._send_json(404, {'error': 'Endpoint não encontrado'})
+
+            def do_POST(self):
+                start = time.perf_counter()
+                endpoint = self.path
+                texts = 0
+                error = False
+                try:
+                    if endpoint == '/predict':
+                        payload = self._read_json()
+                        if not isinstance(payload.get('text'), str):
+                            raise ValueError("Campo 'text' obrigatório")
+                        texts = 1
+                        self._send_json(200, service.predict([payload['text']])[0])
+                    elif endpoint == '/predict/batch':
+                        payload = self._read_json()
+                        batch = payload.get('texts')
+                        if not isinstance(batch, list) or not all(isinstance(t, str) for t in batch):
+                            raise ValueError("Campo 'texts' deve ser uma lista de textos")
+                        if len(batch) > service.max_request_texts:
+                            raise ValueError(f"Máximo de {service.max_request_texts} textos por requisição")
+                        texts = len(batch)
+                        self._send_json(200, {'results': service.predict(batch)})
+                    elif endpoint == '/predict/stream':
+                        texts = self._send_stream()
+                    else:
+                        error = True
+                        self._send_json(404, {'error': 'Endpoint não encontrado'})
+                except _StreamAborted:
+                    error = True
+                except ValueError as e:
+                    error = True
+                    self._send_json(400, {'error': str(e)})
+                except Exception as e:
+                    error = True
+                    logger.exception("Erro ao processar requisição")
+                    self._send_json(500, {'error': str(e)})
+                finally:
+                    service.metrics.record_request(endpoint, texts, time.perf_counter() - start, error)
+
+            def _body_lines(self) -> Iterator[bytes]:
+                remaining = int(self.headers.get('Content-Length', 0))
+                while remaining > 0:
+                    line = self.rfile.readline(min(remaining, 1 << 20))
+                    if not line:
+                        break
+                    remaining -= len(line)
+                    yield line
+
+            def _read_json(self) -> Dict:
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"JSON inválido: {str(e)}")
+                if not isinstance(payload, dict):
+                    raise ValueError("O corpo deve ser um objeto JSON")
+                return payload
+
+            def _send_json(self, status: int, payload: Dict) -> None:
+                body = json.dumps(payload, ensure_ascii=False, default=_to_json).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self) -> int:
+                """Responde em NDJSON com Transfer-Encoding chunked; retorna o número de textos"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                count = 0
+                try:
+                    for output in service._stream(self._body_lines()):
+                        self._write_chunk(output)
+                        count += 'prediction' in output
+                except Exception as e:
+                    # O status 200 já foi enviado; o erro vai como última linha
+                    logger.exception("Erro durante resposta em streaming")
+                    self._write_chunk({'error': str(e)})
+                    self.wfile.write(b'0\r\n\r\n')
+                    raise _StreamAborted() from e
+                self.wfile.write(b'0\r\n\r\n')
+                return count
+
+            def _write_chunk(self, output: Dict) -> None:
+                line = (json.dumps(output, ensure_ascii=False, default=_to_json) + '\n').encode('utf-8')
+                self.wfile.write(f'{len(line):X}\r\n'.encode('ascii') + line + b'\r\n')
+                self.wfile.flush()
+
+        return Handler
+
+
+class _StreamAborted(Exception):
+    """Erro em uma resposta NDJSON já iniciada (já comunicado ao cliente)"""
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value)}")
@@ -0,0 +1,111 @@
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Agrupa requisições concorrentes em uma única passagem do modelo
+
+    Cada chamada a submit entra em uma fila. Uma thread dedicada retira a
+    primeira requisição pendente e aguarda até max_wait_ms por outras, até
+    somar max_batch_size textos; todos os textos reunidos são processados de
+    uma vez e cada requisição recebe apenas os seus resultados. Como só essa
+    thread executa o modelo, o inferencer não precisa ser thread-safe.
+    """
+
+    def __init__(self,
+                 process: Callable[[List[str]], List],
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 5,
+                 on_batch: Optional[Callable[[int, int, float], None]] = None):
+        """
+        Args:
+            process: Função que recebe uma lista de textos e devolve um resultado por texto
+            max_batch_size: Máximo de textos por passagem (uma requisição maior é processada sozinha)
+            max_wait_ms: Espera máxima por novas requisições depois da primeira
+            on_batch: Callback (requisições, textos, segundos) chamado após cada passagem
+        """
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.on_batch = on_batch
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='MicroBatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Enfileira textos; o Future resolve com a lista de resultados na mesma ordem"""
+        future = Future()
+        if self._stopped.is_set():
+            future.set_exception(RuntimeError("MicroBatcher encerrado"))
+            return future
+        self._queue.put((list(texts), future))
+        return future
+
+    def pending(self) -> int:
+        """Requisições aguardando processamento"""
+        return self._queue.qsize()
+
+    def stop(self) -> None:
+        """Encerra a thread após processar o que já está na fila"""
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self) -> List:
+        """Bloqueia até a primeira requisição e reúne as que chegarem dentro da janela"""
+        first = self._queue.get()
+        if first is None:
+            return []
+        requests = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            requests.append(item)
+            size += len(item[0])
+        return requests
+
+    def _run(self) -> None:
+        while True:
+            requests = self._collect()
+            if not requests:
+                if self._stopped.is_set() and self._queue.empty():
+                    return
+                continue
+
+            texts = [text for request_texts, _ in requests for text in request_texts]
+            start = time.perf_counter()
+            try:
+                results = self.process(texts)
+            except Exception as e:
+                self.logger.exception(f"Erro ao processar lote de {len(texts)} textos")
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - start
+
+            offset = 0
+            for request_texts, future in requests:
+                future.set_result(results[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+            if self.on_batch is not None:
+                self.on_batch(len(requests), len(texts), elapsed)
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict
+
+import numpy as np
+
+class ServiceMetrics:
+    """
+    Contadores e latências do serviço de inferência
+
+    As latências de cada endpoint ficam em uma janela com as últimas
+    `window` requisições, da qual são calculados os percentis.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.started_at = time.time()
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._texts = defaultdict(int)
+        self._latencies = defaultdict(lambda: deque(maxlen=self.window))
+        self._batches = 0
+        self._batched_requests = 0
+        self._batched_texts = 0
+        self._model_seconds = 0.0
+
+    def record_request(self, endpoint: str, texts: int, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self._requests[endpoint] += 1
+            self._texts[endpoint] += texts
+            if error:
+                self._errors[endpoint] += 1
+            self._latencies[endpoint].append(seconds)
+
+    def record_batch(self, requests: int, texts: int, seconds: float) -> None:
+        with self._lock:
+            self._batches += 1
+            self._batched_requests += requests
+            self._batched_texts += texts
+            self._model_seconds += seconds
+
+    def snapshot(self) -> Dict:
+        """Métricas atuais em formato serializável em JSON"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, count in self._requests.items():
+                latencies = np.array(self._latencies[endpoint]) * 1000
+                endpoints[endpoint] = {
+                    'requests': count,
+                    'errors': self._errors[endpoint],
+                    'texts': self._texts[endpoint],
+                    'latency_ms': {
+                        'p50': float(np.percentile(latencies, 50)),
+                        'p95': float(np.percentile(latencies, 95)),
+                        'p99': float(np.percentile(latencies, 99)),
+                        'max': float(latencies.max())
+                    } if len(latencies) else {}
+                }
+
+            batches = max(self._batches, 1)
+            return {
+                'uptime_s': round(time.time() - self.started_at, 1),
+                'endpoints': endpoints,
+                'batching': {
+                    'batches': self._batches,
+                    'avg_requests_per_batch': self._batched_requests / batches,
+                    'avg_texts_per_batch': self._batched_texts / batches,
+                    'model_seconds': round(self._model_seconds, 3),
+                    'texts_per_second': (self._batched_texts / self._model_seconds
+                                         if self._model_seconds else 0.0)
+                }
+            }
@@ -0,0 +1,5 @@
+from .InferenceService import InferenceService
+from .MicroBatcher import MicroBatcher
+from .ServiceMetrics import ServiceMetrics
+
+__all__ = ['InferenceService', 'MicroBatcher', 'ServiceMetrics']
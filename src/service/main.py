@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+import logging
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent
+sys.path.append(str(project_root))
+
+from src.config import ConfigManager
+from src.service import InferenceService
+
+config = ConfigManager()
+
+# Configura logging
+logging.basicConfig(
+    level=config.get('general.log_level'),
+    format=config.get('general.log_format')
+)
+
+service = InferenceService()
+service.warmup()
+
+try:
+    service.serve_forever()
+except KeyboardInterrupt:
+    logging.getLogger(__name__).info("Serviço encerrado")
@@ -1,9 +1,15 @@
-import requests
+import json
+import os
+import threading
 import pandas as pd
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Set, Tuple
 import logging
 from datetime import datetime
 from src.config import ConfigManager
+from src.network import HttpClient
+from src.profiling import RunProfiler
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +19,9 @@ class DiscursosDeputadosCollector:
     Classe para coletar discursos de deputados da API da Câmara dos Deputados
     """
     
+    # Identificam um discurso ao acrescentar linhas ao CSV existente
+    KEY_COLUMNS = ('id', 'dataHoraInicio', 'uriEvento')
+    
     def __init__(self):
         """Inicializa as URLs base e configura headers"""
         self.config = ConfigManager()
@@ -20,6 +29,8 @@ class DiscursosDeputadosCollector:
         self.headers = {
             'User-Agent': self.config.get('scraping.user_agent')
         }
+        self.http = HttpClient()
+        self.profiler = RunProfiler()
         self.logger = logging.getLogger(__name__)
 
     def get_deputados(self) -> List[Dict]:
@@ -27,10 +38,12 @@ class DiscursosDeputadosCollector:
         try:
             endpoint = self.config.get('camara_api.endpoints.deputados')
 
-            response = requests.get(
-                f"{self.base_url}{endpoint}",
-                headers=self.headers
-            )
+            with self.profiler.stage('speech.fetch') as stage:
+                response = self.http.get(
+                    f"{self.base_url}{endpoint}",
+                    headers=self.headers
+                )
+                stage.add(bytes=len(response.content))
             
             if response.status_code == 200:
                 return response.json()["dados"]
@@ -53,16 +66,31 @@ class DiscursosDeputadosCollector:
             deputado_id: ID do deputado
             data_inicio: Data inicial (YYYY-MM-DD)
             data_fim: Data final (YYYY-MM-DD)
-            itens_por_pagina: Número de itens por página
+        """
+        try:
+            return self._fetch_discursos(deputado_id, data_inicio, data_fim)
+        except Exception as e:
+            self.logger.exception(f"Erro ao obter discursos do deputado {deputado_id}: {str(e)}")
+            return []
+
+    def _fetch_discursos(self,
+                         deputado_id: int,
+                         data_inicio: str,
+                         data_fim: str) -> List[Dict]:
+        """
+        Percorre todas as páginas de discursos de um deputado
+
+        Diferente de get_discursos_deputado, falhas são propagadas, para que
+        um deputado incompleto não seja registrado como coletado.
         """
         discursos_totais = []
         pagina = 1
         itens_por_pagina = self.config.get('camara_api.params.itens_por_pagina')
+        endpoint = self.config.get('camara_api.endpoints.discursos').format(id=deputado_id)
         
-        try:
-            while True:
-                endpoint = self.config.get('camara_api.endpoints.discursos').format(id=deputado_id)
-                response = requests.get(
+        while True:
+            with self.profiler.stage('speech.fetch') as stage:
+                response = self.http.get(
                     f"{self.base_url}{endpoint}",
                     params={
                         "dataInicio": data_inicio,
@@ -74,24 +102,51 @@ class DiscursosDeputadosCollector:
                     },
                     headers=self.headers
                 )
-                
-                if response.status_code == 200:
-                    discursos = response.json()["dados"]
-                    discursos_totais.extend(discursos)
-                    
-                    if len(discursos) < itens_por_pagina:
-                        break
-                        
-                    pagina += 1
-                else:
-                    self.logger.error(f"Erro ao obter discursos do deputado {deputado_id}: {response.status_code}")
-                    break
-                    
-            return discursos_totais
+                stage.add(bytes=len(response.content))
             
-        except Exception as e:
-            self.logger.exception(f"Erro ao obter discursos do deputado {deputado_id}: {str(e)}")
-            return []
+            if response.status_code != 200:
+                raise RuntimeError(f"Status Code {response.status_code} na página {pagina}")
+            
+            with self.profiler.stage('speech.parse') as stage:
+                discursos = response.json()["dados"]
+                stage.add(items=len(discursos))
+            discursos_totais.extend(discursos)
+            
+            if len(discursos) < itens_por_pagina:
+                return discursos_totais
+                
+            pagina += 1
+
+    @staticmethod
+    def _build_rows(deputado_data: Dict, discursos: List[Dict]) -> List[Dict]:
+        """Achata os dados do deputado e de cada discurso em linhas do DataFrame"""
+        rows = []
+        for discurso in discursos:
+            rows.append({
+                "email": deputado_data["email"],
+                "id": deputado_data["id"],
+                "idLegislatura": deputado_data["idLegislatura"],
+                "nome": deputado_data["nome"],
+                "siglaPartido": deputado_data["siglaPartido"],
+                "siglaUf": deputado_data["siglaUf"],
+                "uri": deputado_data["uri"],
+                "uriPartido": deputado_data["uriPartido"],
+                "urlFoto": deputado_data["urlFoto"],
+                "dataHoraFim": discurso["dataHoraFim"],
+                "dataHoraInicio": discurso["dataHoraInicio"],
+                "faseEvento_dataHoraFim": discurso["faseEvento"]["dataHoraFim"],
+                "faseEvento_dataHoraInicio": discurso["faseEvento"]["dataHoraInicio"],
+                "faseEvento_titulo": discurso["faseEvento"]["titulo"],
+                "keywords": discurso["keywords"],
+                "sumario": discurso["sumario"],
+                "tipoDiscurso": discurso["tipoDiscurso"],
+                "transcricao": discurso["transcricao"],
+                "uriEvento": discurso["uriEvento"],
+                "urlAudio": discurso["urlAudio"],
+                "urlTexto": discurso["urlTexto"],
+                "urlVideo": discurso["urlVideo"]
+            })
+        return rows
 
     def collect_discursos(self, 
                          data_inicio: str, 
@@ -100,6 +155,11 @@ class DiscursosDeputadosCollector:
         """
         Coleta todos os discursos no período especificado
         
+        Os deputados são coletados em paralelo (camara_api.max_workers) e cada
+        deputado concluído gera um checkpoint em discursos.paths.checkpoint_dir.
+        Uma nova execução com o mesmo período retoma a partir dos deputados
+        que ainda não têm checkpoint.
+        
         Args:
             data_inicio: Data inicial (YYYY-MM-DD)
             data_fim: Data final (YYYY-MM-DD)
@@ -110,61 +170,57 @@ class DiscursosDeputadosCollector:
             datetime.strptime(data_inicio, '%Y-%m-%d')
             datetime.strptime(data_fim, '%Y-%m-%d')
             
-            dados = []
             deputados = self.get_deputados()
+            checkpoint_dir = self._checkpoint_dir(data_inicio, data_fim)
             
-            logger.info(f"Coletando discursos de {len(deputados)} deputados")
+            pending = [d for d in deputados
+                       if not (checkpoint_dir / f"{d['id']}.json").exists()]
+            logger.info(
+                f"Coletando discursos de {len(deputados)} deputados "
+                f"({len(deputados) - len(pending)} já coletados em {checkpoint_dir})"
+            )
             
-            for deputado in deputados:
-                discursos = self.get_discursos_deputado(
-                    deputado['id'],
-                    data_inicio,
-                    data_fim
-                )
-                
+            def collect(deputado):
+                try:
+                    discursos = self._fetch_discursos(deputado['id'], data_inicio, data_fim)
+                except Exception as e:
+                    logger.error(f"Erro ao coletar discursos do deputado {deputado['nome']}: {str(e)}")
+                    return False
+                with self.profiler.stage('speech.checkpoint_write'):
+                    self._write_checkpoint(
+                        checkpoint_dir / f"{deputado['id']}.json",
+                        self._build_rows(deputado, discursos)
+                    )
                 logger.info(f"Coletados {len(discursos)} discursos do deputado {deputado['nome']}")
-                
-                dados.append({
-                    'deputado': deputado,
-                    'discursos': discursos
-                })
+                return True
+            
+            with ThreadPoolExecutor(max_workers=self.config.get('camara_api.max_workers', 4)) as executor:
+                completed = list(executor.map(collect, pending))
+            
+            failed = completed.count(False)
+            if failed:
+                logger.warning(
+                    f"{failed} deputados falharam e serão coletados na próxima execução"
+                )
 
-            # Processa os dados para DataFrame
+            # Monta o DataFrame a partir dos checkpoints, na ordem dos deputados
             rows = []
-            for dado in dados:
-                deputado_data = dado['deputado']
-                for discurso in dado['discursos']:
-                    row = {
-                        "email": deputado_data["email"],
-                        "id": deputado_data["id"],
-                        "idLegislatura": deputado_data["idLegislatura"],
-                        "nome": deputado_data["nome"],
-                        "siglaPartido": deputado_data["siglaPartido"],
-                        "siglaUf": deputado_data["siglaUf"],
-                        "uri": deputado_data["uri"],
-                        "uriPartido": deputado_data["uriPartido"],
-                        "urlFoto": deputado_data["urlFoto"],
-                        "dataHoraFim": discurso["dataHoraFim"],
-                        "dataHoraInicio": discurso["dataHoraInicio"],
-                        "faseEvento_dataHoraFim": discurso["faseEvento"]["dataHoraFim"],
-                        "faseEvento_dataHoraInicio": discurso["faseEvento"]["dataHoraInicio"],
-                        "faseEvento_titulo": discurso["faseEvento"]["titulo"],
-                        "keywords": discurso["keywords"],
-                        "sumario": discurso["sumario"],
-                        "tipoDiscurso": discurso["tipoDiscurso"],
-                        "transcricao": discurso["transcricao"],
-                        "uriEvento": discurso["uriEvento"],
-                        "urlAudio": discurso["urlAudio"],
-                        "urlTexto": discurso["urlTexto"],
-                        "urlVideo": discurso["urlVideo"]
-                    }
-                    rows.append(row)
+            for deputado in deputados:
+                checkpoint = checkpoint_dir / f"{deputado['id']}.json"
+                if checkpoint.exists():
+                    with open(checkpoint, 'r', encoding='utf-8') as f:
+                        rows.extend(json.load(f))
 
             df = pd.DataFrame(rows)
             
             if output_file:
-                df.to_csv(output_file, index=False)
+                with self.profiler.stage('speech.csv_write') as stage:
+                    df.to_csv(output_file, index=False)
+                    stage.add(items=len(df))
                 logger.info(f"Dados salvos em {output_file}")
+                # O CSV foi reescrito: as marcas d'água da coleta incremental passam a ser as dele
+                self._save_watermarks(Path(self.config.get_full_path('discursos.paths.state_file')),
+                                      self._watermarks_from(df))
                 
             return df
             
@@ -175,3 +231,140 @@ class DiscursosDeputadosCollector:
             logger.exception(f"Erro ao coletar discursos: {str(e)}")
             raise
 
+    def collect_discursos_incremental(self,
+                                      output_file: str,
+                                      data_fim: str = None) -> pd.DataFrame:
+        """
+        Coleta apenas os discursos posteriores ao último já registrado por deputado
+        
+        A marca d'água (maior dataHoraInicio visto) de cada deputado fica em
+        discursos.paths.state_file. Na primeira execução ela é derivada do
+        output_file existente; deputados sem histórico começam em
+        discursos.data_collection.data_inicio. São buscados os discursos a
+        partir da marca (inclusive) e os já presentes no output_file, pela
+        chave (id, dataHoraInicio, uriEvento), são descartados; os demais são
+        acrescentados e a marca d'água é atualizada por deputado. Assim, uma
+        interrupção entre a gravação do CSV e a do estado não duplica linhas.
+        
+        Args:
+            output_file: CSV de discursos existente (é criado se não existir)
+            data_fim: Data final (YYYY-MM-DD); padrão: hoje
+            
+        Returns:
+            DataFrame apenas com os discursos novos
+        """
+        data_fim = data_fim or datetime.now().strftime('%Y-%m-%d')
+        datetime.strptime(data_fim, '%Y-%m-%d')
+        default_inicio = self.config.get('discursos.data_collection.data_inicio')
+        
+        state_file = Path(self.config.get_full_path('discursos.paths.state_file'))
+        watermarks = self._load_watermarks(state_file, output_file)
+        
+        deputados = self.get_deputados()
+        logger.info(
+            f"Coleta incremental de {len(deputados)} deputados até {data_fim} "
+            f"({len(watermarks)} com histórico)"
+        )
+        
+        existing_keys = self._existing_keys(output_file)
+        lock = threading.Lock()
+        new_frames = []
+        write_header = not os.path.exists(output_file)
+        
+        def collect(deputado):
+            nonlocal write_header
+            watermark = watermarks.get(str(deputado['id']))
+            # A API filtra por dia; discursos do próprio dia da marca são descartados abaixo
+            data_inicio = watermark[:10] if watermark else default_inicio
+            try:
+                discursos = self._fetch_discursos(deputado['id'], data_inicio, data_fim)
+            except Exception as e:
+                logger.error(f"Erro ao coletar discursos do deputado {deputado['nome']}: {str(e)}")
+                return
+            
+            if watermark:
+                discursos = [d for d in discursos if d['dataHoraInicio'] >= watermark]
+            
+            rows = self._build_rows(deputado, discursos)
+            with lock:
+                rows = [row for row in rows if self._row_key(row) not in existing_keys]
+                existing_keys.update(self._row_key(row) for row in rows)
+            if not rows:
+                return
+            
+            df = pd.DataFrame(rows)
+            with lock, self.profiler.stage('speech.csv_write') as stage:
+                df.to_csv(output_file, mode='a', header=write_header, index=False)
+                stage.add(items=len(df))
+                write_header = False
+                watermarks[str(deputado['id'])] = df['dataHoraInicio'].max()
+                self._save_watermarks(state_file, watermarks)
+                new_frames.append(df)
+            logger.info(f"{len(df)} discursos novos do deputado {deputado['nome']}")
+        
+        with ThreadPoolExecutor(max_workers=self.config.get('camara_api.max_workers', 4)) as executor:
+            list(executor.map(collect, deputados))
+        
+        new_df = pd.concat(new_frames, ignore_index=True) if new_frames else pd.DataFrame()
+        logger.info(f"Coleta incremental concluída: {len(new_df)} discursos novos em {output_file}")
+        return new_df
+
+    def _load_watermarks(self, state_file: Path, output_file: str) -> Dict[str, str]:
+        """Lê as marcas d'água do estado ou, na ausência dele, do CSV existente"""
+        if state_file.exists():
+            with open(state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        if not os.path.exists(output_file):
+            return {}
+        
+        logger.info(f"Estado incremental ausente, derivando marcas d'água de {output_file}")
+        watermarks = self._watermarks_from(pd.read_csv(output_file, usecols=['id', 'dataHoraInicio']))
+        self._save_watermarks(state_file, watermarks)
+        return watermarks
+
+    @staticmethod
+    def _watermarks_from(df: pd.DataFrame) -> Dict[str, str]:
+        """Maior dataHoraInicio por deputado"""
+        if df.empty or not {'id', 'dataHoraInicio'} <= set(df.columns):
+            return {}
+        latest = df[['id', 'dataHoraInicio']].dropna().groupby('id')['dataHoraInicio'].max()
+        return {str(dep_id): value for dep_id, value in latest.items()}
+
+    def _existing_keys(self, output_file: str) -> Set[Tuple[str, str, str]]:
+        """Chaves (id, dataHoraInicio, uriEvento) dos discursos já gravados no CSV"""
+        if not os.path.exists(output_file):
+            return set()
+        try:
+            existing = pd.read_csv(output_file, usecols=lambda column: column in self.KEY_COLUMNS, dtype=str)
+        except pd.errors.EmptyDataError:
+            return set()
+        existing = existing.reindex(columns=list(self.KEY_COLUMNS)).fillna('')
+        return set(existing.itertuples(index=False, name=None))
+
+    @classmethod
+    def _row_key(cls, row: Dict) -> Tuple[str, str, str]:
+        return tuple('' if row.get(column) is None else str(row[column]) for column in cls.KEY_COLUMNS)
+
+    @staticmethod
+    def _save_watermarks(state_file: Path, watermarks: Dict[str, str]) -> None:
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp_path, state_file)
+
+    def _checkpoint_dir(self, data_inicio: str, data_fim: str) -> Path:
+        """Diretório de checkpoints por deputado para o período solicitado"""
+        checkpoint_dir = (Path(self.config.get_full_path('discursos.paths.checkpoint_dir')) /
+                          f"{data_inicio}_{data_fim}")
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        return checkpoint_dir
+
+    @staticmethod
+    def _write_checkpoint(path: Path, rows: List[Dict]) -> None:
+        """Grava o checkpoint de forma atômica para não deixar arquivos parciais"""
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
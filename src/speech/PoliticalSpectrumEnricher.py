@@ -1,8 +1,12 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import logging
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, Optional
 from pathlib import Path
 from src.config import ConfigManager
+from src.profiling import RunProfiler
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +22,7 @@ class PoliticalSpectrumEnricher:
         self.partidos_df = None
         self.discursos_df = None
         self.enriched_df = None
+        self.stats_df = None
         self.logger = logging.getLogger(__name__)
 
     def load_data(self,
@@ -139,7 +144,10 @@ class PoliticalSpectrumEnricher:
             if self.enriched_df is None:
                 raise ValueError("Não há dados enriquecidos. Execute enrich_data primeiro.")
             
-            self.enriched_df.to_csv(enriched_path, index=True)
+            if Path(enriched_path).suffix == '.parquet':
+                self.enriched_df.to_parquet(enriched_path, index=False)
+            else:
+                self.enriched_df.to_csv(enriched_path, index=True)
                 
             agg_config = self.config.get('data_processing.aggregation_config', {
                 'id': 'count',
@@ -156,6 +164,125 @@ class PoliticalSpectrumEnricher:
             self.logger.exception(f"Erro ao gerar estatísticas: {str(e)}")
             raise
 
+    def enrich_in_chunks(self,
+                         partidos_path: str,
+                         discursos_path: str,
+                         enriched_path: str,
+                         stats_path: str,
+                         chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """
+        Enriquece e salva os discursos em lotes, sem carregar o arquivo inteiro
+
+        O espectro de cada discurso vem de uma tabela sigla -> espectro montada
+        a partir dos partidos, no lugar do merge. Colunas repetitivas
+        (discursos.enrichment.categorical_columns) são lidas como category e
+        gravadas como colunas de dicionário no Parquet; com enriched_path .csv
+        os lotes são acrescentados ao CSV. As estatísticas de Stats.txt são
+        acumuladas a cada lote.
+
+        Args:
+            partidos_path: Caminho para o arquivo de partidos
+            discursos_path: Caminho para o arquivo de discursos
+            enriched_path: Arquivo de saída (.parquet ou .csv)
+            stats_path: Caminho das estatísticas por espectro
+            chunk_size: Discursos por lote (padrão: discursos.enrichment.chunk_size)
+
+        Returns:
+            DataFrame com estatísticas por espectro
+        """
+        try:
+            chunk_size = chunk_size or self.config.get('discursos.enrichment.chunk_size', 50000)
+            self.logger.info(f"Enriquecendo {discursos_path} em lotes de {chunk_size} discursos")
+
+            self.partidos_df = pd.read_csv(partidos_path)
+            self._process_partidos()
+            merge_config = self.config.get('data_processing.merge_config', {
+                'left_on': 'siglaPartido',
+                'right_on': 'Sigla',
+                'how': 'inner'
+            })
+            if merge_config.get('how', 'inner') not in ('inner', 'left'):
+                raise ValueError(f"Enriquecimento em lotes aceita apenas how 'inner' ou 'left': {merge_config}")
+            left_on = merge_config.get('left_on', 'siglaPartido')
+            lookup = self.spectrum_lookup(merge_config.get('right_on', 'Sigla'))
+
+            columns = list(pd.read_csv(discursos_path, nrows=0).columns)
+            categorical = set(self.config.get('discursos.enrichment.categorical_columns', [])) | {left_on}
+            dtypes = {column: 'category' if column in categorical else str for column in columns}
+            output_columns = columns + ['Espectro Político']
+            schema = pa.schema([
+                (column, pa.dictionary(pa.int32(), pa.string())
+                 if column in categorical or column == 'Espectro Político' else pa.string())
+                for column in output_columns
+            ])
+
+            required_discursos = self.config.get('data_processing.required_columns.discursos', ['siglaPartido'])
+            required_enriched = self.config.get('data_processing.required_columns.enriched',
+                                                ['Espectro Político', 'transcricao'])
+            agg_config = self.config.get('data_processing.aggregation_config', {
+                'id': 'count',
+                'siglaPartido': 'nunique',
+                'nome': 'nunique'
+            })
+            stats = _IncrementalStats('Espectro Político', agg_config)
+
+            parquet = Path(enriched_path).suffix == '.parquet'
+            writer = pq.ParquetWriter(enriched_path, schema) if parquet else None
+            profiler = RunProfiler()
+            total = 0
+            written = 0
+            try:
+                reader = pd.read_csv(discursos_path, dtype=dtypes, chunksize=chunk_size)
+                for chunk in reader:
+                    with profiler.stage('speech.enrich_chunk') as stage:
+                        total += len(chunk)
+                        chunk = chunk.dropna(subset=required_discursos, how='all')
+                        chunk['Espectro Político'] = chunk[left_on].map(lookup).astype('category')
+                        if merge_config.get('how', 'inner') == 'inner':
+                            chunk = chunk[chunk['Espectro Político'].notna()]
+                        chunk = chunk.dropna(subset=required_enriched, how='all')
+                        stats.update(chunk)
+
+                        if parquet:
+                            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                        else:
+                            chunk.to_csv(enriched_path, mode='w' if written == 0 else 'a',
+                                         header=written == 0, index=False)
+                        written += len(chunk)
+                        stage.add(items=len(chunk))
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            if not parquet and written == 0:
+                pd.DataFrame(columns=output_columns).to_csv(enriched_path, index=False)
+
+            self.stats_df = stats.frame()
+            self.stats_df.columns = ['Total_Discursos', 'Total_Partidos', 'Total_Deputados']
+            self.stats_df.to_csv(stats_path, index=True)
+
+            self.logger.info(f"Dados enriquecidos: {written} de {total} discursos gravados em {enriched_path}")
+            return self.stats_df
+
+        except Exception as e:
+            self.logger.exception(f"Erro ao enriquecer dados em lotes: {str(e)}")
+            raise
+
+    def spectrum_lookup(self, sigla_column: str = 'Sigla') -> Dict[str, str]:
+        """
+        Tabela sigla -> espectro político dos partidos carregados
+
+        Siglas repetidas mantêm a primeira ocorrência (o merge duplicaria os discursos).
+        """
+        partidos = self.partidos_df.dropna(subset=[sigla_column, 'Espectro Político'])
+        duplicated = partidos[sigla_column].duplicated()
+        if duplicated.any():
+            self.logger.warning(
+                f"Siglas repetidas em partidos, mantida a primeira: {sorted(partidos.loc[duplicated, sigla_column])}"
+            )
+        partidos = partidos[~duplicated]
+        return dict(zip(partidos[sigla_column].astype(str), partidos['Espectro Político']))
+
 
     def get_spectrum_statistics(self) -> pd.DataFrame:
         """
@@ -165,6 +292,8 @@ class PoliticalSpectrumEnricher:
             DataFrame com estatísticas
         """
         try:
+            if self.enriched_df is None and self.stats_df is not None:
+                return self.stats_df
             if self.enriched_df is None:
                 raise ValueError("Não há dados enriquecidos. Execute enrich_data primeiro.")
                 
@@ -183,3 +312,50 @@ class PoliticalSpectrumEnricher:
         except Exception as e:
             logger.exception(f"Erro ao gerar estatísticas: {str(e)}")
             raise
+
+
+class _IncrementalStats:
+    """Agregações por grupo acumuladas lote a lote (count, sum, nunique, min, max)"""
+
+    FUNCTIONS = ('count', 'sum', 'nunique', 'min', 'max')
+
+    def __init__(self, group_column: str, agg_config: Dict[str, str]):
+        unsupported = {func for func in agg_config.values() if func not in self.FUNCTIONS}
+        if unsupported:
+            raise ValueError(f"Agregações sem suporte em lotes: {unsupported}. Use {self.FUNCTIONS}")
+        self.group_column = group_column
+        self.agg_config = agg_config
+        self.values = {column: defaultdict(set) if func == 'nunique' else {}
+                       for column, func in agg_config.items()}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for column, func in self.agg_config.items():
+            current = self.values[column]
+            if func == 'nunique':
+                pairs = chunk[[self.group_column, column]].dropna().drop_duplicates()
+                for group, value in zip(pairs[self.group_column], pairs[column]):
+                    current[group].add(value)
+                continue
+            series = chunk[column]
+            if func == 'sum':
+                series = pd.to_numeric(series, errors='coerce')
+            elif func in ('min', 'max') and isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(object)
+            partial = series.groupby(chunk[self.group_column], observed=True).agg(func)
+            for group, value in partial.items():
+                if func in ('count', 'sum'):
+                    current[group] = current.get(group, 0) + value
+                elif pd.notna(value):
+                    previous = current.get(group)
+                    current[group] = value if previous is None else (min if func == 'min' else max)(previous, value)
+
+    def frame(self) -> pd.DataFrame:
+        groups = sorted(set().union(*(values.keys() for values in self.values.values())))
+        data = {}
+        for column, func in self.agg_config.items():
+            current = self.values[column]
+            if func == 'nunique':
+                data[column] = [len(current.get(group, ())) for group in groups]
+            else:
+                data[column] = [current.get(group, 0 if func in ('count', 'sum') else None) for group in groups]
+        return pd.DataFrame(data, index=pd.Index(groups, name=self.group_column))
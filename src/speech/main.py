@@ -8,6 +8,7 @@ sys.path.append(str(project_root))
 from src.speech import DiscursosDeputadosCollector
 from src.speech import PoliticalSpectrumEnricher
 from src.config import ConfigManager
+from src.profiling import RunProfiler
 
 config = ConfigManager()
 
@@ -18,35 +19,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+profiler = RunProfiler()
+profiler.start('speech')
+
 # Inicializa coletores
 collector = DiscursosDeputadosCollector()
 enricher = PoliticalSpectrumEnricher()
 
 try:
     # Coleta discursos
-    df = collector.collect_discursos(
-        data_inicio=config.get('discursos.data_collection.data_inicio'),
-        data_fim=config.get('discursos.data_collection.data_fim'),
-        output_file=str(Path(config.get_full_path('discursos.paths.base_dir')) / 
+    discursos_path = str(Path(config.get_full_path('discursos.paths.base_dir')) / 
                          config.get('discursos.paths.discursos_file'))
-    )
+    if config.get('discursos.data_collection.incremental', False):
+        df = collector.collect_discursos_incremental(output_file=discursos_path)
+    else:
+        df = collector.collect_discursos(
+            data_inicio=config.get('discursos.data_collection.data_inicio'),
+            data_fim=config.get('discursos.data_collection.data_fim'),
+            output_file=discursos_path
+        )
     
     # Enriquece dados
-    enricher.load_data(
-        partidos_path=str(Path(config.get_full_path('discursos.paths.base_dir')) /
-                          config.get('discursos.paths.partidos_file')),
-        discursos_path=str(Path(config.get_full_path('discursos.paths.base_dir')) /
-                           config.get('discursos.paths.discursos_file'))
-    )
-
-    df_enriched = enricher.enrich_data()
-
-    enricher.save_enriched_data(
-        enriched_path=str(Path(config.get_full_path('discursos.paths.base_dir')) /
-                         config.get('discursos.paths.merged_file')),
-        stats_path=str(Path(config.get_full_path('discursos.paths.base_dir')) /
-                          config.get('discursos.paths.stats_file'))
-    )
+    base_dir = Path(config.get_full_path('discursos.paths.base_dir'))
+    paths = {
+        'partidos_path': str(base_dir / config.get('discursos.paths.partidos_file')),
+        'discursos_path': str(base_dir / config.get('discursos.paths.discursos_file'))
+    }
+    outputs = {
+        'enriched_path': str(base_dir / config.get('discursos.paths.merged_file')),
+        'stats_path': str(base_dir / config.get('discursos.paths.stats_file'))
+    }
+    if config.get('discursos.enrichment.chunked', False):
+        enricher.enrich_in_chunks(**paths, **outputs)
+    else:
+        enricher.load_data(**paths)
+        df_enriched = enricher.enrich_data()
+        enricher.save_enriched_data(**outputs)
     
     # Obtém e exibe estatísticas
     stats = enricher.get_spectrum_statistics()
@@ -55,4 +63,6 @@ try:
     
 except Exception as e:
     logger.exception("Erro durante o processamento")
-    raise
\ No newline at end of file
+    raise
+finally:
+    profiler.finish()
\ No newline at end of file
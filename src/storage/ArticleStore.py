@@ -0,0 +1,185 @@
+import hashlib
+import os
+import uuid
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.config import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+class ArticleStore:
+    """
+    Armazenamento colunar (Parquet) dos artigos coletados dos portais
+
+    Cada portal tem um diretório portal=<nome> com um arquivo Parquet por
+    gravação, de modo que acrescentar artigos nunca reescreve os anteriores.
+    A leitura usa pyarrow.dataset: filtros são aplicados com as estatísticas
+    dos row groups (predicate pushdown) e os dados são entregues em lotes,
+    sem carregar o portal inteiro em memória. Se uma URL foi gravada mais de
+    uma vez, apenas a versão mais recente é lida.
+    """
+
+    SCHEMA = pa.schema([
+        ('portal', pa.string()),
+        ('columnist', pa.string()),
+        ('url', pa.string()),
+        ('published_at', pa.timestamp('us', tz='UTC')),
+        ('text', pa.string()),
+        ('content_hash', pa.string())
+    ])
+    # Marca, no diretório do portal, que o histórico anterior ao armazenamento foi importado
+    BACKFILL_MARKER = '_backfilled'
+
+    def __init__(self, store_dir: Optional[str] = None, row_group_size: Optional[int] = None):
+        """
+        Args:
+            store_dir: Diretório do armazenamento (padrão: storage.articles.dir)
+            row_group_size: Linhas por row group (padrão: storage.articles.row_group_size)
+        """
+        self.config = ConfigManager()
+        self.logger = logging.getLogger(__name__)
+
+        if store_dir is None:
+            store_dir = self.config.get_full_path('storage.articles.dir')
+        self.store_dir = Path(store_dir)
+        self.row_group_size = row_group_size or self.config.get('storage.articles.row_group_size', 1000)
+
+    def append(self, portal: str, articles: List[Dict]) -> int:
+        """
+        Acrescenta artigos de um portal
+
+        Args:
+            portal: Nome do portal
+            articles: Dicionários com columnist, url, published_at e text;
+                content_hash é calculado se ausente
+
+        Returns:
+            Número de artigos gravados
+        """
+        rows = [article for article in articles if article.get('text')]
+        if not rows:
+            return 0
+
+        df = pd.DataFrame({
+            'portal': portal,
+            'columnist': [row.get('columnist') for row in rows],
+            'url': [row.get('url') for row in rows],
+            'published_at': pd.to_datetime([pd.to_datetime(row.get('published_at'), utc=True, errors='coerce')
+                                            for row in rows], utc=True),
+            'text': [row['text'] for row in rows],
+            'content_hash': [row.get('content_hash') or self.content_hash(row['text']) for row in rows]
+        })
+        table = pa.Table.from_pandas(df, schema=self.SCHEMA, preserve_index=False)
+
+        portal_dir = self._portal_dir(portal)
+        portal_dir.mkdir(parents=True, exist_ok=True)
+        name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = portal_dir / f'.{name}.tmp'
+        pq.write_table(table, tmp_path, row_group_size=self.row_group_size)
+        os.replace(tmp_path, portal_dir / name)
+
+        self.logger.info(f'{len(rows)} artigos do {portal} gravados em {portal_dir}')
+        return len(rows)
+
+    def portals(self) -> List[str]:
+        """Portais com artigos armazenados (nomes em minúsculas)"""
+        if not self.store_dir.exists():
+            return []
+        return sorted(path.name.split('=', 1)[1] for path in self.store_dir.glob('portal=*')
+                      if self._files(path.name.split('=', 1)[1]))
+
+    def has_portal(self, portal: str) -> bool:
+        return bool(self._files(portal))
+
+    def backfilled(self, portal: str) -> bool:
+        """Se os artigos coletados antes do armazenamento já foram importados"""
+        return (self._portal_dir(portal) / self.BACKFILL_MARKER).exists()
+
+    def mark_backfilled(self, portal: str) -> None:
+        portal_dir = self._portal_dir(portal)
+        portal_dir.mkdir(parents=True, exist_ok=True)
+        (portal_dir / self.BACKFILL_MARKER).touch()
+
+    def version(self, portal: Optional[str] = None) -> str:
+        """Identificador do conteúdo atual (muda a cada gravação)"""
+        names = '\n'.join(path.name for path in self._files(portal))
+        return hashlib.sha256(names.encode('utf-8')).hexdigest()
+
+    def iter_batches(self,
+                     portal: Optional[str] = None,
+                     columns: Optional[List[str]] = None,
+                     filter: Optional[ds.Expression] = None,
+                     since: Optional[datetime] = None,
+                     batch_size: int = 1000) -> Iterator[pa.RecordBatch]:
+        """
+        Lê os artigos em lotes
+
+        Args:
+            portal: Portal a ler (padrão: todos)
+            columns: Colunas a ler (padrão: todas)
+            filter: Expressão pyarrow (ex.: ds.field('columnist') == 'Fulano')
+            since: Apenas artigos publicados a partir desta data
+            batch_size: Linhas por lote
+
+        Yields:
+            RecordBatch com as colunas pedidas, sem URLs repetidas
+        """
+        files = self._files(portal)
+        if not files:
+            return
+
+        if since is not None:
+            since = pd.Timestamp(since)
+            since = since.tz_localize('UTC') if since.tzinfo is None else since.tz_convert('UTC')
+            since_filter = ds.field('published_at') >= since
+            filter = since_filter if filter is None else filter & since_filter
+
+        columns = list(columns or self.SCHEMA.names)
+        read_columns = columns if 'url' in columns else columns + ['url']
+
+        # Arquivos mais recentes primeiro: a primeira ocorrência de cada URL é a atual
+        seen = set()
+        for path in files:
+            dataset = ds.dataset(str(path), schema=self.SCHEMA, format='parquet')
+            for batch in dataset.to_batches(columns=read_columns, filter=filter, batch_size=batch_size):
+                keep = []
+                for url in batch.column('url').to_pylist():
+                    keep.append(url is None or url not in seen)
+                    if url is not None:
+                        seen.add(url)
+                batch = batch.filter(pa.array(keep, type=pa.bool_()))
+                if batch.num_rows:
+                    yield batch.select(columns)
+
+    def iter_texts(self, portal: str, batch_size: int = 1000, **kwargs) -> Iterator[List[str]]:
+        """Textos de um portal em lotes de até batch_size"""
+        for batch in self.iter_batches(portal, columns=['text'], batch_size=batch_size, **kwargs):
+            yield batch.column('text').to_pylist()
+
+    def read_texts(self, portal: str, **kwargs) -> List[str]:
+        """Todos os textos de um portal"""
+        return [text for texts in self.iter_texts(portal, **kwargs) for text in texts]
+
+    def count(self, portal: Optional[str] = None) -> int:
+        """Número de artigos distintos armazenados"""
+        return sum(batch.num_rows for batch in self.iter_batches(portal, columns=['url']))
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _portal_dir(self, portal: str) -> Path:
+        return self.store_dir / f'portal={portal.lower()}'
+
+    def _files(self, portal: Optional[str] = None) -> List[Path]:
+        if portal is None:
+            files = self.store_dir.glob('portal=*/part-*.parquet')
+        else:
+            files = self._portal_dir(portal).glob('part-*.parquet')
+        return sorted(files, key=lambda path: path.name, reverse=True)
@@ -0,0 +1,3 @@
+from .ArticleStore import ArticleStore
+
+__all__ = ['ArticleStore']
@@ -0,0 +1,19 @@
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import ConfigManager
+
+
+@pytest.fixture
+def config():
+    """ConfigManager com as alterações do teste desfeitas ao final"""
+    manager = ConfigManager()
+    original = copy.deepcopy(manager.config)
+    yield manager
+    manager.config = original
@@ -0,0 +1,35 @@
+import pytest
+
+from src.dedup import MinHashDeduplicator
+
+WORDS = ('governo congresso reforma votação ministro senado partido eleição orçamento proposta '
+         'oposição aliados plenário medida provisória tributária pesquisa candidato debate relator').split()
+
+
+def article(seed: int, length: int = 120) -> str:
+    return ' '.join(WORDS[(seed * 7 + i * (seed % 5 + 1)) % len(WORDS)] + str(i % 13) for i in range(length))
+
+
+def test_detects_near_duplicates():
+    dedup = MinHashDeduplicator(max_index_size=10)
+    original = article(1)
+    assert dedup.add('a', original) is None
+    assert dedup.add('b', article(2)) is None
+    assert dedup.add('c', original + ' fim') == 'a'
+
+
+def test_index_size_is_bounded():
+    dedup = MinHashDeduplicator(max_index_size=5)
+    for seed in range(20):
+        dedup.add(seed, article(seed))
+    assert len(dedup) == len(dedup.signatures) == 5
+    live = set(dedup.ids)
+    assert all(position in live for bucket in dedup.buckets for position in bucket.values())
+
+
+@pytest.mark.parametrize('max_index_size, expected', [(2, None), (10, 0)])
+def test_evicted_texts_are_forgotten(max_index_size, expected):
+    dedup = MinHashDeduplicator(max_index_size=max_index_size)
+    for seed in range(5):
+        dedup.add(seed, article(seed))
+    assert dedup.add('again', article(0)) == expected
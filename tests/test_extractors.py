@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from src.config import ConfigManager
+from src.scrapper.HtmlExtractor import LxmlExtractor, SoupExtractor
+
+config = ConfigManager()
+fixtures_dir = Path(config.get_full_path('scraping.extractor.fixtures_dir'))
+pages = sorted(fixtures_dir.glob('*/*.html'))
+
+
+def page_id(page: Path) -> str:
+    return str(page.relative_to(fixtures_dir))
+
+
+@pytest.fixture(scope='module')
+def lxml_extractor():
+    pytest.importorskip('lxml')
+    return LxmlExtractor()
+
+
+def test_fixtures_exist():
+    assert pages, f'Nenhuma fixture encontrada em {fixtures_dir}'
+
+
+@pytest.mark.parametrize('page', pages, ids=page_id)
+def test_links_match_soup(page, lxml_extractor):
+    post_class = (config.get(f'news_portals.{page.parent.name}') or {}).get('post_class') or ''
+    html = page.read_bytes()
+    assert lxml_extractor.links(html, 'div', post_class) == SoupExtractor().links(html, 'div', post_class)
+
+
+@pytest.mark.parametrize('page', pages, ids=page_id)
+def test_article_matches_soup(page, lxml_extractor):
+    content_class = (config.get(f'news_portals.{page.parent.name}') or {}).get('content_class') or ''
+    html = page.read_bytes()
+    assert lxml_extractor.article(html, content_class) == SoupExtractor().article(html, content_class)
@@ -0,0 +1,64 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.model import MediaBiasAnalyzer, StreamingMediaAnalysis
+
+
+def train(path, seed):
+    """Treina e grava um classificador como o PoliticalBiasModelTrainer faria"""
+    rng = np.random.default_rng(seed)
+    features = rng.normal(size=(30, 8))
+    labels = np.array(['Esquerda', 'Centro', 'Direita'] * 10)
+    joblib.dump(LogisticRegression(max_iter=200).fit(features, labels), path)
+
+
+@pytest.fixture
+def analyzer(config, tmp_path):
+    config.config['general']['data_dir_portals'] = str(tmp_path / 'portals')
+    config.config['general']['models_dir'] = str(tmp_path / 'models')
+    config.config['general']['output_dir'] = str(tmp_path / 'output')
+    config.config['storage']['articles']['dir'] = str(tmp_path / 'articles')
+    config.config['dedup']['enabled'] = False
+    analyzer = MediaBiasAnalyzer()
+    (analyzer.data_dir / 'G1_political_news.txt').write_text('primeiro artigo\nsegundo artigo\n', encoding='utf-8')
+    train(analyzer.model_path, seed=0)
+    return analyzer
+
+
+def finished_analysis(analyzer, version):
+    analysis = StreamingMediaAnalysis(str(analyzer.output_dir / 'G1_predictions.csv'), version)
+    analysis.finish()
+    return analysis
+
+
+def test_same_model_resumes(analyzer):
+    version, _ = analyzer._text_chunks('G1', chunk_size=10)
+    finished_analysis(analyzer, version)
+
+    version, _ = analyzer._text_chunks('G1', chunk_size=10)
+    assert StreamingMediaAnalysis(str(analyzer.output_dir / 'G1_predictions.csv'), version).complete
+
+
+def test_retraining_invalidates_resume(analyzer):
+    version, _ = analyzer._text_chunks('G1', chunk_size=10)
+    finished_analysis(analyzer, version)
+
+    train(analyzer.model_path, seed=1)
+    new_version, _ = analyzer._text_chunks('G1', chunk_size=10)
+    assert new_version != version
+    assert not StreamingMediaAnalysis(str(analyzer.output_dir / 'G1_predictions.csv'), new_version).complete
+
+
+@pytest.mark.parametrize('key, value', [('pooling', 'cls'), ('max_length', 128)])
+def test_encoder_change_invalidates_resume(analyzer, config, key, value):
+    version, _ = analyzer._text_chunks('G1', chunk_size=10)
+    config.config['model'][key] = value
+    assert analyzer._text_chunks('G1', chunk_size=10)[0] != version
+
+
+def test_backend_change_invalidates_resume(analyzer, config):
+    version, _ = analyzer._text_chunks('G1', chunk_size=10)
+    config.config['model'].setdefault('backend', {})['type'] = 'onnx'
+    assert analyzer._text_chunks('G1', chunk_size=10)[0] != version
@@ -0,0 +1,27 @@
+import importlib
+
+import pytest
+
+# src.profiling reexporta a classe RunProfiler com o mesmo nome do módulo
+run_profiler = importlib.import_module('src.profiling.RunProfiler')
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    """Simula uma plataforma sem resource, /proc e os.sysconf, e sem psutil"""
+    monkeypatch.setattr(run_profiler, 'resource', None)
+    monkeypatch.setattr(run_profiler, 'psutil', None)
+    monkeypatch.delattr(run_profiler.os, 'sysconf')
+
+
+def test_peak_rss_without_resource(windows):
+    assert run_profiler.peak_rss() == 0
+
+
+def test_current_rss_without_proc(windows):
+    assert run_profiler.current_rss() == 0
+
+
+@pytest.mark.skipif(run_profiler.resource is None, reason='módulo resource só existe em POSIX')
+def test_peak_rss_on_posix():
+    assert run_profiler.peak_rss() > 0